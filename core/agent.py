@@ -33,6 +33,9 @@ from core.tools.registry import ToolRegistry
 from core.tools.request_email_tool import RequestEmailTool
 from core.tools.idea_search_tool import IdeaSearchTool
 
+CHECKIN_INTERVAL_SECONDS = 86400
+CHECKIN_RETRY_SECONDS = 3600
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Run Family Agent runtime")
@@ -55,16 +58,20 @@ def main() -> int:
         f"{profile.interop_identity_mode}\n",
         encoding="utf-8",
     )
+    (profile.paths.secrets_dir / "interop_signature_alg.txt").write_text(
+        f"{profile.interop_signature_alg}\n",
+        encoding="utf-8",
+    )
     ensure_identity_keys(profile.paths.secrets_dir)
 
     memory_engine = MemoryEngine(profile.paths.db_path)
     memory_engine.initialize()
     conn = memory_engine.connect()
 
-    profile_memory = ProfileMemoryStore(conn)
-    project_memory = ProjectMemoryStore(conn)
-    episodic_memory = EpisodicMemoryStore(conn)
-    approval_engine = ApprovalEngine(conn)
+    profile_memory = ProfileMemoryStore(conn, write_lock=memory_engine.write_lock)
+    project_memory = ProjectMemoryStore(conn, write_lock=memory_engine.write_lock)
+    episodic_memory = EpisodicMemoryStore(conn, write_lock=memory_engine.write_lock)
+    approval_engine = ApprovalEngine(conn, reader=memory_engine.reader, write_lock=memory_engine.write_lock)
     policy_engine = PolicyEngine(profile)
     tool_registry = ToolRegistry(
         policy_engine=policy_engine,
@@ -72,7 +79,7 @@ def main() -> int:
         episodic_memory=episodic_memory,
         profile_name=profile.name,
     )
-    api_usage_store = ApiUsageStore(conn)
+    api_usage_store = ApiUsageStore(conn, reader=memory_engine.reader, write_lock=memory_engine.write_lock)
     backup_status = BackupStatusProvider(profile.paths.base_data_dir)
     control_plane = ControlPlane(runtime_repo_root)
     interop_bridge = InteropBridge(
@@ -81,6 +88,7 @@ def main() -> int:
         secrets_dir=profile.paths.secrets_dir,
         nodes_file=runtime_repo_root / "config" / "nodes.yaml",
         health_port=profile.health_port,
+        write_lock=memory_engine.write_lock,
     )
 
     sandbox = Sandbox(profile)
@@ -93,12 +101,14 @@ def main() -> int:
         SandboxReadTextTool(sandbox),
         RequestEmailTool(),
         DelegateNodeTaskTool(interop_bridge),
-        IdeaSearchTool(db_path=profile.paths.db_path, secrets_dir=profile.paths.secrets_dir),
     ):
         tool_registry.register(tool)
+    tool_registry.register_lazy(
+        IdeaSearchTool.name,
+        lambda: IdeaSearchTool(db_path=profile.paths.db_path, secrets_dir=profile.paths.secrets_dir),
+    )
 
-    profile_memory.set_fact("runtime_profile", profile.name)
-    profile_memory.set_fact("policy_tier", profile.policy_tier)
+    profile_memory.set_facts([("runtime_profile", profile.name), ("policy_tier", profile.policy_tier)])
     project_memory.create(
         "Node initialization",
         "Initial runtime bootstrap marker.",
@@ -128,34 +138,42 @@ def main() -> int:
         skill_packages_dir=profile.paths.skill_packages_dir,
     )
     health_server.start()
-    running = True
+    shutdown_event = threading.Event()
     checkin_thread: threading.Thread | None = None
 
     def _daily_skills_checkin_loop() -> None:
-        # At-most-daily interop check-ins; wakes hourly.
-        while running:
+        # At-most-daily interop check-ins. Sleep until the next target is due; after a
+        # failed send, retry within the hour instead of waiting a full day.
+        next_deadline = 0.0
+        while not shutdown_event.is_set():
+            if shutdown_event.wait(timeout=max(0.0, next_deadline - time.monotonic())):
+                break
+            failed = False
             try:
-                results = interop_bridge.send_daily_skills_checkins(interval_seconds=86400)
+                results = interop_bridge.send_daily_skills_checkins(interval_seconds=CHECKIN_INTERVAL_SECONDS)
                 for item in results:
+                    failed = failed or not item.get("ok")
                     episodic_memory.record(
                         "interop_skills_checkin_sent",
                         item,
                         decision="allow" if item.get("ok") else "deny",
                     )
+                delay = interop_bridge.seconds_until_next_checkin(interval_seconds=CHECKIN_INTERVAL_SECONDS)
             except RuntimeError as exc:
+                failed = True
+                delay = CHECKIN_RETRY_SECONDS
                 episodic_memory.record(
                     "interop_skills_checkin_error",
                     {"error": str(exc)},
                     decision="deny",
                 )
-            for _ in range(3600):
-                if not running:
-                    break
-                time.sleep(1)
+            if failed:
+                delay = min(delay, CHECKIN_RETRY_SECONDS)
+            # Never spin: a target that is still due after a send waits for the retry window.
+            next_deadline = time.monotonic() + (delay or CHECKIN_RETRY_SECONDS)
 
     def handle_shutdown(*_: object) -> None:
-        nonlocal running
-        running = False
+        shutdown_event.set()
 
     signal.signal(signal.SIGINT, handle_shutdown)
     signal.signal(signal.SIGTERM, handle_shutdown)
@@ -172,14 +190,18 @@ def main() -> int:
     profile_memory.set_fact("telegram_enabled", "true" if telegram_enabled else "false")
 
     try:
-        while running and not telegram_enabled:
-            time.sleep(1)
+        if not telegram_enabled:
+            shutdown_event.wait()
     finally:
+        shutdown_event.set()
         episodic_memory.record("agent_shutdown", {"profile": profile.name}, decision="allow")
         telegram_bot.stop()
         if checkin_thread is not None:
             checkin_thread.join(timeout=2)
         health_server.stop()
+        interop_bridge.close()
+        control_plane.close()
+        api_usage_store.close()
         memory_engine.close()
 
     return 0
@@ -3,12 +3,50 @@
 from __future__ import annotations
 
 import sqlite3
-from typing import Any
+import threading
+from collections import deque
+from typing import Any, Callable
+
+from core.cache import TTLCache
+from core.memory.engine import write_transaction
+
+# Usage rows are buffered and written in one transaction per flush instead of
+# one commit (fsync) per LLM call.
+FLUSH_INTERVAL_SECONDS = 1.0
+FLUSH_BATCH_SIZE = 100
+SUMMARY_TTL_SECONDS = 5.0
+MAX_WINDOW_DAYS = 365
+_RECENT_KEYS = (
+    "profile_name",
+    "caller",
+    "model",
+    "prompt_tokens",
+    "completion_tokens",
+    "total_tokens",
+    "created_at",
+)
 
 
 class ApiUsageStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        reader: Callable[[], sqlite3.Connection] | None = None,
+        write_lock: threading.RLock | None = None,
+        flush_interval_seconds: float = FLUSH_INTERVAL_SECONDS,
+    ) -> None:
         self._conn = conn
+        self._reader = reader or (lambda: conn)
+        # The flusher thread shares the writer connection; never commit inside another store's transaction.
+        self._write_lock = write_lock
+        self._pending: deque[tuple[str, str, str, int, int, int]] = deque()
+        self._flush_lock = threading.Lock()
+        self._flush_interval_seconds = flush_interval_seconds
+        self._summary_cache = TTLCache(SUMMARY_TTL_SECONDS)
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="api-usage-flusher", daemon=True)
+        self._flusher.start()
 
     def record(
         self,
@@ -18,63 +56,86 @@ class ApiUsageStore:
         prompt_tokens: int = 0,
         completion_tokens: int = 0,
     ) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO api_usage (profile_name, caller, model, prompt_tokens, completion_tokens, total_tokens)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                profile_name,
-                caller,
-                model,
-                int(prompt_tokens),
-                int(completion_tokens),
-                int(prompt_tokens) + int(completion_tokens),
-            ),
-        )
-        self._conn.commit()
+        prompt = int(prompt_tokens)
+        completion = int(completion_tokens)
+        self._pending.append((profile_name, caller, model, prompt, completion, prompt + completion))
+        if len(self._pending) >= FLUSH_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._flush_lock:
+            if not self._pending:
+                return
+            rows = []
+            while self._pending:
+                rows.append(self._pending.popleft())
+            try:
+                with write_transaction(self._conn, self._write_lock):
+                    self._conn.executemany(
+                        """
+                        INSERT INTO api_usage (profile_name, caller, model, prompt_tokens, completion_tokens, total_tokens)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        """,
+                        rows,
+                    )
+            except sqlite3.Error:
+                # Keep rows for the next attempt rather than dropping usage data.
+                self._pending.extendleft(reversed(rows))
+                raise
+            self._summary_cache.clear()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._flusher.join(timeout=2)
+        self.flush()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self._flush_interval_seconds):
+            try:
+                self.flush()
+            except sqlite3.Error:
+                continue
 
     def summary(self, *, window_days: int | None = None) -> dict[str, Any]:
+        # Flushing clears the cache, so cached summaries never hide recorded calls.
+        self.flush()
+        # Normalize before caching so callers cannot mint unbounded cache keys.
+        days = None if window_days is None else max(1, min(MAX_WINDOW_DAYS, int(window_days)))
+        return self._summary_cache.get_or_set(days, lambda: self._load_summary(days))
+
+    def _load_summary(self, window_days: int | None) -> dict[str, Any]:
+        conn = self._reader()
         where = ""
         params: tuple[Any, ...] = ()
         if window_days is not None:
-            safe_days = max(1, min(365, int(window_days)))
             where = "WHERE created_at >= datetime('now', ?)"
-            params = (f"-{safe_days} days",)
+            params = (f"-{window_days} days",)
 
-        totals = self._conn.execute(
+        # One pass for totals and both breakdowns; rows are tagged by kind.
+        grouped_rows = conn.execute(
             f"""
-            SELECT
-                COUNT(*) AS total_calls,
-                COALESCE(SUM(prompt_tokens), 0) AS total_prompt_tokens,
-                COALESCE(SUM(completion_tokens), 0) AS total_completion_tokens,
-                COALESCE(SUM(total_tokens), 0) AS total_tokens
+            SELECT 'total' AS kind, NULL AS name, COUNT(*) AS calls,
+                   COALESCE(SUM(prompt_tokens), 0) AS prompt_tokens,
+                   COALESCE(SUM(completion_tokens), 0) AS completion_tokens,
+                   COALESCE(SUM(total_tokens), 0) AS total_tokens
             FROM api_usage
             {where}
-            """,
-            params,
-        ).fetchone()
-        by_model_rows = self._conn.execute(
-            f"""
-            SELECT model, COUNT(*) AS calls, COALESCE(SUM(total_tokens), 0) AS total_tokens
+            UNION ALL
+            SELECT 'model', model, COUNT(*), 0, 0, COALESCE(SUM(total_tokens), 0)
             FROM api_usage
             {where}
             GROUP BY model
-            ORDER BY total_tokens DESC
-            """,
-            params,
-        ).fetchall()
-        by_caller_rows = self._conn.execute(
-            f"""
-            SELECT caller, COUNT(*) AS calls, COALESCE(SUM(total_tokens), 0) AS total_tokens
+            UNION ALL
+            SELECT 'caller', caller, COUNT(*), 0, 0, COALESCE(SUM(total_tokens), 0)
             FROM api_usage
             {where}
             GROUP BY caller
-            ORDER BY total_tokens DESC
             """,
-            params,
+            params * 3,
         ).fetchall()
-        recent_rows = self._conn.execute(
+        recent_cursor = conn.cursor()
+        recent_cursor.row_factory = None
+        recent_rows = recent_cursor.execute(
             """
             SELECT profile_name, caller, model, prompt_tokens, completion_tokens, total_tokens, created_at
             FROM api_usage
@@ -83,9 +144,23 @@ class ApiUsageStore:
             """
         ).fetchall()
 
-        total_calls = int(totals["total_calls"]) if totals else 0
-        total_prompt = int(totals["total_prompt_tokens"]) if totals else 0
-        total_completion = int(totals["total_completion_tokens"]) if totals else 0
+        total_calls = 0
+        total_prompt = 0
+        total_completion = 0
+        by_model: list[dict[str, Any]] = []
+        by_caller: list[dict[str, Any]] = []
+        for row in grouped_rows:
+            kind = row["kind"]
+            if kind == "total":
+                total_calls = int(row["calls"])
+                total_prompt = int(row["prompt_tokens"])
+                total_completion = int(row["completion_tokens"])
+            elif kind == "model":
+                by_model.append({"model": row["name"], "calls": row["calls"], "total_tokens": row["total_tokens"]})
+            else:
+                by_caller.append({"caller": row["name"], "calls": row["calls"], "total_tokens": row["total_tokens"]})
+        by_model.sort(key=lambda item: item["total_tokens"], reverse=True)
+        by_caller.sort(key=lambda item: item["total_tokens"], reverse=True)
         return {
             "enabled": True,
             "total_calls": total_calls,
@@ -93,7 +168,7 @@ class ApiUsageStore:
             "total_completion_tokens": total_completion,
             "total_tokens": total_prompt + total_completion,
             "window_days": window_days,
-            "by_model": [dict(r) for r in by_model_rows],
-            "by_caller": [dict(r) for r in by_caller_rows],
-            "recent_calls": [dict(r) for r in recent_rows],
+            "by_model": by_model,
+            "by_caller": by_caller,
+            "recent_calls": [dict(zip(_RECENT_KEYS, row)) for row in recent_rows],
         }
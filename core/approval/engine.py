@@ -2,14 +2,42 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
-from typing import Any
+import threading
+from typing import Any, Callable
+
+from core import json_codec
+from core.memory.engine import write_transaction
+
+
+def _decode_record(row: sqlite3.Row) -> dict[str, Any]:
+    execution_result = row["execution_result"]
+    return {
+        **dict(row),
+        "payload": json_codec.loads(row["payload"]),
+        "execution_result": json_codec.loads(execution_result) if execution_result else execution_result,
+    }
 
 
 class ApprovalEngine:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        reader: Callable[[], sqlite3.Connection] | None = None,
+        write_lock: threading.RLock | None = None,
+    ) -> None:
         self._conn = conn
+        self._write_lock = write_lock
+        self._reader = reader or (lambda: conn)
+        # Writers run on HTTP workers, the check-in loop and the Telegram thread; += is not atomic.
+        self._version_lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever the set of pending approvals may have changed."""
+        return self._version
 
     def enqueue(
         self,
@@ -19,18 +47,37 @@ class ApprovalEngine:
         tier: str,
         payload: dict[str, Any],
     ) -> int:
-        cursor = self._conn.execute(
-            """
-            INSERT INTO approval_queue (profile_name, tool_name, tier, payload)
-            VALUES (?, ?, ?, ?)
-            """,
-            (profile_name, tool_name, tier, json.dumps(payload, ensure_ascii=True)),
-        )
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                INSERT INTO approval_queue (profile_name, tool_name, tier, payload)
+                VALUES (?, ?, ?, ?)
+                """,
+                (profile_name, tool_name, tier, json_codec.dumps(payload)),
+            )
+        with self._version_lock:
+            self._version += 1
         return int(cursor.lastrowid)
 
+    def bulk_enqueue(self, items: list[tuple[str, str, str, dict[str, Any]]]) -> list[int]:
+        """Enqueue (profile_name, tool_name, tier, payload) items in one transaction."""
+        ids: list[int] = []
+        with write_transaction(self._conn, self._write_lock):
+            for profile_name, tool_name, tier, payload in items:
+                cursor = self._conn.execute(
+                    """
+                    INSERT INTO approval_queue (profile_name, tool_name, tier, payload)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (profile_name, tool_name, tier, json_codec.dumps(payload)),
+                )
+                ids.append(int(cursor.lastrowid))
+        with self._version_lock:
+            self._version += 1
+        return ids
+
     def list_pending(self, limit: int = 100) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             """
             SELECT id, profile_name, tool_name, tier, payload, status, created_at, reviewed_at,
                    execution_status, executed_at, execution_result
@@ -41,17 +88,10 @@ class ApprovalEngine:
             """,
             (limit,),
         ).fetchall()
-        records = []
-        for row in rows:
-            record = dict(row)
-            record["payload"] = json.loads(record["payload"])
-            if record.get("execution_result"):
-                record["execution_result"] = json.loads(record["execution_result"])
-            records.append(record)
-        return records
+        return [_decode_record(row) for row in rows]
 
     def list_recent(self, limit: int = 100) -> list[dict[str, Any]]:
-        rows = self._conn.execute(
+        rows = self._reader().execute(
             """
             SELECT id, profile_name, tool_name, tier, payload, status, created_at, reviewed_at,
                    execution_status, executed_at, execution_result
@@ -61,14 +101,7 @@ class ApprovalEngine:
             """,
             (limit,),
         ).fetchall()
-        records = []
-        for row in rows:
-            record = dict(row)
-            record["payload"] = json.loads(record["payload"])
-            if record.get("execution_result"):
-                record["execution_result"] = json.loads(record["execution_result"])
-            records.append(record)
-        return records
+        return [_decode_record(row) for row in rows]
 
     def get(self, approval_id: int) -> dict[str, Any] | None:
         row = self._conn.execute(
@@ -82,37 +115,37 @@ class ApprovalEngine:
         ).fetchone()
         if row is None:
             return None
-        record = dict(row)
-        record["payload"] = json.loads(record["payload"])
-        if record.get("execution_result"):
-            record["execution_result"] = json.loads(record["execution_result"])
-        return record
+        return _decode_record(row)
 
     def resolve(self, approval_id: int, approve: bool) -> bool:
         status = "approved" if approve else "rejected"
-        cursor = self._conn.execute(
-            """
-            UPDATE approval_queue
-            SET status = ?, reviewed_at = CURRENT_TIMESTAMP
-            WHERE id = ? AND status = 'pending'
-            """,
-            (status, approval_id),
-        )
-        self._conn.commit()
-        return cursor.rowcount > 0
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                UPDATE approval_queue
+                SET status = ?, reviewed_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'pending'
+                """,
+                (status, approval_id),
+            )
+        if cursor.rowcount > 0:
+            with self._version_lock:
+                self._version += 1
+            return True
+        return False
 
     def mark_executed(self, approval_id: int, result: dict[str, Any]) -> bool:
-        cursor = self._conn.execute(
-            """
-            UPDATE approval_queue
-            SET execution_status = 'executed',
-                executed_at = CURRENT_TIMESTAMP,
-                execution_result = ?
-            WHERE id = ? AND status = 'approved' AND execution_status != 'executed'
-            """,
-            (json.dumps(result, ensure_ascii=True), approval_id),
-        )
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                UPDATE approval_queue
+                SET execution_status = 'executed',
+                    executed_at = CURRENT_TIMESTAMP,
+                    execution_result = ?
+                WHERE id = ? AND status = 'approved' AND execution_status != 'executed'
+                """,
+                (json_codec.dumps(result), approval_id),
+            )
         return cursor.rowcount > 0
 
     def count_recent_approved(self, *, tool_name: str, within_seconds: int = 86400) -> int:
@@ -2,48 +2,82 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 from typing import Any
 
+from core.cache import TTLCache
 
-def _read_last_line(path: Path) -> str | None:
-    if not path.exists():
-        return None
-    lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-    if not lines:
+SUMMARY_TTL_SECONDS = 5.0
+_TAIL_BLOCK_SIZE = 4096
+
+
+def _read_last_line(path: Path) -> bytes | None:
+    # Read backwards from EOF in blocks so large logs cost one or two small reads.
+    try:
+        fh = path.open("rb")
+    except FileNotFoundError:
         return None
-    return lines[-1]
+    with fh:
+        end = fh.seek(0, os.SEEK_END)
+        if end == 0:
+            return None
+        pos = end
+        # Blocks in reverse file order; each step reads only the new block, never the bytes after it.
+        blocks: list[bytes] = []
+        while pos > 0:
+            start = max(0, pos - _TAIL_BLOCK_SIZE)
+            fh.seek(start)
+            block = fh.read(pos - start)
+            pos = start
+            if not blocks and block.endswith(b"\n"):
+                block = block[:-1]
+            blocks.append(block)
+            if b"\n" in block:
+                break
+    last = b"".join(reversed(blocks)).rsplit(b"\n", 1)[-1]
+    if last.endswith(b"\r"):
+        last = last[:-1]
+    return last
 
 
-def _entry_status(last_line: str | None) -> str:
+def _entry_status(last_line: bytes | None) -> str:
     if last_line is None:
         return "missing"
-    upper = last_line.upper()
-    if "ERROR" in upper or "FAILED" in upper:
-        return "error"
-    return "ok"
+    # Writers mix "ERROR:" with lowercase "failed", so fold case; bytes.upper() is ASCII-only C code.
+    folded = last_line.upper()
+    return "error" if b"ERROR" in folded or b"FAILED" in folded else "ok"
+
+
+def _decode_line(last_line: bytes | None) -> str | None:
+    return None if last_line is None else last_line.decode("utf-8", errors="replace")
 
 
 class BackupStatusProvider:
     def __init__(self, profile_data_dir: Path) -> None:
         self._logs_dir = profile_data_dir / "logs"
+        self._code_log = self._logs_dir / "backup_code.log"
+        self._data_log = self._logs_dir / "backup_data.log"
+        self._code_log_path = str(self._code_log)
+        self._data_log_path = str(self._data_log)
+        self._summary_cache = TTLCache(SUMMARY_TTL_SECONDS)
 
     def summary(self) -> dict[str, Any]:
-        code_log = self._logs_dir / "backup_code.log"
-        data_log = self._logs_dir / "backup_data.log"
+        return self._summary_cache.get_or_set((), self._load_summary)
 
-        code_last = _read_last_line(code_log)
-        data_last = _read_last_line(data_log)
+    def _load_summary(self) -> dict[str, Any]:
+        code_last = _read_last_line(self._code_log)
+        data_last = _read_last_line(self._data_log)
 
         return {
             "code_backup": {
-                "log_path": str(code_log),
+                "log_path": self._code_log_path,
                 "status": _entry_status(code_last),
-                "last_line": code_last,
+                "last_line": _decode_line(code_last),
             },
             "data_backup": {
-                "log_path": str(data_log),
+                "log_path": self._data_log_path,
                 "status": _entry_status(data_last),
-                "last_line": data_last,
+                "last_line": _decode_line(data_last),
             },
         }
@@ -0,0 +1,49 @@
+"""Small in-process caches for hot read paths."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after a fixed TTL.
+
+    At most max_entries are kept: inserting into a full cache first drops expired entries, then
+    the oldest ones, so keys taken from request parameters cannot grow it without bound.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max(1, max_entries)
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], T]) -> T:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+        # Load outside the lock so a slow loader does not block other keys.
+        value = loader()
+        with self._lock:
+            now = time.monotonic()
+            # Re-inserting moves the key to the end, so dict order stays oldest-first.
+            self._entries.pop(key, None)
+            if len(self._entries) >= self._max_entries:
+                for stale in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                    del self._entries[stale]
+                while len(self._entries) >= self._max_entries:
+                    del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + self._ttl_seconds, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -2,15 +2,29 @@
 
 from __future__ import annotations
 
-import json
+import http.client
 import subprocess
+import threading
 import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any
-from urllib import error, request
+from typing import IO, Any, Callable
 
 import yaml
 
+from core import json_codec
+from core.http_pool import KeepAlivePool
+
+DEPLOY_OUTPUT_MAX_CHARS = 12000
+DEPLOY_JOBS_KEPT = 20
+PROBE_MAX_IDLE_PER_HOST = 4
+PROBE_MAX_BODY_BYTES = 65536
+
+# libyaml's safe loader when PyYAML was built with it; same semantics as yaml.safe_load.
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 class ControlPlane:
     def __init__(self, repo_root: Path, default_health_port: int = 8600) -> None:
@@ -18,12 +32,31 @@ class ControlPlane:
         self._nodes_file = repo_root / "config" / "nodes.yaml"
         self._deploy_all_script = repo_root / "scripts" / "deploy_all.sh"
         self._default_health_port = default_health_port
+        self._nodes_cache: tuple[int, dict[str, Any]] | None = None
+        self._nodes_lock = threading.Lock()
+        self._http = KeepAlivePool(PROBE_MAX_IDLE_PER_HOST)
+        # One deploy at a time; requests that arrive mid-deploy join the running job.
+        self._deploy_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="deploy-all")
+        self._deploy_jobs: OrderedDict[str, _DeployJob] = OrderedDict()
+        self._deploy_lock = threading.Lock()
+
+    def close(self) -> None:
+        self._http.close()
+        self._deploy_executor.shutdown(wait=False, cancel_futures=True)
 
     def _load_nodes(self) -> dict[str, Any]:
-        if not self._nodes_file.exists():
+        # nodes.yaml rarely changes; only re-parse when its mtime moves.
+        try:
+            mtime_ns = self._nodes_file.stat().st_mtime_ns
+        except FileNotFoundError:
             return {}
-        raw = yaml.safe_load(self._nodes_file.read_text(encoding="utf-8")) or {}
-        return raw.get("nodes", {}) if isinstance(raw, dict) else {}
+        with self._nodes_lock:
+            if self._nodes_cache is not None and self._nodes_cache[0] == mtime_ns:
+                return self._nodes_cache[1]
+            raw = yaml.load(self._nodes_file.read_bytes(), Loader=_YamlLoader) or {}
+            nodes = raw.get("nodes", {}) if isinstance(raw, dict) else {}
+            self._nodes_cache = (mtime_ns, nodes)
+            return nodes
 
     def list_nodes(self) -> list[dict[str, Any]]:
         nodes = self._load_nodes()
@@ -46,60 +79,181 @@ class ControlPlane:
             )
         return out
 
+    def _probe_node(self, node: dict[str, Any], timeout_seconds: int, checked_at: int) -> dict[str, Any]:
+        if not node["configured"]:
+            return {
+                **node,
+                "reachable": False,
+                "status": "unconfigured",
+                "last_seen": None,
+                "error": "host not configured",
+            }
+        try:
+            status, body = self._http.get(
+                node["host"], self._default_health_port, "/health", timeout_seconds, PROBE_MAX_BODY_BYTES
+            )
+            if status >= 400:
+                raise http.client.HTTPException(f"HTTP Error {status}")
+            payload = json_codec.loads(body)
+            if not isinstance(payload, dict):
+                raise ValueError("health payload is not a JSON object")
+        except (http.client.HTTPException, ValueError, OSError) as exc:
+            return {
+                **node,
+                "reachable": False,
+                "status": "down",
+                "last_seen": None,
+                "error": str(exc),
+            }
+        return {
+            **node,
+            "reachable": True,
+            "status": payload.get("status", "unknown"),
+            "last_seen": checked_at,
+            "health": payload,
+        }
+
     def health_report(self, timeout_seconds: int = 2) -> dict[str, Any]:
+        nodes = self.list_nodes()
+        checked_at = int(time.time())
         report_nodes: list[dict[str, Any]] = []
-        for node in self.list_nodes():
-            checked_at = int(time.time())
-            if not node["configured"]:
-                report_nodes.append(
-                    {
-                        **node,
-                        "reachable": False,
-                        "status": "unconfigured",
-                        "last_seen": None,
-                        "error": "host not configured",
-                    }
-                )
-                continue
-            url = f"http://{node['host']}:{self._default_health_port}/health"
-            try:
-                with request.urlopen(url, timeout=timeout_seconds) as resp:  # noqa: S310
-                    payload = json.loads(resp.read().decode("utf-8"))
-                report_nodes.append(
-                    {
-                        **node,
-                        "reachable": True,
-                        "status": payload.get("status", "unknown"),
-                        "last_seen": checked_at,
-                        "health": payload,
-                    }
-                )
-            except (error.URLError, TimeoutError, json.JSONDecodeError, OSError) as exc:
-                report_nodes.append(
-                    {
-                        **node,
-                        "reachable": False,
-                        "status": "down",
-                        "last_seen": None,
-                        "error": str(exc),
-                    }
-                )
+        if nodes:
+            # Probes are network-bound; fan out so one dead host costs one timeout, not N.
+            with ThreadPoolExecutor(max_workers=min(32, len(nodes))) as pool:
+                futures = [pool.submit(self._probe_node, node, timeout_seconds, checked_at) for node in nodes]
+                report_nodes = [future.result() for future in futures]
         return {"checked_at": int(time.time()), "nodes": report_nodes}
 
     def deploy_all(self, timeout_seconds: int = 900) -> dict[str, Any]:
+        return self._run_deploy(
+            timeout_seconds, _OutputTail(DEPLOY_OUTPUT_MAX_CHARS), _OutputTail(DEPLOY_OUTPUT_MAX_CHARS)
+        )
+
+    def deploy_all_async(
+        self,
+        timeout_seconds: int = 900,
+        on_complete: Callable[[dict[str, Any]], None] | None = None,
+    ) -> dict[str, Any]:
+        """Start deploy_all.sh in the background and return its job status immediately."""
+        with self._deploy_lock:
+            for job in self._deploy_jobs.values():
+                if job.finished_at is None:
+                    return {**job.status(), "coalesced": True}
+            job = _DeployJob(uuid.uuid4().hex)
+            self._deploy_jobs[job.job_id] = job
+            while len(self._deploy_jobs) > DEPLOY_JOBS_KEPT:
+                self._deploy_jobs.popitem(last=False)
+        self._deploy_executor.submit(self._run_deploy_job, job, timeout_seconds, on_complete)
+        return job.status()
+
+    def deploy_status(self, job_id: str) -> dict[str, Any] | None:
+        with self._deploy_lock:
+            job = self._deploy_jobs.get(job_id)
+        return job.status() if job is not None else None
+
+    def _run_deploy_job(
+        self,
+        job: _DeployJob,
+        timeout_seconds: int,
+        on_complete: Callable[[dict[str, Any]], None] | None,
+    ) -> None:
+        try:
+            result = self._run_deploy(timeout_seconds, job.stdout, job.stderr)
+        except subprocess.TimeoutExpired:
+            result = {"ok": False, "error": f"deploy_all timed out after {timeout_seconds}s"}
+        except OSError as exc:
+            result = {"ok": False, "error": str(exc)}
+        job.finish(result)
+        if on_complete is not None:
+            on_complete(job.status())
+
+    def _run_deploy(self, timeout_seconds: int, stdout_tail: _OutputTail, stderr_tail: _OutputTail) -> dict[str, Any]:
         if not self._deploy_all_script.exists():
             return {"ok": False, "error": f"Missing script: {self._deploy_all_script}"}
-        proc = subprocess.run(  # noqa: S603
+        proc = subprocess.Popen(  # noqa: S603
             [str(self._deploy_all_script)],
             cwd=str(self._repo_root),
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            timeout=timeout_seconds,
-            check=False,
+            bufsize=1,
         )
+        pumps = [
+            threading.Thread(target=_pump_stream, args=(proc.stdout, stdout_tail), daemon=True),
+            threading.Thread(target=_pump_stream, args=(proc.stderr, stderr_tail), daemon=True),
+        ]
+        for pump in pumps:
+            pump.start()
+        try:
+            returncode = proc.wait(timeout=timeout_seconds)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+            raise
+        finally:
+            for pump in pumps:
+                pump.join(timeout=5)
         return {
-            "ok": proc.returncode == 0,
-            "returncode": proc.returncode,
-            "stdout": proc.stdout[-12000:],
-            "stderr": proc.stderr[-12000:],
+            "ok": returncode == 0,
+            "returncode": returncode,
+            "stdout": stdout_tail.text(),
+            "stderr": stderr_tail.text(),
         }
+
+
+class _DeployJob:
+    def __init__(self, job_id: str) -> None:
+        self.job_id = job_id
+        self.started_at = int(time.time())
+        self.finished_at: int | None = None
+        self.stdout = _OutputTail(DEPLOY_OUTPUT_MAX_CHARS)
+        self.stderr = _OutputTail(DEPLOY_OUTPUT_MAX_CHARS)
+        self._result: dict[str, Any] = {}
+
+    def finish(self, result: dict[str, Any]) -> None:
+        self._result = result
+        self.finished_at = int(time.time())
+
+    def status(self) -> dict[str, Any]:
+        if self.finished_at is None:
+            state = "running"
+        else:
+            state = "succeeded" if self._result.get("ok") else "failed"
+        return {
+            "job_id": self.job_id,
+            "status": state,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "stdout": self.stdout.text(),
+            "stderr": self.stderr.text(),
+            **{k: v for k, v in self._result.items() if k not in {"stdout", "stderr"}},
+        }
+
+
+class _OutputTail:
+    """Thread-safe buffer that keeps only the last max_chars of a text stream."""
+
+    def __init__(self, max_chars: int) -> None:
+        self._max_chars = max_chars
+        self._chunks: deque[str] = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def append(self, text: str) -> None:
+        with self._lock:
+            self._chunks.append(text)
+            self._size += len(text)
+            while len(self._chunks) > 1 and self._size - len(self._chunks[0]) >= self._max_chars:
+                self._size -= len(self._chunks.popleft())
+
+    def text(self) -> str:
+        with self._lock:
+            return "".join(self._chunks)[-self._max_chars :]
+
+
+def _pump_stream(stream: IO[str] | None, tail: _OutputTail) -> None:
+    if stream is None:
+        return
+    with stream:
+        for line in iter(stream.readline, ""):
+            tail.append(line)
@@ -2,154 +2,459 @@
 
 from __future__ import annotations
 
-import json
+import calendar
+import gzip
+import hashlib
+import http.client
+import os
+import queue
+import re
+import socket
 import subprocess
+import sys
 import threading
 import time
-from base64 import b64decode
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import uuid
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from pathlib import Path
-from typing import Any, Callable
-from urllib import error, request
-from urllib.parse import parse_qs, urlparse
+from types import MappingProxyType
+from typing import Any, Callable, Iterator, Mapping
+from urllib.parse import parse_qs
 
+from core import json_codec
 from core.approval.engine import ApprovalEngine
+from core.cache import TTLCache
 from core.control_plane import ControlPlane
-from core.interop.bridge import InteropBridge
+from core.http_pool import KeepAlivePool
+from core.interop.bridge import POST_TIMEOUT_SECONDS, InteropBridge
 from core.llm import complete as llm_complete
 from core.llm import read_secret
 from core.memory.episodic_memory import EpisodicMemoryStore
 from core.skills.manifest import SkillManifestManager, sha256_file
-from core.skills.package import extract_skill_bundle
+from core.skills.package import extract_skill_bundle, write_bundle_b64
 from core.soul import get_soul_content
 from core.tools.registry import ToolRegistry
 
-_DASHBOARD_HTML = """<!doctype html>
+# Viewers share one fleet fan-out per TTL, whether they poll /dashboard/data or follow /dashboard/stream.
+DASHBOARD_CACHE_TTL_SECONDS = 3.0
+RECENT_MESSAGES_CACHE_TTL_SECONDS = 0.5
+RESPONSE_CACHE_TTL_SECONDS = 1.0
+# /api-usage accepts window_days in this range, matching what the usage store queries.
+MAX_USAGE_WINDOW_DAYS = 365
+RECENT_MESSAGES_CACHE_LIMIT = 200
+DASHBOARD_STREAM_KEEPALIVE_SECONDS = 15.0
+# Handlers are I/O-bound and idle keep-alive sockets hold a worker, so keep a floor on small hosts.
+DEFAULT_HTTP_WORKERS = max(16, min(32, (os.cpu_count() or 1) * 4))
+# How long a kept-alive connection may sit idle between requests before its worker is released.
+HTTP_KEEPALIVE_IDLE_SECONDS = 2
+DASHBOARD_FETCH_WORKERS = 32
+DASHBOARD_FETCH_MAX_BYTES = 1 << 20
+# Skill bundles arrive base64-encoded inside /interop/inbox envelopes, so leave room for them.
+MAX_REQUEST_BODY_BYTES = 16 << 20
+# Unread bodies up to this size are drained so the connection stays reusable; larger ones close it.
+MAX_DISCARDED_BODY_BYTES = 64 << 10
+# Episodic events from request handlers are written behind the response in small batches.
+EVENT_FLUSH_INTERVAL_SECONDS = 0.25
+EVENT_FLUSH_MAX_BATCH = 64
+# A batch whose write fails is put back and retried on later flushes before it is dropped.
+EVENT_FLUSH_MAX_RETRIES = 3
+# Skills check-in replies call the LLM; run them off the HTTP workers with bounded backlog.
+LLM_REPLY_WORKERS = 2
+LLM_REPLY_MAX_INFLIGHT = 16
+LLM_REPLY_RESULTS_KEPT = 200
+# Inline replies give up before the sender's own POST timeout and hand back a pollable request_id.
+LLM_REPLY_INLINE_WAIT_SECONDS = POST_TIMEOUT_SECONDS - 2
+
+# Any single segment matches so non-numeric ids still get the "Invalid approval id" 400.
+_APPROVAL_ROUTE_RE = re.compile(r"/approvals/([^/]*)/(resolve|execute)")
+_SQL_TIMESTAMP_RE = re.compile(r"\s*(\d{4})-(\d{2})-(\d{2})[ T](\d{2}):(\d{2}):(\d{2})(?:\.\d*)?\s*$")
+
+# Growth stage by score: 0-2 infant, 3-5 child, 6-8 teen, 9+ adult.
+_GROWTH_STAGES = ("infant",) * 3 + ("child",) * 3 + ("teen",) * 3
+# Points awarded are the number of thresholds strictly below the value: traffic >0/>5/>20, calls >20/>200.
+_GROWTH_TRAFFIC_THRESHOLDS = (0, 5, 20)
+_GROWTH_CALL_THRESHOLDS = (20, 200)
+_DASHBOARD_NODE_ENDPOINTS = ("/health", "/status", "/api-usage?window_days=7", "/backup/status")
+
+_DASHBOARD_CSS = """:root {
+  --bg: #0d1117;
+  --panel: #161b22;
+  --panel2: #1f2630;
+  --text: #d6e3f0;
+  --muted: #8b9bb0;
+  --ok: #2ea043;
+  --down: #f85149;
+  --line: #3b4a5f;
+  --accent: #7aa2ff;
+}
+body {
+  margin: 0;
+  font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
+  background: radial-gradient(circle at 20% 0%, #1a2130 0%, var(--bg) 60%);
+  color: var(--text);
+}
+.wrap {
+  max-width: 1200px;
+  margin: 0 auto;
+  padding: 18px;
+}
+h1 {
+  margin: 0 0 6px 0;
+  font-size: 28px;
+}
+.subtitle {
+  color: var(--muted);
+  margin-bottom: 16px;
+}
+.summary {
+  display: grid;
+  grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+  gap: 10px;
+  margin-bottom: 14px;
+}
+.tile {
+  background: linear-gradient(180deg, var(--panel2), var(--panel));
+  border: 1px solid #2f3b4a;
+  border-radius: 10px;
+  padding: 10px 12px;
+}
+.tile .label { color: var(--muted); font-size: 12px; }
+.tile .value { font-size: 20px; font-weight: 600; margin-top: 2px; }
+.grid {
+  display: grid;
+  grid-template-columns: 2fr 1fr;
+  gap: 12px;
+}
+@media (max-width: 980px) { .grid { grid-template-columns: 1fr; } }
+.panel {
+  background: linear-gradient(180deg, var(--panel2), var(--panel));
+  border: 1px solid #2f3b4a;
+  border-radius: 12px;
+  padding: 12px;
+}
+.panel h2 { margin: 0 0 8px 0; font-size: 16px; }
+.cards {
+  display: grid;
+  grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
+  gap: 10px;
+  margin-top: 10px;
+}
+.card {
+  background: #141a22;
+  border: 1px solid #2d3948;
+  border-radius: 10px;
+  padding: 10px;
+}
+.row {
+  display: flex;
+  align-items: center;
+  justify-content: space-between;
+  margin-bottom: 6px;
+}
+.dot {
+  width: 10px;
+  height: 10px;
+  border-radius: 999px;
+  display: inline-block;
+  margin-right: 8px;
+}
+.mono {
+  font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace;
+  font-size: 12px;
+  color: var(--muted);
+}
+#graph, #graph-canvas {
+  width: 100%;
+  height: 360px;
+  background: #0f141b;
+  border: 1px solid #2d3948;
+  border-radius: 10px;
+}
+#graph-canvas { height: auto; aspect-ratio: 1000 / 360; }
+[hidden] { display: none !important; }
+.feed {
+  max-height: 560px;
+  overflow: auto;
+  font-size: 13px;
+  line-height: 1.4;
+}
+.feed-item {
+  border-bottom: 1px solid #2b3644;
+  padding: 8px 0;
+}
+.legend {
+  margin-top: 8px;
+  font-size: 12px;
+  color: var(--muted);
+}
+.growth-chip {
+  border: 1px solid #2d3948;
+  border-radius: 999px;
+  padding: 2px 8px;
+  font-size: 11px;
+  color: #c7d6e8;
+  background: #111722;
+}
+.muted { color: var(--muted); }
+"""
+
+_DASHBOARD_JS = """function esc(v) {
+  return String(v ?? "").replaceAll("&", "&amp;").replaceAll("<", "&lt;").replaceAll(">", "&gt;");
+}
+function fmtTime(ts) {
+  if (!ts) return "n/a";
+  const d = new Date(ts * 1000);
+  return d.toLocaleString();
+}
+function renderSummary(data) {
+  const up = data.nodes.filter(n => n.up).length;
+  const total = data.nodes.length;
+  const msgs = data.recent_messages.length;
+  const activeLinks = (data.links || []).filter(l => Number(l.active_count || 0) > 0).length;
+  const infant = data.nodes.filter(n => (n.growth_stage || "") === "infant").length;
+  const html = [
+    ["Nodes Up", up + " / " + total],
+    ["Interop Messages", msgs],
+    ["Tunnel Links Active", activeLinks],
+    ["Infant Agents", infant],
+    ["Last Refresh", fmtTime(data.generated_at)]
+  ].map(([k, v]) => '<div class="tile"><div class="label">' + esc(k) + '</div><div class="value">' + esc(v) + '</div></div>').join("");
+  document.getElementById("summary").innerHTML = html;
+}
+function renderCards(data) {
+  const html = data.nodes.map(n => {
+    const color = n.up ? "#2ea043" : "#f85149";
+    return (
+      '<div class="card">' +
+        '<div class="row"><div><span class="dot" style="background:' + color + '"></span><strong>' + esc(n.node_id) + '</strong></div>' +
+        '<div class="mono">' + esc(n.profile) + '</div></div>' +
+        '<div class="mono">' + esc(n.host || "unconfigured") + '</div>' +
+        '<div class="row"><span class="muted">Status</span><span>' + esc(n.status || "unknown") + '</span></div>' +
+        '<div class="row"><span class="muted">Tools</span><span>' + esc(n.tools_registered ?? 0) + '</span></div>' +
+        '<div class="row"><span class="muted">API</span><span>' + esc(n.api_enabled ? "enabled" : "off") + '</span></div>' +
+        '<div class="row"><span class="muted">Growth</span><span class="growth-chip">' + esc(n.growth_stage || "infant") + '</span></div>' +
+        '<div class="row"><span class="muted">Messages</span><span>' + esc((n.messages_sent || 0) + " out / " + (n.messages_received || 0) + " in") + '</span></div>' +
+        '<div class="row"><span class="muted">Backup</span><span>' + esc((n.code_backup_status || "unknown") + " / " + (n.data_backup_status || "unknown")) + '</span></div>' +
+      '</div>'
+    );
+  }).join("");
+  document.getElementById("cards").innerHTML = html;
+}
+const SVG_NS = "http://www.w3.org/2000/svg";
+const stageRadius = Object.freeze({ infant: 14, child: 18, teen: 22, adult: 26 });
+const CANVAS_NODE_THRESHOLD = 20;
+let graph = { layoutKey: null, links: [], nodes: [] };
+function svgEl(parent, tag, attrs) {
+  const el = document.createElementNS(SVG_NS, tag);
+  setAttrs(el, attrs);
+  parent.appendChild(el);
+  return el;
+}
+function setAttrs(el, attrs) {
+  // Only touch attributes whose value changed so unchanged frames cause no style/layout work.
+  for (const k in attrs) {
+    const v = String(attrs[k]);
+    if (el.getAttribute(k) !== v) el.setAttribute(k, v);
+  }
+}
+function setText(el, text) {
+  if (el.textContent !== text) el.textContent = text;
+}
+function graphPositions(nodes) {
+  const cx = 500, cy = 180, r = 130;
+  const pos = {};
+  nodes.forEach((n, i) => {
+    const angle = (Math.PI * 2 * i / Math.max(nodes.length, 1)) - Math.PI / 2;
+    pos[n.profile] = { x: cx + Math.cos(angle) * r * 2.1, y: cy + Math.sin(angle) * r };
+  });
+  return pos;
+}
+function buildGraph(svg, nodes, links, layoutKey) {
+  const pos = graphPositions(nodes);
+  svg.replaceChildren();
+  const baseLayer = svgEl(svg, "g", {});
+  const activeLayer = svgEl(svg, "g", {});
+  const nodeLayer = svgEl(svg, "g", {});
+  const linkEls = links.map(e => {
+    const a = pos[e.source_profile], b = pos[e.target_profile];
+    if (!a || !b) return null;
+    svgEl(baseLayer, "line", { x1: a.x, y1: a.y, x2: b.x, y2: b.y, stroke: "#3f4f64", "stroke-width": 2, "stroke-dasharray": "8 6", opacity: 0.65 });
+    return {
+      line: svgEl(activeLayer, "line", { x1: a.x, y1: a.y, x2: b.x, y2: b.y, stroke: "#7aa2ff", opacity: 0.75, visibility: "hidden" }),
+      label: svgEl(activeLayer, "text", { x: (a.x + b.x) / 2, y: (a.y + b.y) / 2 - 8, fill: "#b8ccff", "font-size": 11, visibility: "hidden" })
+    };
+  });
+  const nodeEls = nodes.map(n => {
+    const p = pos[n.profile] || {x: 50, y: 50};
+    const el = {
+      p,
+      halo: svgEl(nodeLayer, "circle", { cx: p.x, cy: p.y, fill: "#89a6ff" }),
+      dot: svgEl(nodeLayer, "circle", { cx: p.x, cy: p.y }),
+      stage: svgEl(nodeLayer, "text", { x: p.x, y: p.y + 4, fill: "#0b1220", "text-anchor": "middle", "font-size": 10 }),
+      name: svgEl(nodeLayer, "text", { x: p.x, fill: "#d6e3f0", "text-anchor": "middle", "font-size": 12 })
+    };
+    el.name.textContent = n.node_id ?? "";
+    return el;
+  });
+  graph = { layoutKey, links: linkEls, nodes: nodeEls };
+}
+function drawGraphCanvas(canvas, nodes, links) {
+  // Large fleets: immediate-mode drawing avoids thousands of SVG elements.
+  const ctx = canvas.getContext("2d");
+  const pos = graphPositions(nodes);
+  ctx.clearRect(0, 0, canvas.width, canvas.height);
+  const segments = links
+    .map(e => [pos[e.source_profile], pos[e.target_profile], Number(e.active_count || 0)])
+    .filter(([a, b]) => a && b);
+  ctx.save();
+  ctx.setLineDash([8, 6]);
+  ctx.strokeStyle = "#3f4f64";
+  ctx.lineWidth = 2;
+  ctx.globalAlpha = 0.65;
+  ctx.beginPath();
+  segments.forEach(([a, b]) => { ctx.moveTo(a.x, a.y); ctx.lineTo(b.x, b.y); });
+  ctx.stroke();
+  ctx.restore();
+  const byWidth = {};
+  segments.forEach(seg => {
+    if (seg[2] > 0) (byWidth[Math.min(10, 2 + seg[2])] ||= []).push(seg);
+  });
+  ctx.save();
+  ctx.strokeStyle = "#7aa2ff";
+  ctx.globalAlpha = 0.75;
+  for (const width in byWidth) {
+    ctx.lineWidth = Number(width);
+    ctx.beginPath();
+    byWidth[width].forEach(([a, b]) => { ctx.moveTo(a.x, a.y); ctx.lineTo(b.x, b.y); });
+    ctx.stroke();
+  }
+  ctx.restore();
+  ctx.fillStyle = "#b8ccff";
+  ctx.font = "11px sans-serif";
+  ctx.textAlign = "start";
+  segments.forEach(([a, b, active]) => {
+    if (active > 0) ctx.fillText(active + " msgs", (a.x + b.x) / 2, (a.y + b.y) / 2 - 8);
+  });
+  ctx.textAlign = "center";
+  nodes.forEach(n => {
+    const p = pos[n.profile] || {x: 50, y: 50};
+    const growth = n.growth_stage || "infant";
+    const radius = stageRadius[growth] || 14;
+    ctx.globalAlpha = growth === "infant" ? 0.35 : 0.15;
+    ctx.fillStyle = "#89a6ff";
+    ctx.beginPath();
+    ctx.arc(p.x, p.y, radius + 6, 0, Math.PI * 2);
+    ctx.fill();
+    ctx.globalAlpha = 1;
+    ctx.fillStyle = n.up ? "#2ea043" : "#f85149";
+    ctx.beginPath();
+    ctx.arc(p.x, p.y, radius, 0, Math.PI * 2);
+    ctx.fill();
+    ctx.fillStyle = "#0b1220";
+    ctx.font = "10px sans-serif";
+    ctx.fillText(growth, p.x, p.y + 4);
+    ctx.fillStyle = "#d6e3f0";
+    ctx.font = "12px sans-serif";
+    ctx.fillText(String(n.node_id ?? ""), p.x, p.y + radius + 18);
+  });
+}
+function renderGraph(data) {
+  const nodes = data.nodes;
+  const links = data.links || [];
+  const svg = document.getElementById("graph");
+  const canvas = document.getElementById("graph-canvas");
+  const useCanvas = nodes.length > CANVAS_NODE_THRESHOLD;
+  // SVG elements have no .hidden property, so toggle the attribute on both.
+  svg.toggleAttribute("hidden", useCanvas);
+  canvas.toggleAttribute("hidden", !useCanvas);
+  if (useCanvas) {
+    graph.layoutKey = null;
+    drawGraphCanvas(canvas, nodes, links);
+    return;
+  }
+  const layoutKey = nodes.map(n => n.profile + "|" + n.node_id).join(",") + "#" +
+    links.map(e => e.source_profile + ">" + e.target_profile).join(",");
+  if (layoutKey !== graph.layoutKey) {
+    buildGraph(svg, nodes, links, layoutKey);
+  }
+  links.forEach((e, i) => {
+    const el = graph.links[i];
+    if (!el) return;
+    const active = Number(e.active_count || 0);
+    const visibility = active > 0 ? "visible" : "hidden";
+    setAttrs(el.line, { "stroke-width": Math.min(10, 2 + active), visibility });
+    setAttrs(el.label, { visibility });
+    setText(el.label, active + " msgs");
+  });
+  nodes.forEach((n, i) => {
+    const el = graph.nodes[i];
+    const growth = n.growth_stage || "infant";
+    const radius = stageRadius[growth] || 14;
+    setAttrs(el.halo, { r: radius + 6, opacity: growth === "infant" ? 0.35 : 0.15 });
+    setAttrs(el.dot, { r: radius, fill: n.up ? "#2ea043" : "#f85149" });
+    setText(el.stage, growth);
+    setAttrs(el.name, { y: el.p.y + radius + 18 });
+  });
+}
+function renderFeed(data) {
+  const list = data.recent_messages.slice(0, 50).map(m => {
+    const q = m.question ? ('<div class="muted">q: ' + esc(m.question) + '</div>') : '';
+    const r = m.reply_message ? ('<div class="muted">reply: ' + esc(m.reply_message) + '</div>') : '';
+    const s = m.skill_id ? ('<div class="muted">skill: ' + esc(m.skill_id) + '@' + esc(m.skill_version || "n/a") + '</div>') : '';
+    return (
+      '<div class="feed-item">' +
+        '<div><strong>' + esc(m.source_node || m.source_profile || "unknown") + '</strong> → <strong>' + esc(m.target_node || m.target_profile || "unknown") + '</strong></div>' +
+        '<div class="muted">task=' + esc(m.task_type || "n/a") + ' | status=' + esc(m.status || "n/a") + '</div>' +
+        q + r + s +
+        '<div class="muted">' + esc(fmtTime(m.created_at_ts)) + '</div>' +
+      '</div>'
+    );
+  }).join("");
+  document.getElementById("feed").innerHTML = list || '<div class="muted">No recent messages yet.</div>';
+}
+function render(data) {
+  renderSummary(data);
+  renderCards(data);
+  renderGraph(data);
+  renderFeed(data);
+}
+async function refresh() {
+  try {
+    const r = await fetch("/dashboard/data", { cache: "no-store" });
+    if (!r.ok) throw new Error("HTTP " + r.status);
+    render(await r.json());
+  } catch (err) {
+    document.getElementById("summary").innerHTML = '<div class="tile"><div class="label">Dashboard</div><div class="value">Error loading data</div></div>';
+  }
+}
+function startUpdates() {
+  refresh();
+  if (!window.EventSource) {
+    setInterval(refresh, 5000);
+    return;
+  }
+  const stream = new EventSource("/dashboard/stream");
+  stream.onmessage = ev => render(JSON.parse(ev.data));
+  stream.onerror = () => {
+    // Stream refused (e.g. not in the read-only allowlist): fall back to polling.
+    if (stream.readyState === EventSource.CLOSED) setInterval(refresh, 5000);
+  };
+}
+startUpdates();
+"""
+
+_DASHBOARD_HTML_TEMPLATE = """<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8">
   <meta name="viewport" content="width=device-width, initial-scale=1">
   <title>Family Agent Dashboard</title>
-  <style>
-    :root {
-      --bg: #0d1117;
-      --panel: #161b22;
-      --panel2: #1f2630;
-      --text: #d6e3f0;
-      --muted: #8b9bb0;
-      --ok: #2ea043;
-      --down: #f85149;
-      --line: #3b4a5f;
-      --accent: #7aa2ff;
-    }
-    body {
-      margin: 0;
-      font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, Helvetica, Arial, sans-serif;
-      background: radial-gradient(circle at 20% 0%, #1a2130 0%, var(--bg) 60%);
-      color: var(--text);
-    }
-    .wrap {
-      max-width: 1200px;
-      margin: 0 auto;
-      padding: 18px;
-    }
-    h1 {
-      margin: 0 0 6px 0;
-      font-size: 28px;
-    }
-    .subtitle {
-      color: var(--muted);
-      margin-bottom: 16px;
-    }
-    .summary {
-      display: grid;
-      grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-      gap: 10px;
-      margin-bottom: 14px;
-    }
-    .tile {
-      background: linear-gradient(180deg, var(--panel2), var(--panel));
-      border: 1px solid #2f3b4a;
-      border-radius: 10px;
-      padding: 10px 12px;
-    }
-    .tile .label { color: var(--muted); font-size: 12px; }
-    .tile .value { font-size: 20px; font-weight: 600; margin-top: 2px; }
-    .grid {
-      display: grid;
-      grid-template-columns: 2fr 1fr;
-      gap: 12px;
-    }
-    @media (max-width: 980px) { .grid { grid-template-columns: 1fr; } }
-    .panel {
-      background: linear-gradient(180deg, var(--panel2), var(--panel));
-      border: 1px solid #2f3b4a;
-      border-radius: 12px;
-      padding: 12px;
-    }
-    .panel h2 { margin: 0 0 8px 0; font-size: 16px; }
-    .cards {
-      display: grid;
-      grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
-      gap: 10px;
-      margin-top: 10px;
-    }
-    .card {
-      background: #141a22;
-      border: 1px solid #2d3948;
-      border-radius: 10px;
-      padding: 10px;
-    }
-    .row {
-      display: flex;
-      align-items: center;
-      justify-content: space-between;
-      margin-bottom: 6px;
-    }
-    .dot {
-      width: 10px;
-      height: 10px;
-      border-radius: 999px;
-      display: inline-block;
-      margin-right: 8px;
-    }
-    .mono {
-      font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace;
-      font-size: 12px;
-      color: var(--muted);
-    }
-    #graph {
-      width: 100%;
-      height: 360px;
-      background: #0f141b;
-      border: 1px solid #2d3948;
-      border-radius: 10px;
-    }
-    .feed {
-      max-height: 560px;
-      overflow: auto;
-      font-size: 13px;
-      line-height: 1.4;
-    }
-    .feed-item {
-      border-bottom: 1px solid #2b3644;
-      padding: 8px 0;
-    }
-    .legend {
-      margin-top: 8px;
-      font-size: 12px;
-      color: var(--muted);
-    }
-    .growth-chip {
-      border: 1px solid #2d3948;
-      border-radius: 999px;
-      padding: 2px 8px;
-      font-size: 11px;
-      color: #c7d6e8;
-      background: #111722;
-    }
-    .muted { color: var(--muted); }
-  </style>
+  <link rel="stylesheet" href="/dashboard/style.css?v={css_etag}">
+  <script src="/dashboard/app.js?v={js_etag}" defer></script>
 </head>
 <body>
   <div class="wrap">
@@ -160,6 +465,7 @@ _DASHBOARD_HTML = """<!doctype html>
       <div class="panel">
         <h2>Tunnel Graph</h2>
         <svg id="graph" viewBox="0 0 1000 360" preserveAspectRatio="xMidYMid meet"></svg>
+        <canvas id="graph-canvas" width="1000" height="360" hidden></canvas>
         <div class="legend">Gray dashed links show tunnel paths. Blue links glow when communication is active.</div>
         <div class="cards" id="cards"></div>
       </div>
@@ -169,123 +475,296 @@ _DASHBOARD_HTML = """<!doctype html>
       </div>
     </div>
   </div>
-  <script>
-    function esc(v) {
-      return String(v ?? "").replaceAll("&", "&amp;").replaceAll("<", "&lt;").replaceAll(">", "&gt;");
-    }
-    function fmtTime(ts) {
-      if (!ts) return "n/a";
-      const d = new Date(ts * 1000);
-      return d.toLocaleString();
-    }
-    function renderSummary(data) {
-      const up = data.nodes.filter(n => n.up).length;
-      const total = data.nodes.length;
-      const msgs = data.recent_messages.length;
-      const activeLinks = (data.links || []).filter(l => Number(l.active_count || 0) > 0).length;
-      const infant = data.nodes.filter(n => (n.growth_stage || "") === "infant").length;
-      const html = [
-        ["Nodes Up", up + " / " + total],
-        ["Interop Messages", msgs],
-        ["Tunnel Links Active", activeLinks],
-        ["Infant Agents", infant],
-        ["Last Refresh", fmtTime(data.generated_at)]
-      ].map(([k, v]) => '<div class="tile"><div class="label">' + esc(k) + '</div><div class="value">' + esc(v) + '</div></div>').join("");
-      document.getElementById("summary").innerHTML = html;
-    }
-    function renderCards(data) {
-      const html = data.nodes.map(n => {
-        const color = n.up ? "#2ea043" : "#f85149";
-        return (
-          '<div class="card">' +
-            '<div class="row"><div><span class="dot" style="background:' + color + '"></span><strong>' + esc(n.node_id) + '</strong></div>' +
-            '<div class="mono">' + esc(n.profile) + '</div></div>' +
-            '<div class="mono">' + esc(n.host || "unconfigured") + '</div>' +
-            '<div class="row"><span class="muted">Status</span><span>' + esc(n.status || "unknown") + '</span></div>' +
-            '<div class="row"><span class="muted">Tools</span><span>' + esc(n.tools_registered ?? 0) + '</span></div>' +
-            '<div class="row"><span class="muted">API</span><span>' + esc(n.api_enabled ? "enabled" : "off") + '</span></div>' +
-            '<div class="row"><span class="muted">Growth</span><span class="growth-chip">' + esc(n.growth_stage || "infant") + '</span></div>' +
-            '<div class="row"><span class="muted">Messages</span><span>' + esc((n.messages_sent || 0) + " out / " + (n.messages_received || 0) + " in") + '</span></div>' +
-            '<div class="row"><span class="muted">Backup</span><span>' + esc((n.code_backup_status || "unknown") + " / " + (n.data_backup_status || "unknown")) + '</span></div>' +
-          '</div>'
-        );
-      }).join("");
-      document.getElementById("cards").innerHTML = html;
-    }
-    function renderGraph(data) {
-      const svg = document.getElementById("graph");
-      const nodes = data.nodes;
-      const cx = 500, cy = 180, r = 130;
-      const pos = {};
-      const stageRadius = { infant: 14, child: 18, teen: 22, adult: 26 };
-      nodes.forEach((n, i) => {
-        const angle = (Math.PI * 2 * i / Math.max(nodes.length, 1)) - Math.PI / 2;
-        pos[n.profile] = { x: cx + Math.cos(angle) * r * 2.1, y: cy + Math.sin(angle) * r };
-      });
-      const baseLines = (data.links || []).map(e => {
-        const a = pos[e.source_profile], b = pos[e.target_profile];
-        if (!a || !b) return "";
-        return '<line x1="' + a.x + '" y1="' + a.y + '" x2="' + b.x + '" y2="' + b.y + '" stroke="#3f4f64" stroke-width="2" stroke-dasharray="8 6" opacity="0.65"></line>';
-      }).join("");
-      const lines = (data.links || []).map(e => {
-        const a = pos[e.source_profile], b = pos[e.target_profile];
-        if (!a || !b) return "";
-        const active = Number(e.active_count || 0);
-        if (active <= 0) return "";
-        const width = Math.min(10, 2 + active);
-        return '<line x1="' + a.x + '" y1="' + a.y + '" x2="' + b.x + '" y2="' + b.y + '" stroke="#7aa2ff" stroke-width="' + width + '" opacity="0.75"></line>' +
-               '<text x="' + ((a.x + b.x) / 2) + '" y="' + ((a.y + b.y) / 2 - 8) + '" fill="#b8ccff" font-size="11">' + esc(active + " msgs") + '</text>';
-      }).join("");
-      const dots = nodes.map(n => {
-        const p = pos[n.profile] || {x: 50, y: 50};
-        const fill = n.up ? "#2ea043" : "#f85149";
-        const growth = n.growth_stage || "infant";
-        const radius = stageRadius[growth] || 14;
-        const babyGlow = growth === "infant" ? '0.35' : '0.15';
-        return '<circle cx="' + p.x + '" cy="' + p.y + '" r="' + (radius + 6) + '" fill="#89a6ff" opacity="' + babyGlow + '"></circle>' +
-               '<circle cx="' + p.x + '" cy="' + p.y + '" r="' + radius + '" fill="' + fill + '"></circle>' +
-               '<text x="' + p.x + '" y="' + (p.y + 4) + '" fill="#0b1220" text-anchor="middle" font-size="10">' + esc(growth) + '</text>' +
-               '<text x="' + p.x + '" y="' + (p.y + radius + 18) + '" fill="#d6e3f0" text-anchor="middle" font-size="12">' + esc(n.node_id) + '</text>';
-      }).join("");
-      svg.innerHTML = baseLines + lines + dots;
-    }
-    function renderFeed(data) {
-      const list = data.recent_messages.slice(0, 50).map(m => {
-        const q = m.question ? ('<div class="muted">q: ' + esc(m.question) + '</div>') : '';
-        const r = m.reply_message ? ('<div class="muted">reply: ' + esc(m.reply_message) + '</div>') : '';
-        const s = m.skill_id ? ('<div class="muted">skill: ' + esc(m.skill_id) + '@' + esc(m.skill_version || "n/a") + '</div>') : '';
-        return (
-          '<div class="feed-item">' +
-            '<div><strong>' + esc(m.source_node || m.source_profile || "unknown") + '</strong> → <strong>' + esc(m.target_node || m.target_profile || "unknown") + '</strong></div>' +
-            '<div class="muted">task=' + esc(m.task_type || "n/a") + ' | status=' + esc(m.status || "n/a") + '</div>' +
-            q + r + s +
-            '<div class="muted">' + esc(fmtTime(m.created_at_ts)) + '</div>' +
-          '</div>'
-        );
-      }).join("");
-      document.getElementById("feed").innerHTML = list || '<div class="muted">No recent messages yet.</div>';
-    }
-    async function refresh() {
-      try {
-        const r = await fetch("/dashboard/data", { cache: "no-store" });
-        if (!r.ok) throw new Error("HTTP " + r.status);
-        const data = await r.json();
-        renderSummary(data);
-        renderCards(data);
-        renderGraph(data);
-        renderFeed(data);
-      } catch (err) {
-        document.getElementById("summary").innerHTML = '<div class="tile"><div class="label">Dashboard</div><div class="value">Error loading data</div></div>';
-      }
-    }
-    refresh();
-    setInterval(refresh, 5000);
-  </script>
 </body>
 </html>
 """
 
 
+def _static_asset(content_type: str, body: bytes) -> tuple[str, bytes, bytes, str]:
+    return content_type, body, gzip.compress(body, compresslevel=9), hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+# The page is a small shell; its CSS and JS are served separately under content-hashed URLs
+# so browsers cache them across refreshes and process restarts.
+_DASHBOARD_ASSETS = {
+    "/dashboard/style.css": _static_asset("text/css; charset=utf-8", _DASHBOARD_CSS.encode("utf-8")),
+    "/dashboard/app.js": _static_asset("text/javascript; charset=utf-8", _DASHBOARD_JS.encode("utf-8")),
+}
+_DASHBOARD_HTML = _DASHBOARD_HTML_TEMPLATE.format(
+    css_etag=_DASHBOARD_ASSETS["/dashboard/style.css"][3],
+    js_etag=_DASHBOARD_ASSETS["/dashboard/app.js"][3],
+)
+_DASHBOARD_HTML_BYTES = _DASHBOARD_HTML.encode("utf-8")
+_DASHBOARD_HTML_GZIP = gzip.compress(_DASHBOARD_HTML_BYTES, compresslevel=9)
+
+
+def _parse_timestamp(raw: Any) -> int | None:
+    if raw is None:
+        return None
+    if isinstance(raw, int):
+        return raw
+    if isinstance(raw, str):
+        try:
+            return int(raw)
+        except ValueError:
+            pass
+        # "YYYY-MM-DD HH:MM:SS" from SQLite CURRENT_TIMESTAMP, which is UTC.
+        match = _SQL_TIMESTAMP_RE.match(raw)
+        if match is None:
+            return None
+        year, month, day, hour, minute, second = map(int, match.groups())
+        if not (1 <= month <= 12 and 1 <= day <= 31 and hour < 24 and minute < 60 and second < 62):
+            return None
+        return calendar.timegm((year, month, day, hour, minute, second))
+    return None
+
+
+_EMPTY_PAYLOAD: Mapping[str, Any] = MappingProxyType({})
+
+
+def _growth_score(node: dict[str, Any], traffic: int) -> int:
+    return (
+        2 * bool(node.get("up"))
+        + bool(node.get("api_enabled"))
+        + (node.get("code_backup_status") == "ok")
+        + (node.get("data_backup_status") == "ok")
+        + min(2, int(node.get("tools_registered", 0)) // 4)
+        + bisect_left(_GROWTH_TRAFFIC_THRESHOLDS, traffic)
+        + bisect_left(_GROWTH_CALL_THRESHOLDS, int(node.get("api_total_calls", 0)))
+    )
+
+
+def _slim_message(msg: dict[str, Any], src: str, dst: str, created_ts: int) -> dict[str, Any]:
+    payload = msg.get("payload")
+    if not isinstance(payload, dict):
+        payload = _EMPTY_PAYLOAD
+    reply = payload.get("reply")
+    return {
+        "id": msg.get("id"),
+        "direction": msg.get("direction"),
+        "source_profile": src,
+        "target_profile": dst,
+        "source_node": src,
+        "target_node": dst,
+        "task_type": msg.get("task_type"),
+        "status": msg.get("status"),
+        "question": payload.get("question"),
+        "reply_message": reply.get("message") if isinstance(reply, dict) else None,
+        "skill_id": payload.get("skill_id"),
+        "skill_version": payload.get("version"),
+        "skills_manifest_delta": payload.get("skills_manifest_delta"),
+        "created_at": msg.get("created_at"),
+        "created_at_ts": created_ts,
+    }
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTPServer that hands connections to a fixed worker pool instead of a new thread each."""
+
+    # socketserver's default listen backlog of 5 drops connects when a burst of probes arrives at once.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_cls: type[BaseHTTPRequestHandler],
+        *,
+        max_workers: int = DEFAULT_HTTP_WORKERS,
+    ) -> None:
+        super().__init__(server_address, handler_cls)
+        self._max_workers = max_workers
+        self._requests: queue.SimpleQueue[tuple[socket.socket, Any] | None] = queue.SimpleQueue()
+        # Connections accepted and not yet finished, whether running on a worker or still queued.
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        # Daemon workers, so a handler still blocked on a socket read cannot hold up interpreter exit.
+        self._workers = [
+            threading.Thread(target=self._work, name=f"health-http_{i}", daemon=True) for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def saturated(self) -> bool:
+        return self._busy >= self._max_workers
+
+    def process_request(self, request: socket.socket, client_address: Any) -> None:  # type: ignore[override]
+        with self._busy_lock:
+            self._busy += 1
+        self._requests.put((request, client_address))
+
+    def _work(self) -> None:
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:  # noqa: BLE001 - mirrors socketserver.ThreadingMixIn
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+                with self._busy_lock:
+                    self._busy -= 1
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Drop connections that never reached a worker, then let each worker exit after its current one.
+        while True:
+            try:
+                item = self._requests.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                self.shutdown_request(item[0])
+        for _ in self._workers:
+            self._requests.put(None)
+
+
+class _EventWriter:
+    """Write-behind queue that records episodic events off the request path, one commit per batch."""
+
+    def __init__(self, store: EpisodicMemoryStore, flush_interval_seconds: float, max_batch: int) -> None:
+        self._store = store
+        self._flush_interval_seconds = flush_interval_seconds
+        self._max_batch = max_batch
+        self._pending: deque[tuple[str, dict[str, Any], str | None, str | None]] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._failures = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="episodic-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer after flushing everything queued so far."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        for _ in range(EVENT_FLUSH_MAX_RETRIES + 1):
+            self._flush()
+            if not self._pending:
+                return
+
+    def record(self, event_type: str, payload: dict[str, Any], *, decision: str | None = None) -> None:
+        with self._cond:
+            if not self._closed:
+                self._pending.append((event_type, payload, None, decision))
+                if len(self._pending) >= self._max_batch:
+                    self._cond.notify_all()
+                return
+        # Late callbacks (e.g. a deploy finishing after stop()) write through.
+        self._store.record(event_type, payload, decision=decision)
+
+    def _flush(self) -> None:
+        while True:
+            with self._cond:
+                batch = [self._pending.popleft() for _ in range(min(self._max_batch, len(self._pending)))]
+            if not batch:
+                return
+            try:
+                self._store.record_many(batch)
+            except Exception as exc:  # noqa: BLE001 - an audit write failure must not kill the writer
+                self._failures += 1
+                if self._failures <= EVENT_FLUSH_MAX_RETRIES:
+                    # Keep queue order and try again on the next flush.
+                    with self._cond:
+                        self._pending.extendleft(reversed(batch))
+                    return
+                self._failures = 0
+                print(f"episodic writer: dropped {len(batch)} events after repeated failures: {exc!r}", file=sys.stderr)
+                continue
+            self._failures = 0
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) >= self._max_batch,
+                    timeout=self._flush_interval_seconds,
+                )
+                if self._closed:
+                    return
+            self._flush()
+
+
+class _DashboardStream:
+    """One refresh loop that publishes the latest dashboard frame to all SSE subscribers."""
+
+    def __init__(self, loader: Callable[[], bytes], interval_seconds: float) -> None:
+        self._loader = loader
+        self._interval_seconds = interval_seconds
+        self._cond = threading.Condition()
+        self._frame = b""
+        self._seq = 0
+        self._subscribers = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="dashboard-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def subscribe(self, max_subscribers: int) -> bool:
+        """Reserve a subscriber slot; callers that get True must call unsubscribe()."""
+        with self._cond:
+            if self._subscribers >= max_subscribers:
+                return False
+            self._subscribers += 1
+            self._cond.notify_all()
+            return True
+
+    def unsubscribe(self) -> None:
+        with self._cond:
+            self._subscribers -= 1
+
+    def frames(self, keepalive_seconds: float) -> Iterator[bytes | None]:
+        """Yield each new frame, or None when keepalive_seconds pass without one."""
+        with self._cond:
+            # Late joiners get the current frame right away instead of waiting a full tick.
+            seen = self._seq - 1 if self._seq else 0
+        while True:
+            with self._cond:
+                changed = self._cond.wait_for(lambda: self._closed or self._seq != seen, timeout=keepalive_seconds)
+                if self._closed:
+                    return
+                seen = self._seq
+                frame = self._frame if changed else None
+            yield frame
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                # Idle without viewers; the fan-out only runs while someone is watching.
+                self._cond.wait_for(lambda: self._closed or self._subscribers > 0)
+                if self._closed:
+                    return
+            try:
+                frame = self._loader()
+            except Exception:  # noqa: BLE001 - keep streaming; the next tick retries
+                frame = None
+            with self._cond:
+                if frame is not None:
+                    self._frame = frame
+                    self._seq += 1
+                    self._cond.notify_all()
+                self._cond.wait_for(lambda: self._closed, timeout=self._interval_seconds)
+
+
 class HealthServer:
     def __init__(
         self,
@@ -305,6 +784,7 @@ class HealthServer:
         skills_dir: Path | None = None,
         skill_packages_dir: Path | None = None,
         repo_root: Path | None = None,
+        http_workers: int = DEFAULT_HTTP_WORKERS,
     ) -> None:
         self._host = host
         self._port = port
@@ -320,21 +800,44 @@ class HealthServer:
         self._public_readonly_mode = public_readonly_mode
         self._public_readonly_get_endpoints = set(
             public_readonly_get_endpoints
-            or ["/health", "/status", "/api-usage", "/backup/status", "/dashboard", "/dashboard/data"]
+            or [
+                "/health",
+                "/status",
+                "/api-usage",
+                "/backup/status",
+                "/dashboard",
+                "/dashboard/data",
+                "/dashboard/stream",
+                "/dashboard/style.css",
+                "/dashboard/app.js",
+            ]
         )
         self._skills_dir = skills_dir or (Path.home() / "agent_skills")
         self._skill_packages_dir = skill_packages_dir or (Path.home() / "agentdata" / profile_name / "skill_packages")
         self._started_at = time.time()
+        self._http_workers = http_workers
         self._thread: threading.Thread | None = None
-        self._httpd: ThreadingHTTPServer | None = None
+        self._httpd: PooledHTTPServer | None = None
+        self._fetch_pool = ThreadPoolExecutor(max_workers=DASHBOARD_FETCH_WORKERS, thread_name_prefix="dashboard-fetch")
+        # Up to one idle socket per dashboard endpoint per node, reused across polls.
+        self._http = KeepAlivePool(max_idle_per_host=len(_DASHBOARD_NODE_ENDPOINTS))
+        self._dashboard_stream: _DashboardStream | None = None
+        self._llm_pool = ThreadPoolExecutor(max_workers=LLM_REPLY_WORKERS, thread_name_prefix="llm-reply")
+        self._event_writer = _EventWriter(episodic_memory, EVENT_FLUSH_INTERVAL_SECONDS, EVENT_FLUSH_MAX_BATCH)
 
     def start(self) -> None:
         handler_cls = self._build_handler()
-        self._httpd = ThreadingHTTPServer((self._host, self._port), handler_cls)
+        self._httpd = PooledHTTPServer((self._host, self._port), handler_cls, max_workers=self._http_workers)
         self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
         self._thread.start()
+        if self._dashboard_stream is not None:
+            self._dashboard_stream.start()
+        self._event_writer.start()
 
     def stop(self) -> None:
+        if self._dashboard_stream is not None:
+            # Release streaming handlers first so shutdown() is not left waiting on them.
+            self._dashboard_stream.stop()
         if self._httpd is not None:
             self._httpd.shutdown()
             self._httpd.server_close()
@@ -342,12 +845,17 @@ class HealthServer:
             self._thread.join(timeout=2)
         self._httpd = None
         self._thread = None
+        self._fetch_pool.shutdown(wait=False, cancel_futures=True)
+        self._llm_pool.shutdown(wait=False, cancel_futures=True)
+        self._http.close()
+        self._event_writer.stop()
 
     def _build_handler(self) -> type[BaseHTTPRequestHandler]:
         profile_name = self._profile_name
         tool_registry = self._tool_registry
         approval_engine = self._approval_engine
         episodic_memory = self._episodic_memory
+        event_writer = self._event_writer
         api_usage_provider = self._api_usage_provider
         backup_status_provider = self._backup_status_provider
         control_plane = self._control_plane
@@ -359,36 +867,70 @@ class HealthServer:
         started_at = self._started_at
         default_health_port = self._port
         repo_root = self._repo_root
+        fetch_pool = self._fetch_pool
+        llm_pool = self._llm_pool
+        http_pool = self._http
         profile_secrets_dir = Path.home() / "agentdata" / profile_name / "secrets"
         manifest_manager = SkillManifestManager(skills_dir / "manifest.yaml")
+        dashboard_cache = TTLCache(DASHBOARD_CACHE_TTL_SECONDS)
+        recent_messages_cache = TTLCache(RECENT_MESSAGES_CACHE_TTL_SECONDS)
+
+        def _recent_messages(limit: int) -> list[dict[str, Any]]:
+            # Dashboard refreshes and check-in replies landing in the same tick share one store scan.
+            if interop_bridge is None:
+                return []
+            rows = recent_messages_cache.get_or_set(
+                RECENT_MESSAGES_CACHE_LIMIT,
+                lambda: interop_bridge.recent_messages(limit=RECENT_MESSAGES_CACHE_LIMIT),
+            )
+            return rows[:limit]
 
         def _fetch_json(host: str, path: str, timeout: float = 1.5) -> dict[str, Any] | None:
             if not host:
                 return None
-            url = f"http://{host}:{default_health_port}{path}"
             try:
-                with request.urlopen(url, timeout=timeout) as resp:  # noqa: S310
-                    return json.loads(resp.read().decode("utf-8"))
-            except (error.URLError, TimeoutError, json.JSONDecodeError, OSError):
+                status, body = http_pool.get(host, default_health_port, path, timeout, DASHBOARD_FETCH_MAX_BYTES)
+                if status >= 400:
+                    return None
+                payload = json_codec.loads(body)
+            except (http.client.HTTPException, ValueError, OSError):
                 return None
+            return payload if isinstance(payload, dict) else None
 
-        def _parse_timestamp(raw: Any) -> int | None:
-            if raw is None:
-                return None
-            if isinstance(raw, int):
-                return raw
-            if isinstance(raw, str):
-                try:
-                    return int(raw)
-                except ValueError:
-                    pass
-                try:
-                    # "YYYY-MM-DD HH:MM:SS"
-                    parts = raw.strip().replace("T", " ").split(".")[0]
-                    return int(time.mktime(time.strptime(parts, "%Y-%m-%d %H:%M:%S")))
-                except (ValueError, OSError):
-                    return None
-            return None
+        status_cache: tuple[tuple[int, int, int], dict[str, Any], bytes] | None = None
+        status_lock = threading.Lock()
+
+        def _status_entry() -> tuple[dict[str, Any], bytes]:
+            # Rebuilt and re-encoded only when a tool, approval or episodic write bumped one of the versions.
+            nonlocal status_cache
+            versions = (tool_registry.version, approval_engine.version, episodic_memory.version)
+            with status_lock:
+                if status_cache is not None and status_cache[0] == versions:
+                    return status_cache[1], status_cache[2]
+            payload = {
+                "profile": profile_name,
+                "tools_registered": tool_registry.count(),
+                "tools": tool_registry.list_tools(),
+                "pending_approvals": len(approval_engine.list_pending(limit=1000)),
+                "recent_events": len(episodic_memory.latest(limit=10)),
+            }
+            encoded = json_codec.dumps_bytes(payload)
+            with status_lock:
+                status_cache = (versions, payload, encoded)
+            return payload, encoded
+
+        def _status_payload() -> dict[str, Any]:
+            return _status_entry()[0]
+
+        # Endpoints whose providers do real work per call (SQL aggregates, network probes) share
+        # one encoded body for a second, so tight polling loops cost one build per second.
+        response_cache = TTLCache(RESPONSE_CACHE_TTL_SECONDS)
+
+        # Only uptime varies, so /health is the encoded prefix plus one integer.
+        health_prefix = b'{"status":"ok","profile":' + json_codec.dumps_bytes(profile_name) + b',"uptime":'
+
+        def _health_json() -> bytes:
+            return b"%s%d}" % (health_prefix, int(time.time() - started_at))
 
         def _is_hub_node() -> bool:
             if interop_bridge is None:
@@ -449,7 +991,7 @@ class HealthServer:
             skill_packages_dir.mkdir(parents=True, exist_ok=True)
             skills_dir.mkdir(parents=True, exist_ok=True)
             bundle_path = skill_packages_dir / f"{skill_id}-{version}.tar.gz"
-            bundle_path.write_bytes(b64decode(bundle_b64.encode("utf-8")))
+            write_bundle_b64(bundle_b64, bundle_path)
             actual_checksum = sha256_file(bundle_path)
             if actual_checksum != checksum:
                 raise RuntimeError("Skill bundle checksum mismatch")
@@ -496,16 +1038,26 @@ class HealthServer:
                 "tests": tests_result,
             }
 
-        def _build_dashboard_data() -> dict[str, Any]:
-            def _growth_stage(score: int) -> str:
-                if score <= 2:
-                    return "infant"
-                if score <= 5:
-                    return "child"
-                if score <= 8:
-                    return "teen"
-                return "adult"
+        link_topology_cache: tuple[
+            tuple[str, tuple[str, ...]], tuple[tuple[str, tuple[str, str], tuple[str, str]], ...]
+        ] | None = None
 
+        def _link_topology(
+            master_profile: str, profiles: tuple[str, ...]
+        ) -> tuple[tuple[str, tuple[str, str], tuple[str, str]], ...]:
+            # The master->node pairs only change when the fleet does; counts are filled in per refresh.
+            nonlocal link_topology_cache
+            key = (master_profile, profiles)
+            cached = link_topology_cache
+            if cached is not None and cached[0] == key:
+                return cached[1]
+            topology = tuple(
+                (p, (master_profile, p), (p, master_profile)) for p in profiles if p != master_profile
+            )
+            link_topology_cache = (key, topology)
+            return topology
+
+        def _build_dashboard_data() -> dict[str, Any]:
             if control_plane is None:
                 return {
                     "generated_at": int(time.time()),
@@ -516,28 +1068,32 @@ class HealthServer:
                     "recent_messages": [],
                 }
 
+            nodes = control_plane.list_nodes()
+            # Fetch every (node, endpoint) pair concurrently so a refresh costs the slowest node, not the sum.
+            # The local node is answered in-process below, so it never loops back over HTTP.
+            fetches = {
+                (index, endpoint): fetch_pool.submit(_fetch_json, node.get("host") or "", endpoint)
+                for index, node in enumerate(nodes)
+                if node.get("configured") and str(node.get("profile") or node.get("node_id") or "") != profile_name
+                for endpoint in _DASHBOARD_NODE_ENDPOINTS
+            }
+            fetched = {key: future.result() for key, future in fetches.items()}
+
             nodes_payload: list[dict[str, Any]] = []
-            for node in control_plane.list_nodes():
+            for index, node in enumerate(nodes):
                 host = node.get("host") or ""
                 configured = bool(node.get("configured"))
                 profile = str(node.get("profile") or node.get("node_id") or "")
-                health = _fetch_json(host, "/health") if configured else None
-                status_payload = _fetch_json(host, "/status") if configured else None
-                api_usage = _fetch_json(host, "/api-usage?window_days=7") if configured else None
-                backup = _fetch_json(host, "/backup/status") if configured else None
+                health, status_payload, api_usage, backup = (
+                    fetched.get((index, endpoint)) for endpoint in _DASHBOARD_NODE_ENDPOINTS
+                )
 
-                # Fallback for local node if host fetch is unavailable.
+                # Local node: build its payloads in-process.
                 if profile == profile_name:
                     if health is None:
                         health = {"status": "ok", "profile": profile_name, "uptime": int(time.time() - started_at)}
                     if status_payload is None:
-                        status_payload = {
-                            "profile": profile_name,
-                            "tools_registered": tool_registry.count(),
-                            "tools": tool_registry.list_tools(),
-                            "pending_approvals": len(approval_engine.list_pending(limit=1000)),
-                            "recent_events": len(episodic_memory.latest(limit=10)),
-                        }
+                        status_payload = _status_payload()
                     if api_usage is None:
                         api_usage = api_usage_provider(window_days=7)
                     if backup is None:
@@ -573,117 +1129,67 @@ class HealthServer:
                     }
                 )
 
-            recent_messages = interop_bridge.recent_messages(limit=200) if interop_bridge is not None else []
+            recent_messages = _recent_messages(200)
+            parsed_messages = [
+                (
+                    msg,
+                    str(msg.get("source_node") or ""),
+                    str(msg.get("target_node") or ""),
+                    _parse_timestamp(msg.get("created_at")) or 0,
+                )
+                for msg in recent_messages
+            ]
             edge_map: dict[tuple[str, str], dict[str, Any]] = {}
-            message_counts: dict[str, dict[str, int]] = {}
-            recent_slim: list[dict[str, Any]] = []
-            for msg in recent_messages:
-                src = str(msg.get("source_node") or "")
-                dst = str(msg.get("target_node") or "")
-                created_ts = _parse_timestamp(msg.get("created_at")) or 0
-                if src and dst:
-                    key = (src, dst)
-                    if key not in edge_map:
-                        edge_map[key] = {
-                            "source_profile": src,
-                            "target_profile": dst,
-                            "count": 0,
-                            "last_task_type": msg.get("task_type"),
-                            "last_ts": created_ts,
-                        }
-                    edge_map[key]["count"] += 1
-                    if created_ts >= int(edge_map[key].get("last_ts", 0)):
-                        edge_map[key]["last_task_type"] = msg.get("task_type")
-                        edge_map[key]["last_ts"] = created_ts
-                    message_counts.setdefault(src, {"sent": 0, "received": 0})["sent"] += 1
-                    message_counts.setdefault(dst, {"sent": 0, "received": 0})["received"] += 1
-                recent_slim.append(
-                    {
-                        "id": msg.get("id"),
-                        "direction": msg.get("direction"),
+            sent_counts: Counter[str] = Counter()
+            received_counts: Counter[str] = Counter()
+            for msg, src, dst, created_ts in parsed_messages:
+                if not (src and dst):
+                    continue
+                edge = edge_map.get((src, dst))
+                if edge is None:
+                    edge = edge_map[(src, dst)] = {
                         "source_profile": src,
                         "target_profile": dst,
-                        "source_node": src,
-                        "target_node": dst,
-                        "task_type": msg.get("task_type"),
-                        "status": msg.get("status"),
-                        "question": (msg.get("payload") or {}).get("question")
-                        if isinstance(msg.get("payload"), dict)
-                        else None,
-                        "reply_message": (
-                            ((msg.get("payload") or {}).get("reply") or {}).get("message")
-                            if isinstance((msg.get("payload") or {}).get("reply"), dict)
-                            else None
-                        )
-                        if isinstance(msg.get("payload"), dict)
-                        else None,
-                        "skill_id": (msg.get("payload") or {}).get("skill_id")
-                        if isinstance(msg.get("payload"), dict)
-                        else None,
-                        "skill_version": (msg.get("payload") or {}).get("version")
-                        if isinstance(msg.get("payload"), dict)
-                        else None,
-                        "skills_manifest_delta": (msg.get("payload") or {}).get("skills_manifest_delta")
-                        if isinstance(msg.get("payload"), dict)
-                        else None,
-                        "created_at": msg.get("created_at"),
-                        "created_at_ts": created_ts,
+                        "count": 0,
+                        "last_task_type": None,
+                        "last_ts": created_ts,
                     }
-                )
+                edge["count"] += 1
+                if created_ts >= edge["last_ts"]:
+                    edge["last_task_type"] = msg.get("task_type")
+                    edge["last_ts"] = created_ts
+                sent_counts[src] += 1
+                received_counts[dst] += 1
+            recent_slim = [_slim_message(*item) for item in parsed_messages]
 
             for node in nodes_payload:
                 profile = str(node.get("profile") or "")
-                sent = int(message_counts.get(profile, {}).get("sent", 0))
-                received = int(message_counts.get(profile, {}).get("received", 0))
+                sent = sent_counts[profile]
+                received = received_counts[profile]
                 node["messages_sent"] = sent
                 node["messages_received"] = received
 
-                score = 0
-                if node.get("up"):
-                    score += 2
-                if node.get("api_enabled"):
-                    score += 1
-                if node.get("code_backup_status") == "ok":
-                    score += 1
-                if node.get("data_backup_status") == "ok":
-                    score += 1
-                score += min(2, int(node.get("tools_registered", 0)) // 4)
-
-                traffic = sent + received
-                if traffic > 20:
-                    score += 3
-                elif traffic > 5:
-                    score += 2
-                elif traffic > 0:
-                    score += 1
-
-                calls = int(node.get("api_total_calls", 0))
-                if calls > 200:
-                    score += 2
-                elif calls > 20:
-                    score += 1
-
+                score = _growth_score(node, sent + received)
                 node["growth_score"] = score
-                node["growth_stage"] = _growth_stage(score)
+                node["growth_stage"] = _GROWTH_STAGES[score] if score < len(_GROWTH_STAGES) else "adult"
 
             master_profile = profile_name
             profiles = [str(n.get("profile") or "") for n in nodes_payload if str(n.get("profile") or "")]
             if master_profile not in profiles and profiles:
                 master_profile = profiles[0]
             links: list[dict[str, Any]] = []
-            for p in profiles:
-                if p == master_profile:
-                    continue
-                forward = edge_map.get((master_profile, p), {})
-                reverse = edge_map.get((p, master_profile), {})
-                active_count = int(forward.get("count", 0)) + int(reverse.get("count", 0))
+            for target, forward_key, reverse_key in _link_topology(master_profile, tuple(profiles)):
+                forward = edge_map.get(forward_key)
+                reverse = edge_map.get(reverse_key)
+                forward_count = forward["count"] if forward else 0
+                reverse_count = reverse["count"] if reverse else 0
                 links.append(
                     {
                         "source_profile": master_profile,
-                        "target_profile": p,
-                        "active_count": active_count,
-                        "forward_count": int(forward.get("count", 0)),
-                        "reverse_count": int(reverse.get("count", 0)),
+                        "target_profile": target,
+                        "active_count": forward_count + reverse_count,
+                        "forward_count": forward_count,
+                        "reverse_count": reverse_count,
                     }
                 )
 
@@ -720,7 +1226,7 @@ class HealthServer:
                 for s in local_skills
             ]
             skills_blob = "\n".join(skill_summary_lines) if skill_summary_lines else "none"
-            recent = interop_bridge.recent_messages(limit=12) if interop_bridge is not None else []
+            recent = _recent_messages(12)
             recent_lines: list[str] = []
             for item in recent:
                 recent_lines.append(
@@ -781,282 +1287,519 @@ class HealthServer:
                     "skills_manifest_delta": manifest_delta,
                 }
 
+        llm_slots = threading.BoundedSemaphore(LLM_REPLY_MAX_INFLIGHT)
+        llm_replies: OrderedDict[str, Future[dict[str, Any]]] = OrderedDict()
+        llm_replies_lock = threading.Lock()
+
+        def _submit_checkin_reply(source_profile: str, payload: dict[str, Any]) -> tuple[str, Future[dict[str, Any]]] | None:
+            # Returns None when the backlog is full so callers can answer "busy" instead of queueing forever.
+            if not llm_slots.acquire(blocking=False):
+                return None
+            future = llm_pool.submit(_llm_skills_checkin_reply, source_profile=source_profile, payload=payload)
+            future.add_done_callback(lambda _: llm_slots.release())
+            request_id = uuid.uuid4().hex
+            with llm_replies_lock:
+                llm_replies[request_id] = future
+                while len(llm_replies) > LLM_REPLY_RESULTS_KEPT:
+                    llm_replies.popitem(last=False)
+            return request_id, future
+
+        def _dashboard_json() -> tuple[bytes, bytes]:
+            # Cache the serialized (and gzipped) body so cache hits skip the fan-out and all encoding.
+            def _load() -> tuple[bytes, bytes]:
+                encoded = json_codec.dumps_bytes(_build_dashboard_data())
+                return encoded, gzip.compress(encoded, compresslevel=6)
+
+            return dashboard_cache.get_or_set((), _load)
+
+        dashboard_stream = _DashboardStream(lambda: _dashboard_json()[0], DASHBOARD_CACHE_TTL_SECONDS)
+        self._dashboard_stream = dashboard_stream
+        max_stream_subscribers = max(1, self._http_workers // 4)
+
         class Handler(BaseHTTPRequestHandler):
+            # Every response carries Content-Length, so clients (including fleet probes) can keep
+            # the connection open. timeout bounds reading a request; between requests the socket
+            # only waits HTTP_KEEPALIVE_IDLE_SECONDS so idle clients do not pin workers.
+            protocol_version = "HTTP/1.1"
+            timeout = 10
+            _served_request = False
+            _body_consumed = False
+            # Buffer writes so the status line, headers and a small body leave in one send; the base
+            # class flushes after each request, and streaming responses flush per frame.
+            wbufsize = 64 * 1024
+            # Set TCP_NODELAY on accepted sockets so small replies and SSE frames are not held back by Nagle.
+            disable_nagle_algorithm = True
+
+            def handle_one_request(self) -> None:
+                if self._served_request:
+                    self.connection.settimeout(HTTP_KEEPALIVE_IDLE_SECONDS)
+                super().handle_one_request()
+                self._served_request = True
+
+            def parse_request(self) -> bool:
+                # The request line has arrived; give headers and body the full timeout again.
+                self.connection.settimeout(self.timeout)
+                self._body_consumed = False
+                return super().parse_request()
+
             def do_GET(self) -> None:  # noqa: N802
-                parsed = urlparse(self.path)
-                path = parsed.path
-                query = parse_qs(parsed.query)
+                path, _, raw_query = self.path.partition("?")
 
                 if public_readonly_mode and path not in public_readonly_get_endpoints:
                     self._write_json(403, {"error": "Endpoint blocked in public read-only mode"})
                     return
 
-                if path == "/health":
-                    self._write_json(
-                        200,
-                        {
-                            "status": "ok",
-                            "profile": profile_name,
-                            "uptime": int(time.time() - started_at),
-                        },
-                    )
+                route = get_routes.get(path)
+                if route is not None:
+                    route(self, parse_qs(raw_query) if raw_query else {})
                     return
-
-                if path == "/status":
-                    self._write_json(
-                        200,
-                        {
-                            "profile": profile_name,
-                            "tools_registered": tool_registry.count(),
-                            "tools": tool_registry.list_tools(),
-                            "pending_approvals": len(approval_engine.list_pending(limit=1000)),
-                            "recent_events": len(episodic_memory.latest(limit=10)),
-                        },
-                    )
+                if path in _DASHBOARD_ASSETS:
+                    self._write_static_asset(*_DASHBOARD_ASSETS[path])
                     return
-
-                if path == "/approvals":
-                    pending = approval_engine.list_pending(limit=100)
-                    recent = approval_engine.list_recent(limit=100)
-                    self._write_json(200, {"pending": pending, "recent": recent})
+                if path.startswith("/interop/result/"):
+                    self._get_interop_result(path.removeprefix("/interop/result/"))
                     return
 
-                if path == "/logs":
-                    self._write_json(200, {"events": episodic_memory.latest(limit=200)})
-                    return
+                self._write_json(404, {"error": "Not found"})
 
-                if path == "/api-usage":
-                    raw_days = (query.get("window_days") or [None])[0]
-                    window_days: int | None = None
-                    if raw_days:
-                        try:
-                            window_days = int(raw_days)
-                        except ValueError:
-                            self._write_json(400, {"error": "window_days must be an integer"})
-                            return
-                    self._write_json(200, api_usage_provider(window_days=window_days))
-                    return
-                if path == "/backup/status":
-                    self._write_json(200, backup_status_provider())
-                    return
-                if path == "/fleet/status":
-                    if control_plane is None:
-                        self._write_json(404, {"error": "Fleet control plane disabled"})
+            def _get_health(self, query: dict[str, list[str]]) -> None:
+                self._write_json_bytes(200, _health_json())
+
+            def _get_status(self, query: dict[str, list[str]]) -> None:
+                self._write_json_bytes(200, _status_entry()[1])
+
+            def _get_approvals(self, query: dict[str, list[str]]) -> None:
+                pending = approval_engine.list_pending(limit=100)
+                recent = approval_engine.list_recent(limit=100)
+                self._write_json(200, {"pending": pending, "recent": recent})
+
+            def _get_logs(self, query: dict[str, list[str]]) -> None:
+                self._write_json(200, {"events": episodic_memory.latest(limit=200)})
+
+            def _get_api_usage(self, query: dict[str, list[str]]) -> None:
+                raw_days = (query.get("window_days") or [None])[0]
+                window_days: int | None = None
+                if raw_days:
+                    try:
+                        # Clamped so the response cache key space stays small.
+                        window_days = max(1, min(MAX_USAGE_WINDOW_DAYS, int(raw_days)))
+                    except ValueError:
+                        self._write_json(400, {"error": "window_days must be an integer"})
                         return
-                    self._write_json(200, control_plane.health_report())
+                self._write_json_bytes(
+                    200,
+                    response_cache.get_or_set(
+                        ("/api-usage", window_days),
+                        lambda: json_codec.dumps_bytes(api_usage_provider(window_days=window_days)),
+                    ),
+                )
+
+            def _get_backup_status(self, query: dict[str, list[str]]) -> None:
+                self._write_json(200, backup_status_provider())
+
+            def _get_fleet_status(self, query: dict[str, list[str]]) -> None:
+                if control_plane is None:
+                    self._write_json(404, {"error": "Fleet control plane disabled"})
                     return
-                if path == "/interop/messages":
-                    if interop_bridge is None:
-                        self._write_json(404, {"error": "Interop bridge disabled"})
-                        return
-                    self._write_json(200, {"messages": interop_bridge.recent_messages(limit=200)})
+                self._write_json_bytes(
+                    200,
+                    response_cache.get_or_set(
+                        "/fleet/status", lambda: json_codec.dumps_bytes(control_plane.health_report())
+                    ),
+                )
+
+            def _get_fleet_deploy_status(self, query: dict[str, list[str]]) -> None:
+                if control_plane is None:
+                    self._write_json(404, {"error": "Fleet control plane disabled"})
                     return
-                if path == "/dashboard":
-                    self._write_html(200, _DASHBOARD_HTML)
+                job_id = (query.get("job_id") or [""])[0]
+                job = control_plane.deploy_status(job_id)
+                if job is None:
+                    self._write_json(404, {"error": "Unknown deploy job"})
                     return
-                if path == "/dashboard/data":
-                    self._write_json(200, _build_dashboard_data())
+                self._write_json(200, job)
+
+            def _get_interop_messages(self, query: dict[str, list[str]]) -> None:
+                if interop_bridge is None:
+                    self._write_json(404, {"error": "Interop bridge disabled"})
                     return
+                self._write_json(200, {"messages": interop_bridge.recent_messages(limit=200)})
 
-                self._write_json(404, {"error": "Not found"})
+            def _get_dashboard(self, query: dict[str, list[str]]) -> None:
+                self._write_body(200, "text/html; charset=utf-8", _DASHBOARD_HTML_BYTES, _DASHBOARD_HTML_GZIP)
+
+            def _get_dashboard_data(self, query: dict[str, list[str]]) -> None:
+                self._write_json_bytes(200, *_dashboard_json())
+
+            def _get_dashboard_stream(self, query: dict[str, list[str]]) -> None:
+                self._stream_dashboard()
+
+            def _get_interop_result(self, request_id: str) -> None:
+                with llm_replies_lock:
+                    future = llm_replies.get(request_id)
+                if future is None:
+                    self._write_json(404, {"error": "Unknown request_id"})
+                elif not future.done():
+                    self._write_json(202, {"request_id": request_id, "status": "pending"})
+                elif future.cancelled() or future.exception() is not None:
+                    error = "Reply was cancelled" if future.cancelled() else str(future.exception())
+                    self._write_json(500, {"request_id": request_id, "status": "failed", "error": error})
+                else:
+                    self._write_json(200, {"request_id": request_id, "status": "done", "reply": future.result()})
 
             def do_POST(self) -> None:  # noqa: N802
                 if public_readonly_mode:
                     self._write_json(403, {"error": "POST endpoints disabled in public read-only mode"})
                     return
-                path = self.path.split("?")[0]
-                if path == "/tools/execute":
-                    try:
-                        content_len = int(self.headers.get("Content-Length", 0))
-                        body = self.rfile.read(content_len).decode("utf-8")
-                        data = json.loads(body) if body else {}
-                    except (ValueError, json.JSONDecodeError):
-                        self._write_json(400, {"error": "Invalid JSON body"})
-                        return
-                    tool_name = (data.get("tool_name") or "").strip()
-                    payload = data.get("payload")
-                    if not tool_name:
-                        self._write_json(400, {"error": "Missing tool_name"})
-                        return
-                    if payload is None:
-                        payload = {}
-                    result = tool_registry.execute(tool_name, payload)
-                    status = 200 if result.ok else 400
-                    self._write_json(status, {"ok": result.ok, "output": result.output})
+                path = self.path.partition("?")[0]
+                route = post_routes.get(path)
+                if route is not None:
+                    route(self)
                     return
-                if path.startswith("/approvals/") and path.endswith("/resolve"):
-                    try:
-                        approval_id = int(path.split("/")[2])
-                    except (IndexError, ValueError):
+                approval_route = _APPROVAL_ROUTE_RE.fullmatch(path)
+                if approval_route is not None:
+                    approval_id_raw, action = approval_route.groups()
+                    if not approval_id_raw.isdecimal():
                         self._write_json(400, {"error": "Invalid approval id"})
-                        return
-                    try:
-                        content_len = int(self.headers.get("Content-Length", 0))
-                        body = self.rfile.read(content_len).decode("utf-8")
-                        data = json.loads(body) if body else {}
-                    except (ValueError, json.JSONDecodeError):
-                        self._write_json(400, {"error": "Invalid JSON body"})
-                        return
-                    approve = data.get("approve", False)
-                    if approval_engine.resolve(approval_id, approve=approve):
-                        episodic_memory.record(
-                            "approval_resolved",
-                            {"approval_id": approval_id, "approve": bool(approve)},
-                            decision="allow",
-                        )
-                        self._write_json(200, {"resolved": True, "approve": approve})
+                    elif action == "resolve":
+                        self._post_approval_resolve(int(approval_id_raw))
                     else:
-                        self._write_json(404, {"error": "Approval not found or already resolved"})
+                        self._post_approval_execute(int(approval_id_raw))
                     return
-                if path.startswith("/approvals/") and path.endswith("/execute"):
-                    try:
-                        approval_id = int(path.split("/")[2])
-                    except (IndexError, ValueError):
-                        self._write_json(400, {"error": "Invalid approval id"})
-                        return
-                    result = tool_registry.execute_approved(approval_id)
-                    status = 200 if result.ok else 400
-                    episodic_memory.record(
-                        "approval_execution_attempted",
-                        {"approval_id": approval_id, "ok": result.ok, "output": result.output},
-                        decision="allow" if result.ok else "deny",
+                self._write_json(404, {"error": "Not found"})
+
+            def _post_tools_execute(self) -> None:
+                data = self._read_json_body()
+                if data is None:
+                    return
+                tool_name = (data.get("tool_name") or "").strip()
+                payload = data.get("payload")
+                if not tool_name:
+                    self._write_json(400, {"error": "Missing tool_name"})
+                    return
+                if payload is None:
+                    payload = {}
+                result = tool_registry.execute(tool_name, payload)
+                status = 200 if result.ok else 400
+                self._write_json(status, {"ok": result.ok, "output": result.output})
+
+            def _post_approval_resolve(self, approval_id: int) -> None:
+                data = self._read_json_body()
+                if data is None:
+                    return
+                approve = data.get("approve", False)
+                if approval_engine.resolve(approval_id, approve=approve):
+                    event_writer.record(
+                        "approval_resolved",
+                        {"approval_id": approval_id, "approve": bool(approve)},
+                        decision="allow",
                     )
-                    self._write_json(status, {"ok": result.ok, "output": result.output})
+                    self._write_json(200, {"resolved": True, "approve": approve})
+                else:
+                    self._write_json(404, {"error": "Approval not found or already resolved"})
+
+            def _post_approval_execute(self, approval_id: int) -> None:
+                result = tool_registry.execute_approved(approval_id)
+                status = 200 if result.ok else 400
+                event_writer.record(
+                    "approval_execution_attempted",
+                    {"approval_id": approval_id, "ok": result.ok, "output": result.output},
+                    decision="allow" if result.ok else "deny",
+                )
+                self._write_json(status, {"ok": result.ok, "output": result.output})
+
+            def _post_fleet_deploy(self) -> None:
+                if control_plane is None:
+                    self._write_json(404, {"error": "Fleet control plane disabled"})
                     return
-                if path == "/fleet/deploy":
-                    if control_plane is None:
-                        self._write_json(404, {"error": "Fleet control plane disabled"})
-                        return
-                    deploy_result = control_plane.deploy_all()
-                    episodic_memory.record(
-                        "fleet_deploy_triggered",
-                        {"ok": deploy_result.get("ok", False), "returncode": deploy_result.get("returncode")},
-                        decision="allow" if deploy_result.get("ok", False) else "deny",
+                # deploy_all.sh can run for many minutes; hand back a job id and poll /fleet/deploy/status.
+                def _record_deploy(job: dict[str, Any]) -> None:
+                    event_writer.record(
+                        "fleet_deploy_finished",
+                        {"job_id": job["job_id"], "ok": job.get("ok", False), "returncode": job.get("returncode")},
+                        decision="allow" if job.get("ok", False) else "deny",
                     )
-                    self._write_json(200 if deploy_result.get("ok", False) else 500, deploy_result)
+
+                job = control_plane.deploy_all_async(on_complete=_record_deploy)
+                if not job.get("coalesced"):
+                    event_writer.record("fleet_deploy_triggered", {"job_id": job["job_id"]}, decision="allow")
+                self._write_json(202, job)
+
+            def _post_interop_inbox(self) -> None:
+                if interop_bridge is None:
+                    self._write_json(404, {"error": "Interop bridge disabled"})
                     return
-                if path == "/interop/inbox":
-                    if interop_bridge is None:
-                        self._write_json(404, {"error": "Interop bridge disabled"})
-                        return
-                    try:
-                        content_len = int(self.headers.get("Content-Length", 0))
-                        body = self.rfile.read(content_len).decode("utf-8")
-                        data = json.loads(body) if body else {}
-                    except (ValueError, json.JSONDecodeError):
-                        self._write_json(400, {"error": "Invalid JSON body"})
-                        return
-                    envelope = data.get("envelope")
-                    if not isinstance(envelope, dict):
-                        self._write_json(400, {"error": "Missing envelope object"})
-                        return
-                    try:
-                        accepted = interop_bridge.receive_envelope(envelope)
-                        response: dict[str, Any] = dict(accepted)
-                        task_type = str(accepted.get("task_type") or "")
-                        payload_obj = dict(accepted.get("payload") or {})
-                        if task_type == "skills_checkin":
-                            response["reply"] = _llm_skills_checkin_reply(
-                                source_profile=str(accepted.get("source") or "unknown"),
-                                payload=payload_obj,
-                            )
-                        elif task_type == "route_envelope":
-                            if not _is_hub_node():
-                                raise RuntimeError("route_envelope is only accepted by hub node")
-                            inner_envelope = payload_obj.get("envelope")
-                            response["relay"] = interop_bridge.forward_relay_envelope(
-                                relayer_source=str(accepted.get("source") or ""),
-                                inner_envelope=inner_envelope if isinstance(inner_envelope, dict) else {},
-                            )
-                        elif task_type == "skill_request":
-                            if not _is_hub_node():
-                                raise RuntimeError("skill_request is only accepted by hub node")
-                            approval_id = approval_engine.enqueue(
-                                profile_name=profile_name,
-                                tool_name="skill_request",
-                                tier="interop_skill",
-                                payload=payload_obj,
-                            )
-                            response["skill_request"] = {
-                                "ok": True,
-                                "approval_required": True,
-                                "approval_id": approval_id,
-                                "status": "pending",
+                data = self._read_json_body()
+                if data is None:
+                    return
+                envelope = data.get("envelope")
+                if not isinstance(envelope, dict):
+                    self._write_json(400, {"error": "Missing envelope object"})
+                    return
+                try:
+                    accepted = interop_bridge.receive_envelope(envelope)
+                    # receive_envelope hands back a fresh dict, so the reply fields are added to it in place.
+                    response: dict[str, Any] = accepted
+                    response_status = 200
+                    task_type = str(accepted.get("task_type") or "")
+                    payload_obj = accepted.get("payload") or {}
+                    if task_type == "skills_checkin":
+                        job = _submit_checkin_reply(str(accepted.get("source") or "unknown"), payload_obj)
+                        if job is None:
+                            response["reply"] = {
+                                "kind": "skills_checkin_reply",
+                                "ok": False,
+                                "error": "LLM reply backlog full; try again later",
+                                "new_skills": [],
                             }
-                        elif task_type == "skill_approve":
-                            if not _is_hub_node():
-                                raise RuntimeError("skill_approve is only accepted by hub node")
-                            approval_id = int(payload_obj.get("approval_id", 0) or 0)
-                            approved = bool(payload_obj.get("approved", False))
-                            if approval_id <= 0:
-                                raise RuntimeError("skill_approve requires approval_id")
-                            if not approval_engine.resolve(approval_id, approve=approved):
-                                raise RuntimeError("Unable to resolve approval_id")
-                            response["skill_approve"] = {"ok": True, "approval_id": approval_id, "approved": approved}
-                        elif task_type == "skill_deliver":
-                            source_profile = str(accepted.get("source") or "unknown")
-                            install_result = _install_skill_bundle(payload_obj, source_profile)
-                            response["skill_install_result"] = install_result
-                            if interop_bridge.hub_profile() and source_profile != interop_bridge.hub_profile():
-                                result_payload = {
-                                    "kind": "skill_install_result",
-                                    "origin_source": source_profile,
-                                    **install_result,
-                                }
+                        else:
+                            reply = None
+                            if payload_obj.get("reply_mode") != "async":
+                                # Older senders expect the reply inline; a slow LLM falls back to polling.
                                 try:
-                                    response["hub_report"] = interop_bridge.send_task(
-                                        interop_bridge.hub_profile() or source_profile,
-                                        "skill_install_result",
-                                        result_payload,
-                                        route_via="auto",
-                                    )
-                                except RuntimeError as exc:
-                                    response["hub_report_error"] = str(exc)
-                        elif task_type == "skill_install_result":
-                            if interop_bridge is not None:
-                                interop_bridge.record_skill_install_event(
-                                    profile_name=str(payload_obj.get("target_profile") or accepted.get("target") or profile_name),
-                                    skill_id=str(payload_obj.get("skill_id") or ""),
-                                    version=str(payload_obj.get("version") or ""),
-                                    status="ok" if bool(payload_obj.get("ok")) else "failed",
-                                    details=payload_obj,
-                                )
-                            response["skill_install_recorded"] = True
-                        episodic_memory.record(
-                            "interop_message_received",
-                            {"source": accepted["source"], "task_type": accepted["task_type"], "nonce": accepted["nonce"]},
-                            decision="allow",
+                                    reply = job[1].result(timeout=LLM_REPLY_INLINE_WAIT_SECONDS)
+                                except FutureTimeoutError:
+                                    pass
+                            if reply is not None:
+                                response["reply"] = reply
+                            else:
+                                # Answer now and let the sender poll /interop/result/<id>.
+                                response_status = 202
+                                response["reply_pending"] = {
+                                    "request_id": job[0],
+                                    "result_path": f"/interop/result/{job[0]}",
+                                }
+                    elif task_type == "route_envelope":
+                        if not _is_hub_node():
+                            raise RuntimeError("route_envelope is only accepted by hub node")
+                        inner_envelope = payload_obj.get("envelope")
+                        response["relay"] = interop_bridge.forward_relay_envelope(
+                            relayer_source=str(accepted.get("source") or ""),
+                            inner_envelope=inner_envelope if isinstance(inner_envelope, dict) else {},
                         )
-                        self._write_json(200, response)
-                    except RuntimeError as exc:
-                        episodic_memory.record(
-                            "interop_message_rejected",
-                            {"error": str(exc)},
-                            decision="deny",
+                    elif task_type == "skill_request":
+                        if not _is_hub_node():
+                            raise RuntimeError("skill_request is only accepted by hub node")
+                        approval_id = approval_engine.enqueue(
+                            profile_name=profile_name,
+                            tool_name="skill_request",
+                            tier="interop_skill",
+                            payload=payload_obj,
                         )
-                        self._write_json(400, {"error": str(exc)})
+                        response["skill_request"] = {
+                            "ok": True,
+                            "approval_required": True,
+                            "approval_id": approval_id,
+                            "status": "pending",
+                        }
+                    elif task_type == "skill_approve":
+                        if not _is_hub_node():
+                            raise RuntimeError("skill_approve is only accepted by hub node")
+                        approval_id = int(payload_obj.get("approval_id", 0) or 0)
+                        approved = bool(payload_obj.get("approved", False))
+                        if approval_id <= 0:
+                            raise RuntimeError("skill_approve requires approval_id")
+                        if not approval_engine.resolve(approval_id, approve=approved):
+                            raise RuntimeError("Unable to resolve approval_id")
+                        response["skill_approve"] = {"ok": True, "approval_id": approval_id, "approved": approved}
+                    elif task_type == "skill_deliver":
+                        source_profile = str(accepted.get("source") or "unknown")
+                        install_result = _install_skill_bundle(payload_obj, source_profile)
+                        response["skill_install_result"] = install_result
+                        if interop_bridge.hub_profile() and source_profile != interop_bridge.hub_profile():
+                            result_payload = {
+                                "kind": "skill_install_result",
+                                "origin_source": source_profile,
+                                **install_result,
+                            }
+                            try:
+                                response["hub_report"] = interop_bridge.send_task(
+                                    interop_bridge.hub_profile() or source_profile,
+                                    "skill_install_result",
+                                    result_payload,
+                                    route_via="auto",
+                                )
+                            except RuntimeError as exc:
+                                response["hub_report_error"] = str(exc)
+                    elif task_type == "skill_install_result":
+                        if interop_bridge is not None:
+                            interop_bridge.record_skill_install_event(
+                                profile_name=str(payload_obj.get("target_profile") or accepted.get("target") or profile_name),
+                                skill_id=str(payload_obj.get("skill_id") or ""),
+                                version=str(payload_obj.get("version") or ""),
+                                status="ok" if bool(payload_obj.get("ok")) else "failed",
+                                details=payload_obj,
+                            )
+                        response["skill_install_recorded"] = True
+                    event_writer.record(
+                        "interop_message_received",
+                        {"source": accepted["source"], "task_type": accepted["task_type"], "nonce": accepted["nonce"]},
+                        decision="allow",
+                    )
+                    self._write_json(response_status, response)
+                except RuntimeError as exc:
+                    event_writer.record(
+                        "interop_message_rejected",
+                        {"error": str(exc)},
+                        decision="deny",
+                    )
+                    self._write_json(400, {"error": str(exc)})
+
+            def _read_json_body(self) -> dict[str, Any] | None:
+                """Return the parsed JSON object body, or write a 4xx and return None."""
+                self._body_consumed = True
+                try:
+                    content_len = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    content_len = -1
+                if content_len < 0:
+                    # Without a usable length the body cannot be skipped, so the connection cannot be reused.
+                    self.close_connection = True
+                    self._write_json(400, {"error": "Invalid Content-Length"})
+                    return None
+                if content_len > MAX_REQUEST_BODY_BYTES:
+                    # The body is left unread, so the connection cannot be reused.
+                    self.close_connection = True
+                    self._write_json(413, {"error": f"Request body exceeds {MAX_REQUEST_BODY_BYTES} bytes"})
+                    return None
+                try:
+                    data = json_codec.loads(self.rfile.read(content_len)) if content_len else {}
+                except ValueError:
+                    self._write_json(400, {"error": "Invalid JSON body"})
+                    return None
+                if not isinstance(data, dict):
+                    self._write_json(400, {"error": "JSON body must be an object"})
+                    return None
+                return data
+
+            def _discard_body(self) -> None:
+                # Routes that answer without reading the body must still consume it, or its bytes
+                # would be parsed as the start of the next request on this keep-alive connection.
+                if self._body_consumed:
                     return
-                self._write_json(404, {"error": "Not found"})
+                self._body_consumed = True
+                if self.headers.get("Transfer-Encoding"):
+                    self.close_connection = True
+                    return
+                try:
+                    content_len = int(self.headers.get("Content-Length", 0))
+                except ValueError:
+                    content_len = -1
+                if not 0 <= content_len <= MAX_DISCARDED_BODY_BYTES:
+                    self.close_connection = True
+                    return
+                try:
+                    if content_len:
+                        self.rfile.read(content_len)
+                except OSError:
+                    self.close_connection = True
+
+            def log_request(self, code: int | str = "-", size: int | str = "-") -> None:
+                # send_response calls this for every reply; skip building the access-log arguments
+                # that log_message would discard anyway.
+                return
 
             def log_message(self, format: str, *args: Any) -> None:  # noqa: A003
                 # Keep console output quiet; events are tracked in episodic memory.
                 _ = (format, args)
                 return
 
+            def _stream_dashboard(self) -> None:
+                # Each stream pins an HTTP worker, so leave most of the pool for ordinary requests.
+                if not dashboard_stream.subscribe(max_stream_subscribers):
+                    self._write_json(503, {"error": "Too many dashboard streams; poll /dashboard/data"})
+                    return
+                try:
+                    self.close_connection = True
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Cache-Control", "no-store")
+                    self.send_header("Connection", "close")
+                    self.end_headers()
+                    for frame in dashboard_stream.frames(DASHBOARD_STREAM_KEEPALIVE_SECONDS):
+                        # Compact JSON has no raw newlines, so each frame is a single data: line.
+                        self.wfile.write(b": keepalive\n\n" if frame is None else b"data: " + frame + b"\n\n")
+                        self.wfile.flush()
+                except OSError:
+                    pass
+                finally:
+                    dashboard_stream.unsubscribe()
+
             def _write_json(self, status_code: int, payload: dict[str, Any]) -> None:
-                encoded = json.dumps(payload, ensure_ascii=True).encode("utf-8")
-                self.send_response(status_code)
-                self.send_header("Content-Type", "application/json")
-                self.send_header("Content-Length", str(len(encoded)))
-                self.end_headers()
-                self.wfile.write(encoded)
+                self._write_json_bytes(status_code, json_codec.dumps_bytes(payload))
 
-            def _write_html(self, status_code: int, html: str) -> None:
-                encoded = html.encode("utf-8")
+            def _write_json_bytes(self, status_code: int, encoded: bytes, gzipped: bytes | None = None) -> None:
+                self._write_body(status_code, "application/json", encoded, gzipped)
+
+            def _write_static_asset(self, content_type: str, body: bytes, gzipped: bytes, etag: str) -> None:
+                quoted = f'"{etag}"'
+                if quoted in self.headers.get("If-None-Match", ""):
+                    self._discard_body()
+                    self.send_response(304)
+                    self.send_header("ETag", quoted)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self._write_body(
+                    200,
+                    content_type,
+                    body,
+                    gzipped,
+                    extra_headers={"ETag": quoted, "Cache-Control": "public, max-age=3600, immutable"},
+                )
+
+            def _write_body(
+                self,
+                status_code: int,
+                content_type: str,
+                body: bytes,
+                gzipped: bytes | None = None,
+                extra_headers: dict[str, str] | None = None,
+            ) -> None:
+                self._discard_body()
+                # gzipped is a precompressed copy of body, sent when the client accepts it.
+                use_gzip = gzipped is not None and "gzip" in self.headers.get("Accept-Encoding", "")
+                if use_gzip:
+                    body = gzipped
                 self.send_response(status_code)
-                self.send_header("Content-Type", "text/html; charset=utf-8")
-                self.send_header("Content-Length", str(len(encoded)))
+                self.send_header("Content-Type", content_type)
+                if gzipped is not None:
+                    self.send_header("Vary", "Accept-Encoding")
+                if use_gzip:
+                    self.send_header("Content-Encoding", "gzip")
+                for name, value in (extra_headers or {}).items():
+                    self.send_header(name, value)
+                if self.server.saturated:  # type: ignore[attr-defined]
+                    # Every worker is taken; release this one so queued connections get served.
+                    self.close_connection = True
+                if self.close_connection:
+                    self.send_header("Connection", "close")
+                else:
+                    # Tell pooled clients when we drop idle sockets so they stop reusing them first.
+                    self.send_header("Keep-Alive", f"timeout={HTTP_KEEPALIVE_IDLE_SECONDS}")
+                self.send_header("Content-Length", str(len(body)))
                 self.end_headers()
-                self.wfile.write(encoded)
+                self.wfile.write(body)
+
+        # Exact-path GET routes resolve with one dict lookup; prefixed routes are checked after a miss.
+        get_routes: dict[str, Callable[[Handler, dict[str, list[str]]], None]] = {
+            "/health": Handler._get_health,
+            "/status": Handler._get_status,
+            "/approvals": Handler._get_approvals,
+            "/logs": Handler._get_logs,
+            "/api-usage": Handler._get_api_usage,
+            "/backup/status": Handler._get_backup_status,
+            "/fleet/status": Handler._get_fleet_status,
+            "/fleet/deploy/status": Handler._get_fleet_deploy_status,
+            "/interop/messages": Handler._get_interop_messages,
+            "/dashboard": Handler._get_dashboard,
+            "/dashboard/data": Handler._get_dashboard_data,
+            "/dashboard/stream": Handler._get_dashboard_stream,
+        }
+        post_routes: dict[str, Callable[[Handler], None]] = {
+            "/tools/execute": Handler._post_tools_execute,
+            "/fleet/deploy": Handler._post_fleet_deploy,
+            "/interop/inbox": Handler._post_interop_inbox,
+        }
 
         return Handler
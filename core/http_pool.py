@@ -0,0 +1,115 @@
+"""Small keep-alive HTTP/1.1 connection pool for node-to-node requests."""
+
+from __future__ import annotations
+
+import http.client
+import re
+import threading
+import time
+
+_KEEP_ALIVE_TIMEOUT_RE = re.compile(r"timeout=(\d+)")
+# What a reused connection raises when the server had already closed it while idle.
+_STALE_SOCKET_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError)
+
+
+class KeepAlivePool:
+    """Idle HTTP/1.1 connections per (host, port) so repeat probes skip the TCP handshake."""
+
+    def __init__(self, max_idle_per_host: int) -> None:
+        self._max_idle_per_host = max_idle_per_host
+        # Each idle connection carries the monotonic time after which the peer may have closed it.
+        self._idle: dict[tuple[str, int], list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, port: int, path: str, timeout: float, max_bytes: int) -> tuple[int, bytes]:
+        return self.request("GET", host, port, path, timeout, max_bytes)
+
+    def request(
+        self,
+        method: str,
+        host: str,
+        port: int,
+        path: str,
+        timeout: float,
+        max_bytes: int,
+        *,
+        body: bytes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> tuple[int, bytes]:
+        key = (host, port)
+        args = (method, path, body, headers or {}, timeout, max_bytes)
+        conn = self._checkout(key)
+        if conn is not None:
+            try:
+                return self._request(key, conn, *args)
+            except _STALE_SOCKET_ERRORS:
+                # The peer dropped the idle socket before reading it; retry once on a fresh one.
+                # Timeouts and other failures are not retried: the request may have been
+                # delivered (POSTs are not idempotent) and a retry would double the wait.
+                pass
+        return self._request(key, http.client.HTTPConnection(host, port, timeout=timeout), *args)
+
+    def _checkout(self, key: tuple[str, int]) -> http.client.HTTPConnection | None:
+        now = time.monotonic()
+        expired: list[http.client.HTTPConnection] = []
+        conn = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, expires_at = idle.pop()
+                if expires_at > now:
+                    conn = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            stale.close()
+        return conn
+
+    def _request(
+        self,
+        key: tuple[str, int],
+        conn: http.client.HTTPConnection,
+        method: str,
+        path: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timeout: float,
+        max_bytes: int,
+    ) -> tuple[int, bytes]:
+        try:
+            conn.timeout = timeout
+            if conn.sock is not None:
+                conn.sock.settimeout(timeout)
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            body = resp.read(max_bytes + 1)
+        except BaseException:
+            conn.close()
+            raise
+        if len(body) > max_bytes:
+            # The rest of the body is still on the socket, so it cannot be reused.
+            conn.close()
+            raise ValueError(f"response body exceeds {max_bytes} bytes")
+        if resp.will_close:
+            conn.close()
+        else:
+            expires_at = float("inf")
+            match = _KEEP_ALIVE_TIMEOUT_RE.search(resp.getheader("Keep-Alive") or "")
+            if match:
+                # Stop reusing a second early so we never race the server's idle close.
+                expires_at = time.monotonic() + int(match.group(1)) - 1
+            with self._lock:
+                idle = self._idle.setdefault(key, [])
+                if len(idle) < self._max_idle_per_host:
+                    idle.append((conn, expires_at))
+                    conn = None
+            if conn is not None:
+                conn.close()
+        return resp.status, body
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = list(self._idle.values()), {}
+        for idle in pools:
+            for conn, _ in idle:
+                conn.close()
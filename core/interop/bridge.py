@@ -4,20 +4,152 @@ from __future__ import annotations
 
 import hashlib
 import hmac
+import http.client
 import json
-import secrets
+import os
+import platform
 import sqlite3
+import ssl
+import subprocess
+import threading
 import time
-from base64 import b64decode, b64encode
+from base64 import b64decode
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii
 from pathlib import Path
-from typing import Any
-from urllib import error, request
+from typing import Any, Iterator
+from urllib import error
 
 import yaml
 
-from core.skills.package import build_skill_bundle
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+except ImportError:  # Identity (v2) signatures are optional; HMAC signing still applies.
+    serialization = None  # type: ignore[assignment]
+    Ed25519PrivateKey = Ed25519PublicKey = None  # type: ignore[assignment,misc]
+
+from core import json_codec
+from core.http_pool import KeepAlivePool
+from core.llm import forget_secret, read_secret
+from core.memory.engine import write_transaction
+from core.skills.package import bundle_and_encode
 
 MAX_CLOCK_SKEW_SECONDS = 300
+# A nonce only matters while its envelope could still pass the skew check (at most
+# 2 * MAX_CLOCK_SKEW_SECONDS after receipt); keep an hour and prune at most every ten minutes.
+NONCE_RETENTION_SECONDS = 3600
+NONCE_PRUNE_INTERVAL_SECONDS = 600
+SHARED_KEY_FILENAME = "interop_shared_key.txt"
+SIGNATURE_ALG_FILENAME = "interop_signature_alg.txt"
+DEFAULT_SIGNATURE_ALG = "hmac-sha256"
+SIGNATURE_ALGS = frozenset({DEFAULT_SIGNATURE_ALG, "blake2b-256"})
+POST_TIMEOUT_SECONDS = 10
+POST_MAX_RESPONSE_BYTES = 4 << 20
+CHECKIN_SEND_WORKERS = 16
+# Shared encoder for signed bodies; json.dumps would build a new one per call for these options.
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"))
+_CANONICAL_FIELDS = frozenset({"source", "target", "task_type", "payload", "nonce", "timestamp"})
+_INSERT_MESSAGE_SQL = """
+    INSERT INTO interop_messages (direction, source_node, target_node, task_type, payload, nonce, status)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+# Served by idx_interop_messages_outbox_lookup: an equality seek on the first four columns, then
+# the trailing id gives ORDER BY id DESC LIMIT 1 as a single reverse step with no sort.
+_LAST_OUTBOX_SQL = """
+    SELECT CAST(strftime('%s', created_at) AS INTEGER) AS ts
+    FROM interop_messages
+    WHERE direction = 'outbox' AND target_node = ? AND task_type = ? AND status = 'sent'
+    ORDER BY id DESC
+    LIMIT 1
+"""
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+@lru_cache(maxsize=1)
+def signing_hardware_info() -> dict[str, Any]:
+    """Whether the CPU has SHA-256 instructions OpenSSL (and so hashlib/hmac) can use, for diagnostics.
+
+    Without them HMAC-SHA256 runs in plain SIMD code; blake2b-256 (interop_signature_alg) is then the
+    cheaper MAC. sha_extensions is None when the platform cannot be probed.
+    """
+    return {
+        "openssl": ssl.OPENSSL_VERSION,
+        "machine": platform.machine(),
+        "sha_extensions": _detect_sha_extensions(),
+    }
+
+
+def _detect_sha_extensions() -> bool | None:
+    system = platform.system()
+    if system == "Linux":
+        try:
+            cpuinfo = Path("/proc/cpuinfo").read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+        for line in cpuinfo.splitlines():
+            # x86 lists "sha_ni" under flags; arm64 lists "sha2" under Features.
+            name, _, value = line.partition(":")
+            if name.strip() in {"flags", "Features"}:
+                tokens = value.split()
+                return "sha_ni" in tokens or "sha2" in tokens
+        return None
+    if system == "Darwin":
+        sysctl_name = "hw.optional.arm.FEAT_SHA256" if platform.machine() == "arm64" else "machdep.cpu.leaf7_features"
+        try:
+            out = subprocess.run(  # noqa: S603
+                ["sysctl", "-n", sysctl_name], capture_output=True, text=True, timeout=2, check=False
+            ).stdout.strip()
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if not out:
+            return None
+        return out == "1" or "SHA" in out.split()
+    return None
+
+
+def _new_mac(alg: str, key: bytes) -> Any:
+    if alg == "blake2b-256":
+        # Keyed blake2b is a MAC in one pass (no HMAC inner/outer hash) but takes at most
+        # 64 key bytes; longer shared keys are hashed down to 64 first.
+        if len(key) > hashlib.blake2b.MAX_KEY_SIZE:
+            key = hashlib.blake2b(key).digest()
+        return hashlib.blake2b(key=key, digest_size=32)
+    return hmac.new(key, digestmod=hashlib.sha256)
+
+
+class _NonceBuffer:
+    """Hands out random nonces sliced from one larger os.urandom read instead of a syscall per envelope."""
+
+    def __init__(self, size: int = 4096) -> None:
+        self._size = size
+        self._lock = threading.Lock()
+        # Held hex-encoded: one hex() per refill, and each nonce is a plain str slice.
+        self._hex = ""
+        self._pos = 0
+
+    def take_hex(self, nbytes: int = 16) -> str:
+        width = nbytes * 2
+        with self._lock:
+            if self._pos + width > len(self._hex):
+                self._hex = os.urandom(self._size).hex()
+                self._pos = 0
+            start = self._pos
+            self._pos += width
+            return self._hex[start : self._pos]
+
+    def reset(self) -> None:
+        # A forked child must not replay nonces still buffered in the parent.
+        self._lock = threading.Lock()
+        self._hex = ""
+        self._pos = 0
+
+
+_NONCES = _NonceBuffer()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_NONCES.reset)
 
 
 class InteropBridge:
@@ -29,26 +161,71 @@ class InteropBridge:
         secrets_dir: Path,
         nodes_file: Path,
         health_port: int = 8600,
+        write_lock: threading.RLock | None = None,
     ) -> None:
         self._conn = conn
+        self._write_lock = write_lock
         self._profile_name = profile_name
         self._secrets_dir = secrets_dir
         self._nodes_file = nodes_file
         self._health_port = health_port
+        # Check-ins and relays reuse one keep-alive connection per peer instead of a new socket per send.
+        self._http = KeepAlivePool(max_idle_per_host=2)
+        self._local = threading.local()
+        self._config_lock = threading.Lock()
+        self._config_cache: tuple[tuple[int, int], dict[str, Any]] | None = None
+        self._targets_cache: tuple[dict[str, Any], dict[str, dict[str, Any]]] | None = None
+        self._mac_bases: dict[str, tuple[str, Any]] = {}
+        self._next_nonce_prune = 0.0
+        self._signing_key_cache: tuple[tuple[int, int], Ed25519PrivateKey | None] | None = None
+        self._verify_keys_cache: tuple[dict[str, Any], dict[str, Ed25519PublicKey | None]] | None = None
+
+    @contextmanager
+    def _tx(self) -> Iterator[None]:
+        """Defer this thread's commits to the end of the outermost block (one fsync per block).
+
+        The outermost block is one write_transaction: it holds the shared writer lock, commits
+        only if the block succeeds and rolls back everything it wrote if the block raises.
+        """
+        depth = getattr(self._local, "tx_depth", 0)
+        self._local.tx_depth = depth + 1
+        try:
+            if depth:
+                yield
+            else:
+                with write_transaction(self._conn, self._write_lock):
+                    yield
+        finally:
+            self._local.tx_depth = depth
 
     def _load_config(self) -> dict[str, Any]:
-        if not self._nodes_file.exists():
+        # Every send and validate consults nodes.yaml; only re-parse when its mtime or size moves.
+        try:
+            stat = self._nodes_file.stat()
+        except FileNotFoundError:
             return {}
-        raw = yaml.safe_load(self._nodes_file.read_text(encoding="utf-8")) or {}
-        return raw if isinstance(raw, dict) else {}
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._config_lock:
+            if self._config_cache is not None and self._config_cache[0] == key:
+                return self._config_cache[1]
+            raw = yaml.load(self._nodes_file.read_bytes(), Loader=_YamlLoader) or {}
+            config = raw if isinstance(raw, dict) else {}
+            self._config_cache = (key, config)
+            return config
 
     def _load_nodes(self) -> dict[str, Any]:
         config = self._load_config()
         return config.get("nodes", {}) if isinstance(config, dict) else {}
 
     def _configured_targets(self) -> dict[str, dict[str, Any]]:
+        # Derived purely from the parsed config, so it is rebuilt only when that object changes.
+        config = self._load_config()
+        cached = self._targets_cache
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        nodes = config.get("nodes", {})
         out: dict[str, dict[str, Any]] = {}
-        for node_id, spec in self._load_nodes().items():
+        for node_id, spec in (nodes if isinstance(nodes, dict) else {}).items():
             if not isinstance(spec, dict):
                 continue
             profile = str(spec.get("profile", node_id)).strip()
@@ -56,6 +233,7 @@ class InteropBridge:
             if not profile or not host or host.endswith(".TBD") or profile == self._profile_name:
                 continue
             out[profile] = {"node_id": str(node_id), "host": host}
+        self._targets_cache = (config, out)
         return out
 
     def _routing_hub_profile(self) -> str | None:
@@ -70,104 +248,165 @@ class InteropBridge:
     def hub_profile(self) -> str | None:
         return self._routing_hub_profile()
 
-    def _shared_key(self) -> bytes:
-        key_path = self._secrets_dir / "interop_shared_key.txt"
-        if not key_path.exists():
-            raise RuntimeError(f"Missing shared interop key: {key_path}")
-        raw = key_path.read_text(encoding="utf-8").strip()
-        if not raw:
+    def _shared_key(self) -> str:
+        # read_secret re-reads only when the file's mtime/size change, so rotation still applies.
+        raw = read_secret(self._secrets_dir, SHARED_KEY_FILENAME)
+        if raw is None:
+            key_path = self._secrets_dir / SHARED_KEY_FILENAME
+            if not key_path.exists():
+                raise RuntimeError(f"Missing shared interop key: {key_path}")
             raise RuntimeError(f"Empty shared interop key: {key_path}")
-        return raw.encode("utf-8")
+        return raw
+
+    def invalidate_key(self) -> None:
+        """Drop cached key material so the next sign/verify re-reads the secrets files.
 
-    def _canonical_payload(self, envelope: dict[str, Any]) -> str:
+        Rotation is normally picked up from the files' mtime/size; this covers rewrites that
+        a coarse filesystem timestamp cannot distinguish.
+        """
+        forget_secret(self._secrets_dir, SHARED_KEY_FILENAME)
+        forget_secret(self._secrets_dir, "interop_identity_mode.txt")
+        forget_secret(self._secrets_dir, SIGNATURE_ALG_FILENAME)
+        self._mac_bases.clear()
+        self._signing_key_cache = None
+
+    def _canonical_bytes(self, envelope: dict[str, Any]) -> bytes:
+        """Signed form of an envelope; build it once and share it between HMAC and Ed25519."""
+        source = envelope["source"]
+        target = envelope["target"]
+        task_type = envelope["task_type"]
+        nonce = envelope["nonce"]
+        timestamp = envelope["timestamp"]
+        # Deliberately stdlib json, not json_codec: every node must produce identical bytes, and
+        # orjson differs from json.dumps on non-ASCII escaping and float formatting.
+        if type(timestamp) is int and all(type(v) is str for v in (source, target, task_type, nonce)):
+            # Same bytes as the sort_keys dump below, with the six top-level keys laid out in sorted order.
+            return "".join(
+                (
+                    '{"nonce":',
+                    encode_basestring_ascii(nonce),
+                    ',"payload":',
+                    _CANONICAL_ENCODER.encode(envelope["payload"]),
+                    ',"source":',
+                    encode_basestring_ascii(source),
+                    ',"target":',
+                    encode_basestring_ascii(target),
+                    ',"task_type":',
+                    encode_basestring_ascii(task_type),
+                    ',"timestamp":',
+                    int.__repr__(timestamp),
+                    "}",
+                )
+            ).encode("utf-8")
         body = {
-            "source": envelope["source"],
-            "target": envelope["target"],
-            "task_type": envelope["task_type"],
+            "source": source,
+            "target": target,
+            "task_type": task_type,
             "payload": envelope["payload"],
-            "nonce": envelope["nonce"],
-            "timestamp": envelope["timestamp"],
+            "nonce": nonce,
+            "timestamp": timestamp,
         }
-        return json.dumps(body, sort_keys=True, separators=(",", ":"))
-
-    def _sign(self, envelope: dict[str, Any]) -> str:
-        msg = self._canonical_payload(envelope).encode("utf-8")
-        digest = hmac.new(self._shared_key(), msg, hashlib.sha256).hexdigest()
-        return digest
+        return _CANONICAL_ENCODER.encode(body).encode("utf-8")
+
+    def _sign(self, msg: bytes, alg: str = DEFAULT_SIGNATURE_ALG) -> str:
+        return self._sign_raw(msg, alg).hex()
+
+    def _sign_raw(self, msg: bytes, alg: str = DEFAULT_SIGNATURE_ALG) -> bytes:
+        # Keyed MAC state (HMAC's ipad/opad blocks, blake2b's key block) is built once per key;
+        # each message copies it. read_secret returns the same str object until the file
+        # changes, so identity is enough here.
+        key = self._shared_key()
+        cached = self._mac_bases.get(alg)
+        if cached is None or cached[0] is not key:
+            cached = self._mac_bases[alg] = (key, _new_mac(alg, key.encode("utf-8")))
+        mac = cached[1].copy()
+        mac.update(msg)
+        return mac.digest()
+
+    def _signature_alg(self) -> str:
+        # Opt-in per node: only switch once every peer verifies blake2b-256.
+        raw = read_secret(self._secrets_dir, SIGNATURE_ALG_FILENAME)
+        return raw if raw in SIGNATURE_ALGS else DEFAULT_SIGNATURE_ALG
 
     def _identity_mode(self) -> str:
-        raw = (self._secrets_dir / "interop_identity_mode.txt").read_text(encoding="utf-8").strip() if (
-            self._secrets_dir / "interop_identity_mode.txt"
-        ).exists() else "compat"
+        raw = read_secret(self._secrets_dir, "interop_identity_mode.txt")
         return raw if raw in {"compat", "provenance", "strict"} else "compat"
 
-    def _identity_private_key_bytes(self) -> bytes | None:
+    def _identity_signing_key(self) -> Ed25519PrivateKey | None:
+        # PEM parsing costs far more than signing; keep the key object until the file changes.
+        if serialization is None:
+            return None
         key_path = self._secrets_dir / "interop_signing_private_key.pem"
-        if not key_path.exists():
+        try:
+            stat = key_path.stat()
+        except FileNotFoundError:
+            self._signing_key_cache = None
             return None
-        raw = key_path.read_bytes()
-        return raw or None
-
-    def _identity_public_key_for_profile(self, profile_name: str) -> str | None:
-        for _, spec in self._load_nodes().items():
+        file_key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._signing_key_cache
+        if cached is not None and cached[0] == file_key:
+            return cached[1]
+        private_pem = key_path.read_bytes()
+        loaded = serialization.load_pem_private_key(private_pem, password=None) if private_pem else None
+        signing_key = loaded if isinstance(loaded, Ed25519PrivateKey) else None
+        self._signing_key_cache = (file_key, signing_key)
+        return signing_key
+
+    def _identity_verify_keys(self) -> dict[str, Ed25519PublicKey | None]:
+        # Public keys are decoded once per nodes.yaml change; None marks a missing or malformed key.
+        config = self._load_config()
+        cached = self._verify_keys_cache
+        if cached is not None and cached[0] is config:
+            return cached[1]
+        nodes = config.get("nodes", {})
+        keys: dict[str, Ed25519PublicKey | None] = {}
+        for _, spec in (nodes if isinstance(nodes, dict) else {}).items():
             if not isinstance(spec, dict):
                 continue
             profile = str(spec.get("profile", "")).strip()
-            if profile == profile_name:
-                value = str(spec.get("signing_public_key", "")).strip()
-                return value or None
-        return None
-
-    def _sign_v2(self, envelope: dict[str, Any]) -> str | None:
-        private_pem = self._identity_private_key_bytes()
-        if private_pem is None:
-            return None
-        try:
-            from cryptography.hazmat.primitives import serialization
-            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-        except ImportError:
-            return None
-        key = serialization.load_pem_private_key(private_pem, password=None)
-        if not isinstance(key, Ed25519PrivateKey):
+            if profile in keys:
+                continue
+            pub_b64 = str(spec.get("signing_public_key", "")).strip()
+            try:
+                keys[profile] = Ed25519PublicKey.from_public_bytes(b64decode(pub_b64)) if pub_b64 else None
+            except Exception:
+                keys[profile] = None
+        self._verify_keys_cache = (config, keys)
+        return keys
+
+    def _sign_v2(self, msg: bytes) -> str | None:
+        key = self._identity_signing_key()
+        if key is None:
             return None
-        sig = key.sign(self._canonical_payload(envelope).encode("utf-8"))
-        return sig.hex()
+        return key.sign(msg).hex()
 
-    def _verify_v2(self, envelope: dict[str, Any]) -> bool:
+    def _verify_v2(self, envelope: dict[str, Any], msg: bytes) -> bool:
         signature_v2 = str(envelope.get("signature_v2", "")).strip()
         signer = str(envelope.get("signer", envelope.get("source", ""))).strip()
         if not signature_v2 or not signer:
             return False
-        pub_b64 = self._identity_public_key_for_profile(signer)
-        if not pub_b64:
+        if Ed25519PublicKey is None:
             return False
-        try:
-            from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
-        except ImportError:
+        pub_key = self._identity_verify_keys().get(signer)
+        if pub_key is None:
             return False
         try:
-            pub_key = Ed25519PublicKey.from_public_bytes(b64decode(pub_b64))
-            pub_key.verify(bytes.fromhex(signature_v2), self._canonical_payload(envelope).encode("utf-8"))
+            pub_key.verify(bytes.fromhex(signature_v2), msg)
             return True
         except Exception:
             return False
 
-    def _is_replay(self, nonce: str) -> bool:
-        row = self._conn.execute(
-            "SELECT nonce FROM interop_nonces WHERE nonce = ?",
-            (nonce,),
-        ).fetchone()
-        return row is not None
-
-    def _record_nonce(self, nonce: str, source: str, target: str) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO interop_nonces (nonce, source_node, target_node)
-            VALUES (?, ?, ?)
-            """,
-            (nonce, source, target),
-        )
-        self._conn.commit()
+    def _claim_nonce(self, nonce: str, source: str, target: str) -> bool:
+        """Record a nonce; False means it was already seen (replay). nonce is the table's primary key."""
+        with self._tx():
+            cursor = self._conn.execute(
+                """
+                INSERT OR IGNORE INTO interop_nonces (nonce, source_node, target_node)
+                VALUES (?, ?, ?)
+                """,
+                (nonce, source, target),
+            )
+        return cursor.rowcount == 1
 
     def _record_message(
         self,
@@ -180,38 +419,31 @@ class InteropBridge:
         nonce: str,
         status: str,
     ) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO interop_messages (direction, source_node, target_node, task_type, payload, nonce, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (direction, source, target, task_type, json.dumps(payload, ensure_ascii=True), nonce, status),
-        )
-        self._conn.commit()
+        row = (direction, source, target, task_type, json_codec.dumps(payload), nonce, status)
+        pending = getattr(self._local, "pending_rows", None)
+        if pending is not None:
+            pending.append(row)
+            return
+        with self._tx():
+            self._conn.execute(_INSERT_MESSAGE_SQL, row)
+
+    def _record_messages(self, rows: list[tuple[str, ...]]) -> None:
+        if rows:
+            with self._tx():
+                self._conn.executemany(_INSERT_MESSAGE_SQL, rows)
 
     def _payload_for_log(self, payload: dict[str, Any], response_payload: dict[str, Any] | None = None) -> dict[str, Any]:
-        out = dict(payload)
-        if isinstance(response_payload, dict):
-            reply = response_payload.get("reply")
-            if isinstance(reply, dict):
-                reply_copy = dict(reply)
-                msg = reply_copy.get("message")
-                if isinstance(msg, str) and len(msg) > 600:
-                    reply_copy["message"] = msg[:597] + "..."
-                out["reply"] = reply_copy
-        return out
+        """Payload as stored in interop_messages; shares structure with its inputs, so treat it as read-only."""
+        reply = response_payload.get("reply") if isinstance(response_payload, dict) else None
+        if not isinstance(reply, dict):
+            return payload
+        msg = reply.get("message")
+        if isinstance(msg, str) and len(msg) > 600:
+            reply = {**reply, "message": msg[:597] + "..."}
+        return {**payload, "reply": reply}
 
     def _last_outbox_timestamp(self, target: str, task_type: str) -> int | None:
-        row = self._conn.execute(
-            """
-            SELECT CAST(strftime('%s', created_at) AS INTEGER) AS ts
-            FROM interop_messages
-            WHERE direction = 'outbox' AND target_node = ? AND task_type = ? AND status = 'sent'
-            ORDER BY id DESC
-            LIMIT 1
-            """,
-            (target, task_type),
-        ).fetchone()
+        row = self._conn.execute(_LAST_OUTBOX_SQL, (target, task_type)).fetchone()
         if row is None:
             return None
         value = row["ts"]
@@ -230,28 +462,59 @@ class InteropBridge:
             "target": target,
             "task_type": task_type,
             "payload": payload,
-            "nonce": secrets.token_hex(16),
+            "nonce": _NONCES.take_hex(),
             "timestamp": int(time.time()),
         }
-        envelope["signature"] = self._sign(envelope)
-        identity_sig = self._sign_v2(envelope)
+        msg = self._canonical_bytes(envelope)
+        alg = self._signature_alg()
+        envelope["signature"] = self._sign(msg, alg)
+        if alg != DEFAULT_SIGNATURE_ALG:
+            envelope["signature_alg"] = alg
+        identity_sig = self._sign_v2(msg)
         if identity_sig:
             envelope["signer"] = envelope["source"]
             envelope["signature_v2"] = identity_sig
             envelope["signature_v2_alg"] = "ed25519"
+        # Kept so _post_envelope can frame the already-serialized body instead of encoding it again.
+        self._local.last_signed = (envelope, msg)
         return envelope
 
+    def _wire_body(self, envelope: dict[str, Any], canonical: bytes) -> bytes:
+        """{"envelope": ...} request body reusing the canonical bytes for the six signed fields."""
+        parts = [b'{"envelope":', canonical[:-1]]
+        for key, value in envelope.items():
+            if key not in _CANONICAL_FIELDS:
+                parts.append(f",{encode_basestring_ascii(key)}:{_CANONICAL_ENCODER.encode(value)}".encode("utf-8"))
+        parts.append(b"}}")
+        return b"".join(parts)
+
     def _post_envelope(self, host: str, envelope: dict[str, Any]) -> dict[str, Any]:
-        body = json.dumps({"envelope": envelope}).encode("utf-8")
-        url = f"http://{host}:{self._health_port}/interop/inbox"
-        req = request.Request(
-            url,
-            method="POST",
-            data=body,
-            headers={"Content-Type": "application/json"},
-        )
-        with request.urlopen(req, timeout=10) as resp:  # noqa: S310
-            return json.loads(resp.read().decode("utf-8"))
+        signed = getattr(self._local, "last_signed", None)
+        if signed is not None and signed[0] is envelope:
+            body = self._wire_body(envelope, signed[1])
+        else:
+            # Envelopes built elsewhere (e.g. relayed ones) have no canonical bytes to reuse.
+            body = json_codec.dumps_bytes({"envelope": envelope})
+        try:
+            status, raw = self._http.request(
+                "POST",
+                host,
+                self._health_port,
+                "/interop/inbox",
+                POST_TIMEOUT_SECONDS,
+                POST_MAX_RESPONSE_BYTES,
+                body=body,
+                headers={"Content-Type": "application/json"},
+            )
+        except (http.client.HTTPException, OSError, ValueError) as exc:
+            raise error.URLError(exc) from exc
+        if status >= 400:
+            # Callers treat any non-2xx like urlopen's HTTPError: a failed send.
+            raise error.URLError(f"HTTP Error {status}")
+        return json_codec.loads(raw)
+
+    def close(self) -> None:
+        self._http.close()
 
     def _send_route_via_hub(
         self,
@@ -310,7 +573,7 @@ class InteropBridge:
                 status="sent",
             )
             return {"sent": True, "target": target_profile, "response": response_payload}
-        except (error.URLError, json.JSONDecodeError) as exc:
+        except (error.URLError, json_codec.JSONDecodeError) as exc:
             if route_via == "auto" and target_profile != (self.hub_profile() or ""):
                 try:
                     return self._send_route_via_hub(
@@ -337,29 +600,62 @@ class InteropBridge:
         Uses existing interop_messages table for scheduling state.
         """
         now = int(time.time())
-        results: list[dict[str, Any]] = []
+        due = [
+            target_profile
+            for target_profile in self._configured_targets().keys()
+            if (last_sent := self._last_outbox_timestamp(target_profile, "skills_checkin")) is None
+            or (now - last_sent) >= interval_seconds
+        ]
+        if not due:
+            return []
+        payload = {
+            "kind": "daily_skills_checkin",
+            "question": "Hey, do you have any cool new skills today?",
+            "requested_at": now,
+            "skills_manifest": self.local_skills_manifest(),
+        }
+        # Each send is a network round trip; fan out so the batch costs the slowest peer, not the sum.
+        # Workers only collect their outbox rows; the calling thread writes them with one commit.
+        pending: list[list[tuple[str, ...]]] = [[] for _ in due]
+        try:
+            with ThreadPoolExecutor(max_workers=min(CHECKIN_SEND_WORKERS, len(due))) as pool:
+                futures = [
+                    pool.submit(self._send_checkin, target_profile, payload, rows)
+                    for target_profile, rows in zip(due, pending)
+                ]
+                return [future.result() for future in futures]
+        finally:
+            # Rows from sends that went out must land even if another send blew up, or those
+            # targets would look due again and be re-sent on the next retry.
+            self._record_messages([row for rows in pending for row in rows])
+
+    def _send_checkin(self, target_profile: str, payload: dict[str, Any], rows: list[tuple[str, ...]]) -> dict[str, Any]:
+        self._local.pending_rows = rows
+        try:
+            result = self.send_task(target_profile, "skills_checkin", payload)
+            return {"target": target_profile, "ok": True, "result": result}
+        except (RuntimeError, error.URLError) as exc:
+            # send_task's hub fallback lets URLError through when the hub is down too.
+            return {"target": target_profile, "ok": False, "error": str(exc)}
+        finally:
+            self._local.pending_rows = None
+
+    def seconds_until_next_checkin(self, *, interval_seconds: int = 86400) -> int:
+        """Seconds until the earliest configured target is due another skills check-in."""
+        now = int(time.time())
+        remaining = interval_seconds
         for target_profile in self._configured_targets().keys():
             last_sent = self._last_outbox_timestamp(target_profile, "skills_checkin")
-            if last_sent is not None and (now - last_sent) < interval_seconds:
-                continue
-            payload = {
-                "kind": "daily_skills_checkin",
-                "question": "Hey, do you have any cool new skills today?",
-                "requested_at": now,
-                "skills_manifest": self.local_skills_manifest(),
-            }
-            try:
-                result = self.send_task(target_profile, "skills_checkin", payload)
-                results.append({"target": target_profile, "ok": True, "result": result})
-            except RuntimeError as exc:
-                results.append({"target": target_profile, "ok": False, "error": str(exc)})
-        return results
+            if last_sent is None:
+                return 0
+            remaining = min(remaining, max(0, last_sent + interval_seconds - now))
+        return remaining
 
     def local_skills_manifest(self) -> list[dict[str, Any]]:
         manifest_path = Path.home() / "agent_skills" / "manifest.yaml"
         if not manifest_path.exists():
             return []
-        raw = yaml.safe_load(manifest_path.read_text(encoding="utf-8")) or {}
+        raw = yaml.load(manifest_path.read_bytes(), Loader=_YamlLoader) or {}
         skills = raw.get("skills", []) if isinstance(raw, dict) else []
         return [dict(item) for item in skills if isinstance(item, dict)]
 
@@ -383,44 +679,81 @@ class InteropBridge:
         if abs(now - ts) > MAX_CLOCK_SKEW_SECONDS:
             raise RuntimeError("Envelope timestamp outside allowed skew window")
 
-        expected_signature = self._sign(envelope)
-        if not hmac.compare_digest(expected_signature, str(envelope["signature"])):
+        alg = str(envelope.get("signature_alg") or DEFAULT_SIGNATURE_ALG)
+        if alg not in SIGNATURE_ALGS:
+            raise RuntimeError(f"Unsupported envelope signature algorithm: {alg}")
+        msg = self._canonical_bytes(envelope)
+        try:
+            provided_signature = bytes.fromhex(str(envelope["signature"]))
+        except ValueError:
+            raise RuntimeError("Envelope signature invalid") from None
+        if not hmac.compare_digest(self._sign_raw(msg, alg), provided_signature):
             raise RuntimeError("Envelope signature invalid")
         identity_mode = self._identity_mode()
-        v2_valid = self._verify_v2(envelope)
+        v2_valid = self._verify_v2(envelope, msg)
         has_v2 = bool(str(envelope.get("signature_v2", "")).strip())
         if identity_mode == "strict" and not v2_valid:
             raise RuntimeError("Envelope identity signature invalid or missing (strict mode)")
         if identity_mode == "provenance" and has_v2 and not v2_valid:
             raise RuntimeError("Envelope identity signature invalid (provenance mode)")
 
+        payload = envelope["payload"]
+        if not isinstance(payload, dict):
+            raise RuntimeError("Envelope payload must be an object")
         nonce = str(envelope["nonce"])
         if verify_replay:
-            if self._is_replay(nonce):
+            if not self._claim_nonce(nonce, str(envelope["source"]), str(envelope["target"])):
                 raise RuntimeError("Replay detected: nonce already seen")
-            self._record_nonce(nonce, str(envelope["source"]), str(envelope["target"]))
         return {
             "source": str(envelope["source"]),
             "target": str(envelope["target"]),
             "task_type": str(envelope["task_type"]),
-            "payload": dict(envelope["payload"]),
+            # Shared with the caller's envelope rather than copied; callers must not mutate it.
+            "payload": payload,
             "nonce": nonce,
             "identity_signature_valid": v2_valid,
         }
 
     def receive_envelope(self, envelope: dict[str, Any]) -> dict[str, Any]:
-        accepted = self._validate_envelope(envelope, expected_target=self._profile_name, verify_replay=True)
-        self._record_message(
-            direction="inbox",
-            source=accepted["source"],
-            target=accepted["target"],
-            task_type=accepted["task_type"],
-            payload=accepted["payload"],
-            nonce=accepted["nonce"],
-            status="received",
-        )
+        """Validate and store an inbound envelope; the returned dict is new and owned by the caller."""
+        with self._tx():
+            accepted = self._validate_envelope(envelope, expected_target=self._profile_name, verify_replay=True)
+            self._record_message(
+                direction="inbox",
+                source=accepted["source"],
+                target=accepted["target"],
+                task_type=accepted["task_type"],
+                payload=accepted["payload"],
+                nonce=accepted["nonce"],
+                status="received",
+            )
+            now = time.monotonic()
+            if now >= self._next_nonce_prune:
+                self._next_nonce_prune = now + NONCE_PRUNE_INTERVAL_SECONDS
+                self.prune_stale_nonces()
         return {"accepted": True, **accepted}
 
+    def prune_stale_nonces(self, older_than_seconds: int = NONCE_RETENTION_SECONDS) -> int:
+        """Delete replay-protection nonces too old to matter; returns the number removed."""
+        with self._tx():
+            cursor = self._conn.execute(
+                "DELETE FROM interop_nonces WHERE created_at < datetime('now', ?)",
+                (f"-{int(older_than_seconds)} seconds",),
+            )
+        return cursor.rowcount
+
+    def receive_envelopes(self, envelopes: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Receive a burst of envelopes; each result is the accepted dict or {"accepted": False, "error": ...}."""
+        results: list[dict[str, Any]] = []
+        with self._tx():
+            for envelope in envelopes:
+                try:
+                    results.append(self.receive_envelope(envelope))
+                except RuntimeError as exc:
+                    # One bad envelope must not drop the rest of the burst.
+                    results.append({"accepted": False, "error": str(exc)})
+        return results
+
     def forward_relay_envelope(self, *, relayer_source: str, inner_envelope: dict[str, Any]) -> dict[str, Any]:
         if not isinstance(inner_envelope, dict):
             raise RuntimeError("Relay payload missing inner envelope")
@@ -466,14 +799,14 @@ class InteropBridge:
         status: str,
         details: dict[str, Any],
     ) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO skill_install_events (profile_name, skill_id, version, status, details_json)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (profile_name, skill_id, version, status, json.dumps(details, ensure_ascii=True)),
-        )
-        self._conn.commit()
+        with self._tx():
+            self._conn.execute(
+                """
+                INSERT INTO skill_install_events (profile_name, skill_id, version, status, details_json)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (profile_name, skill_id, version, status, json_codec.dumps(details)),
+            )
 
     def record_skill_registry(
         self,
@@ -485,21 +818,21 @@ class InteropBridge:
         manifest: dict[str, Any],
         installed_from: str | None,
     ) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO skill_registry (profile_name, skill_id, version, checksum, manifest_json, installed_from)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                profile_name,
-                skill_id,
-                version,
-                checksum,
-                json.dumps(manifest, ensure_ascii=True),
-                installed_from,
-            ),
-        )
-        self._conn.commit()
+        with self._tx():
+            self._conn.execute(
+                """
+                INSERT INTO skill_registry (profile_name, skill_id, version, checksum, manifest_json, installed_from)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    profile_name,
+                    skill_id,
+                    version,
+                    checksum,
+                    json_codec.dumps(manifest),
+                    installed_from,
+                ),
+            )
 
     def request_skill_transfer(
         self,
@@ -539,8 +872,7 @@ class InteropBridge:
     ) -> dict[str, Any]:
         bundle_dir = self._secrets_dir.parent / "skill_packages"
         bundle_path = bundle_dir / f"{skill_id}-{version}.tar.gz"
-        checksum = build_skill_bundle(skill_root=skill_root, output_bundle=bundle_path)
-        bundle_b64 = b64encode(bundle_path.read_bytes()).decode("utf-8")
+        checksum, bundle_b64 = bundle_and_encode(skill_root=skill_root, output_bundle=bundle_path)
         payload = {
             "skill_id": skill_id,
             "name": name,
@@ -569,6 +901,6 @@ class InteropBridge:
         out: list[dict[str, Any]] = []
         for row in rows:
             item = dict(row)
-            item["payload"] = json.loads(item["payload"])
+            item["payload"] = json_codec.loads(item["payload"])
             out.append(item)
         return out
@@ -5,6 +5,13 @@ from __future__ import annotations
 from base64 import b64encode
 from pathlib import Path
 
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+except ImportError:  # Without cryptography the node runs HMAC-only.
+    serialization = None  # type: ignore[assignment]
+    Ed25519PrivateKey = None  # type: ignore[assignment,misc]
+
 
 def ensure_identity_keys(secrets_dir: Path) -> dict[str, str] | None:
     private_path = secrets_dir / "interop_signing_private_key.pem"
@@ -16,10 +23,7 @@ def ensure_identity_keys(secrets_dir: Path) -> dict[str, str] | None:
             "public_key_path": str(public_path),
             "public_key_b64_path": str(public_b64_path),
         }
-    try:
-        from cryptography.hazmat.primitives import serialization
-        from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
-    except ImportError:
+    if Ed25519PrivateKey is None:
         return None
     private_key = Ed25519PrivateKey.generate()
     public_key = private_key.public_key()
@@ -11,6 +11,8 @@ DEFAULT_MODEL = "gpt-4o-mini"
 OPENAI_BASE = "https://api.openai.com/v1"
 MAX_CONTENT_LEN = 4096
 
+_secret_cache: dict[Path, tuple[tuple[int, int], str | None]] = {}
+
 
 def _parse_usage(data: dict[str, Any]) -> dict[str, Any]:
     usage = (data.get("usage") or {})
@@ -24,10 +26,25 @@ def _parse_usage(data: dict[str, Any]) -> dict[str, Any]:
 def read_secret(secrets_dir: Path, filename: str) -> str | None:
     """Read first line of a secret file; return None if missing or empty."""
     path = secrets_dir / filename
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        _secret_cache.pop(path, None)
         return None
+    # Secrets change at deploy cadence; a stat() is enough to tell whether to re-read.
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _secret_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
     raw = path.read_text(encoding="utf-8").strip()
-    return raw if raw else None
+    value = raw if raw else None
+    _secret_cache[path] = (key, value)
+    return value
+
+
+def forget_secret(secrets_dir: Path, filename: str) -> None:
+    """Drop a cached secret so the next read_secret re-reads the file."""
+    _secret_cache.pop(secrets_dir / filename, None)
 
 
 def complete(
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+from array import array
 from urllib import error, request
 
 from core.llm import OPENAI_BASE
 
 DEFAULT_EMBED_MODEL = "text-embedding-3-small"
+# OpenAI accepts at most 2048 inputs per embeddings request.
+EMBED_BATCH_LIMIT = 2048
 
 
 class EmbeddingService:
@@ -24,9 +26,28 @@ class EmbeddingService:
     def embed(self, text: str) -> list[float]:
         if not text.strip():
             return []
+        return [float(v) for v in self._request_embeddings(text)[0]]
+
+    def embed_many(self, texts: list[str]) -> list[array]:
+        """Embed texts with one API call per EMBED_BATCH_LIMIT inputs, as float32 arrays in input order.
+
+        Blank texts are not sent and map to an empty array.
+        """
+        out: list[array] = [array("f") for _ in texts]
+        positions = [i for i, text in enumerate(texts) if text.strip()]
+        for start in range(0, len(positions), EMBED_BATCH_LIMIT):
+            batch = positions[start : start + EMBED_BATCH_LIMIT]
+            vectors = self._request_embeddings([texts[i] for i in batch])
+            if len(vectors) != len(batch):
+                raise RuntimeError(f"Embeddings API returned {len(vectors)} vectors for {len(batch)} inputs")
+            for i, vector in zip(batch, vectors):
+                out[i] = array("f", vector)
+        return out
+
+    def _request_embeddings(self, texts: str | list[str]) -> list[list[float]]:
         payload = {
             "model": self._model,
-            "input": text,
+            "input": texts,
         }
         encoded = json.dumps(payload, ensure_ascii=True).encode("utf-8")
         headers = {
@@ -49,10 +70,15 @@ class EmbeddingService:
         rows = data.get("data") or []
         if not rows:
             raise RuntimeError(f"Embeddings API returned no vectors: {data}")
-        vector = rows[0].get("embedding")
-        if not isinstance(vector, list):
-            raise RuntimeError(f"Embeddings API returned invalid vector: {data}")
-        return [float(v) for v in vector]
+        # Vectors carry their input position; the API does not promise response order.
+        rows = sorted(rows, key=lambda row: int(row.get("index", 0)))
+        vectors: list[list[float]] = []
+        for row in rows:
+            vector = row.get("embedding")
+            if not isinstance(vector, list):
+                raise RuntimeError(f"Embeddings API returned invalid vector: {data}")
+            vectors.append(vector)
+        return vectors
 
 
 def chunk_text(text: str, *, chunk_size: int = 800, overlap: int = 120) -> list[str]:
@@ -61,10 +87,5 @@ def chunk_text(text: str, *, chunk_size: int = 800, overlap: int = 120) -> list[
         return []
     if len(raw) <= chunk_size:
         return [raw]
-    out: list[str] = []
-    start = 0
     step = max(1, chunk_size - overlap)
-    while start < len(raw):
-        out.append(raw[start : start + chunk_size])
-        start += step
-    return out
+    return [raw[start : start + chunk_size] for start in range(0, len(raw), step)]
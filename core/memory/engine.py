@@ -3,8 +3,33 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from pathlib import Path
 
+# Every store shares the writer connection, so keep room for all of their prepared statements;
+# sqlite3 looks statements up by SQL text and only re-prepares on a cache miss.
+STATEMENT_CACHE_SIZE = 256
+# Negative cache_size is in KiB: 64 MiB of page cache for the writer, which touches every table.
+WRITER_CACHE_SIZE_KIB = 65536
+MMAP_SIZE_BYTES = 256 << 20
+# After each checkpoint SQLite truncates the -wal file back to this size instead of keeping its peak.
+WAL_SIZE_LIMIT_BYTES = 64 << 20
+
+
+@contextmanager
+def write_transaction(
+    conn: sqlite3.Connection, lock: AbstractContextManager[object] | None = None
+) -> Iterator[sqlite3.Connection]:
+    """Run one write transaction on conn: commit on success, roll back on error.
+
+    Stores on MemoryEngine's shared writer connection pass its write_lock, so no other thread can
+    commit or roll back their statements halfway through. Private connections need no lock.
+    """
+    with lock if lock is not None else nullcontext(), conn:
+        yield conn
+
 
 class MemoryEngine:
     """Owns the SQLite connection and table lifecycle."""
@@ -12,18 +37,65 @@ class MemoryEngine:
     def __init__(self, db_path: Path) -> None:
         self._db_path = db_path
         self._conn: sqlite3.Connection | None = None
+        self._readers: dict[threading.Thread, sqlite3.Connection] = {}
+        self._readers_lock = threading.Lock()
+        self._write_lock = threading.RLock()
 
     @property
     def db_path(self) -> Path:
         return self._db_path
 
+    @property
+    def write_lock(self) -> threading.RLock:
+        """Lock for multi-statement transactions on the shared writer connection.
+
+        sqlite3 keeps one transaction per connection, so a commit or rollback from one thread
+        would otherwise also end statements another thread has not finished.
+        """
+        return self._write_lock
+
+    def transaction(self) -> AbstractContextManager[sqlite3.Connection]:
+        """write_transaction() on the shared writer connection, holding write_lock."""
+        return write_transaction(self.connect(), self._write_lock)
+
     def connect(self) -> sqlite3.Connection:
         if self._conn is None:
             self._db_path.parent.mkdir(parents=True, exist_ok=True)
-            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn = sqlite3.connect(
+                self._db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE
+            )
             self._conn.row_factory = sqlite3.Row
+            # WAL lets readers (health/summary queries) proceed while a write commits.
+            # The database is accompanied by memory.db-wal / memory.db-shm files.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute(f"PRAGMA cache_size=-{WRITER_CACHE_SIZE_KIB}")
+            self._conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+            self._conn.execute(f"PRAGMA journal_size_limit={WAL_SIZE_LIMIT_BYTES}")
         return self._conn
 
+    def reader(self) -> sqlite3.Connection:
+        """Return a read-only connection owned by the calling thread.
+
+        Under WAL, readers see a consistent snapshot without waiting on the
+        shared writer connection returned by connect().
+        """
+        thread = threading.current_thread()
+        with self._readers_lock:
+            conn = self._readers.get(thread)
+            if conn is not None:
+                return conn
+            for stale in [t for t in self._readers if not t.is_alive()]:
+                self._readers.pop(stale).close()
+            conn = sqlite3.connect(self._db_path, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=1")
+            # Readers share the OS page mapping rather than each filling a private page cache.
+            conn.execute(f"PRAGMA mmap_size={MMAP_SIZE_BYTES}")
+            self._readers[thread] = conn
+            return conn
+
     def initialize(self) -> None:
         conn = self.connect()
         conn.executescript(
@@ -95,6 +167,9 @@ class MemoryEngine:
             CREATE INDEX IF NOT EXISTS idx_api_usage_profile_created
             ON api_usage(profile_name, created_at DESC);
 
+            CREATE INDEX IF NOT EXISTS idx_api_usage_created
+            ON api_usage(created_at);
+
             CREATE TABLE IF NOT EXISTS approval_queue (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 profile_name TEXT NOT NULL,
@@ -106,6 +181,9 @@ class MemoryEngine:
                 reviewed_at TEXT
             );
 
+            CREATE INDEX IF NOT EXISTS idx_approval_queue_status_id
+            ON approval_queue(status, id);
+
             CREATE TABLE IF NOT EXISTS interop_nonces (
                 nonce TEXT PRIMARY KEY,
                 source_node TEXT NOT NULL,
@@ -113,6 +191,9 @@ class MemoryEngine:
                 created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
             );
 
+            CREATE INDEX IF NOT EXISTS idx_interop_nonces_created
+            ON interop_nonces(created_at);
+
             CREATE TABLE IF NOT EXISTS interop_messages (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 direction TEXT NOT NULL,
@@ -125,6 +206,9 @@ class MemoryEngine:
                 created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
             );
 
+            CREATE INDEX IF NOT EXISTS idx_interop_messages_outbox_lookup
+            ON interop_messages(target_node, task_type, direction, status, id);
+
             CREATE TABLE IF NOT EXISTS skill_registry (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 profile_name TEXT NOT NULL,
@@ -153,11 +237,12 @@ class MemoryEngine:
             ON skill_install_events(profile_name, created_at DESC);
             """
         )
-        # Lightweight migrations for approval execution lifecycle.
+        # Lightweight migrations for approval execution lifecycle and binary embeddings.
         for stmt in (
             "ALTER TABLE approval_queue ADD COLUMN execution_status TEXT NOT NULL DEFAULT 'not_executed'",
             "ALTER TABLE approval_queue ADD COLUMN executed_at TEXT",
             "ALTER TABLE approval_queue ADD COLUMN execution_result TEXT",
+            "ALTER TABLE message_embeddings ADD COLUMN embedding_blob BLOB",
         ):
             try:
                 conn.execute(stmt)
@@ -167,6 +252,10 @@ class MemoryEngine:
         conn.commit()
 
     def close(self) -> None:
+        with self._readers_lock:
+            for reader in self._readers.values():
+                reader.close()
+            self._readers.clear()
         if self._conn is not None:
             self._conn.close()
             self._conn = None
@@ -2,14 +2,26 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
 from typing import Any
 
+from core import json_codec
+from core.memory.engine import write_transaction
+
 
 class EpisodicMemoryStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(self, conn: sqlite3.Connection, *, write_lock: threading.RLock | None = None) -> None:
         self._conn = conn
+        self._write_lock = write_lock
+        # Bumped from the writer thread and request handlers alike; a lost bump would pin a stale cache.
+        self._version_lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Bumped on every recorded event."""
+        return self._version
 
     def record(
         self,
@@ -19,16 +31,36 @@ class EpisodicMemoryStore:
         tool_name: str | None = None,
         decision: str | None = None,
     ) -> int:
-        cursor = self._conn.execute(
-            """
-            INSERT INTO episodic_memory (event_type, tool_name, decision, payload)
-            VALUES (?, ?, ?, ?)
-            """,
-            (event_type, tool_name, decision, json.dumps(payload, ensure_ascii=True)),
-        )
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                INSERT INTO episodic_memory (event_type, tool_name, decision, payload)
+                VALUES (?, ?, ?, ?)
+                """,
+                (event_type, tool_name, decision, json_codec.dumps(payload)),
+            )
+        with self._version_lock:
+            self._version += 1
         return int(cursor.lastrowid)
 
+    def record_many(self, events: list[tuple[str, dict[str, Any], str | None, str | None]]) -> None:
+        """Insert (event_type, payload, tool_name, decision) rows with a single commit."""
+        if not events:
+            return
+        with write_transaction(self._conn, self._write_lock):
+            self._conn.executemany(
+                """
+                INSERT INTO episodic_memory (event_type, tool_name, decision, payload)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (event_type, tool_name, decision, json_codec.dumps(payload))
+                    for event_type, payload, tool_name, decision in events
+                ],
+            )
+        with self._version_lock:
+            self._version += len(events)
+
     def latest(self, limit: int = 50) -> list[dict[str, Any]]:
         rows = self._conn.execute(
             """
@@ -43,6 +75,6 @@ class EpisodicMemoryStore:
         events: list[dict[str, Any]] = []
         for row in rows:
             event = dict(row)
-            event["payload"] = json.loads(event["payload"])
+            event["payload"] = json_codec.loads(event["payload"])
             events.append(event)
         return events
@@ -3,25 +3,34 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
+from collections.abc import Iterable
 from typing import Any
 
+from core.memory.engine import write_transaction
+
 
 class ProfileMemoryStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(self, conn: sqlite3.Connection, *, write_lock: threading.RLock | None = None) -> None:
         self._conn = conn
+        self._write_lock = write_lock
 
     def set_fact(self, key: str, value: str) -> None:
-        self._conn.execute(
-            """
-            INSERT INTO profile_memory (key, value, updated_at)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-            ON CONFLICT(key) DO UPDATE SET
-                value=excluded.value,
-                updated_at=CURRENT_TIMESTAMP
-            """,
-            (key, value),
-        )
-        self._conn.commit()
+        self.set_facts([(key, value)])
+
+    def set_facts(self, pairs: Iterable[tuple[str, str]]) -> None:
+        """Upsert (key, value) facts with a single commit."""
+        with write_transaction(self._conn, self._write_lock):
+            self._conn.executemany(
+                """
+                INSERT INTO profile_memory (key, value, updated_at)
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(key) DO UPDATE SET
+                    value=excluded.value,
+                    updated_at=CURRENT_TIMESTAMP
+                """,
+                pairs,
+            )
 
     def get_fact(self, key: str) -> str | None:
         row = self._conn.execute(
@@ -31,8 +40,8 @@ class ProfileMemoryStore:
         return None if row is None else str(row["value"])
 
     def delete_fact(self, key: str) -> bool:
-        cursor = self._conn.execute("DELETE FROM profile_memory WHERE key = ?", (key,))
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute("DELETE FROM profile_memory WHERE key = ?", (key,))
         return cursor.rowcount > 0
 
     def list_facts(self) -> list[dict[str, Any]]:
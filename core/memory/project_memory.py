@@ -3,22 +3,26 @@
 from __future__ import annotations
 
 import sqlite3
+import threading
 from typing import Any
 
+from core.memory.engine import write_transaction
+
 
 class ProjectMemoryStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(self, conn: sqlite3.Connection, *, write_lock: threading.RLock | None = None) -> None:
         self._conn = conn
+        self._write_lock = write_lock
 
     def create(self, title: str, body: str, status: str = "active") -> int:
-        cursor = self._conn.execute(
-            """
-            INSERT INTO project_memory (title, body, status)
-            VALUES (?, ?, ?)
-            """,
-            (title, body, status),
-        )
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                INSERT INTO project_memory (title, body, status)
+                VALUES (?, ?, ?)
+                """,
+                (title, body, status),
+            )
         return int(cursor.lastrowid)
 
     def update(
@@ -49,13 +53,13 @@ class ProjectMemoryStore:
             SET {", ".join(fields)}, updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
         """
-        cursor = self._conn.execute(query, values)
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(query, values)
         return cursor.rowcount > 0
 
     def delete(self, project_id: int) -> bool:
-        cursor = self._conn.execute("DELETE FROM project_memory WHERE id = ?", (project_id,))
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute("DELETE FROM project_memory WHERE id = ?", (project_id,))
         return cursor.rowcount > 0
 
     def list_all(self) -> list[dict[str, Any]]:
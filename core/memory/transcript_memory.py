@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-import json
 import sqlite3
+import threading
 from typing import Any
 
+from core import json_codec
+from core.memory.engine import write_transaction
+
 
 class TranscriptMemoryStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(self, conn: sqlite3.Connection, *, write_lock: threading.RLock | None = None) -> None:
         self._conn = conn
+        self._write_lock = write_lock
 
     def record(
         self,
@@ -22,21 +26,21 @@ class TranscriptMemoryStore:
         metadata: dict[str, Any] | None = None,
     ) -> int:
         payload = metadata or {}
-        cursor = self._conn.execute(
-            """
-            INSERT INTO telegram_messages (chat_id, direction, message_type, source, text, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                chat_id,
-                direction,
-                message_type,
-                source,
-                text,
-                json.dumps(payload, ensure_ascii=True),
-            ),
-        )
-        self._conn.commit()
+        with write_transaction(self._conn, self._write_lock):
+            cursor = self._conn.execute(
+                """
+                INSERT INTO telegram_messages (chat_id, direction, message_type, source, text, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    chat_id,
+                    direction,
+                    message_type,
+                    source,
+                    text,
+                    json_codec.dumps(payload),
+                ),
+            )
         return int(cursor.lastrowid)
 
     def latest(self, *, limit: int = 100, chat_id: int | None = None) -> list[dict[str, Any]]:
@@ -64,6 +68,6 @@ class TranscriptMemoryStore:
         out: list[dict[str, Any]] = []
         for row in rows:
             item = dict(row)
-            item["metadata"] = json.loads(item["metadata"])
+            item["metadata"] = json_codec.loads(item["metadata"])
             out.append(item)
         return out
@@ -5,10 +5,32 @@ from __future__ import annotations
 import json
 import math
 import sqlite3
+import threading
+import sys
+from array import array
+from collections.abc import Sequence
 from typing import Any
 
+from core.memory.engine import write_transaction
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
+
+def _pack_embedding(embedding: Sequence[float]) -> bytes:
+    """float32, little-endian: 4 bytes per dimension instead of ~20 characters of JSON."""
+    packed = array("f", embedding)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_embedding(blob: bytes) -> array:
+    unpacked = array("f")
+    unpacked.frombytes(blob)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked
+
+
+def _cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
     if not a or not b or len(a) != len(b):
         return 0.0
     dot = sum(x * y for x, y in zip(a, b))
@@ -20,8 +42,9 @@ def _cosine_similarity(a: list[float], b: list[float]) -> float:
 
 
 class VectorMemoryStore:
-    def __init__(self, conn: sqlite3.Connection) -> None:
+    def __init__(self, conn: sqlite3.Connection, *, write_lock: threading.RLock | None = None) -> None:
         self._conn = conn
+        self._write_lock = write_lock
 
     def replace_chunks(
         self,
@@ -29,36 +52,32 @@ class VectorMemoryStore:
         source_kind: str,
         source_id: int,
         source_ref: str | None,
-        chunks: list[tuple[int, str, list[float]]],
+        chunks: list[tuple[int, str, Sequence[float]]],
         embedding_model: str,
     ) -> None:
-        self._conn.execute(
-            "DELETE FROM message_embeddings WHERE source_kind = ? AND source_id = ?",
-            (source_kind, source_id),
-        )
-        for chunk_index, text_chunk, embedding in chunks:
+        with write_transaction(self._conn, self._write_lock):
             self._conn.execute(
+                "DELETE FROM message_embeddings WHERE source_kind = ? AND source_id = ?",
+                (source_kind, source_id),
+            )
+            # embedding_json is NOT NULL in existing databases; new rows leave it empty and keep the
+            # vector in embedding_blob. Rows written before the blob column still carry JSON.
+            self._conn.executemany(
                 """
                 INSERT INTO message_embeddings
-                (source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_model)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                (source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_blob, embedding_model)
+                VALUES (?, ?, ?, ?, ?, '', ?, ?)
                 """,
-                (
-                    source_kind,
-                    source_id,
-                    source_ref,
-                    chunk_index,
-                    text_chunk,
-                    json.dumps(embedding, ensure_ascii=True),
-                    embedding_model,
-                ),
+                [
+                    (source_kind, source_id, source_ref, chunk_index, text_chunk, _pack_embedding(embedding), embedding_model)
+                    for chunk_index, text_chunk, embedding in chunks
+                ],
             )
-        self._conn.commit()
 
     def search(
         self,
         *,
-        query_embedding: list[float],
+        query_embedding: Sequence[float],
         source_kinds: list[str] | None = None,
         limit: int = 10,
     ) -> list[dict[str, Any]]:
@@ -67,7 +86,7 @@ class VectorMemoryStore:
             placeholders = ", ".join(["?"] * len(source_kinds))
             rows = self._conn.execute(
                 f"""
-                SELECT id, source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_model, created_at
+                SELECT id, source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_blob, embedding_model, created_at
                 FROM message_embeddings
                 WHERE source_kind IN ({placeholders})
                 ORDER BY id DESC
@@ -78,7 +97,7 @@ class VectorMemoryStore:
         else:
             rows = self._conn.execute(
                 """
-                SELECT id, source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_model, created_at
+                SELECT id, source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_blob, embedding_model, created_at
                 FROM message_embeddings
                 ORDER BY id DESC
                 LIMIT 2000
@@ -88,10 +107,18 @@ class VectorMemoryStore:
         scored: list[dict[str, Any]] = []
         for row in rows:
             item = dict(row)
-            try:
-                emb = [float(v) for v in json.loads(item["embedding_json"])]
-            except (TypeError, ValueError, json.JSONDecodeError):
-                continue
+            blob = item.pop("embedding_blob", None)
+            emb: Sequence[float]
+            if blob is not None:
+                if len(blob) % 4:
+                    # Not whole float32 values; skip it like unparseable JSON rather than fail the search.
+                    continue
+                emb = _unpack_embedding(blob)
+            else:
+                try:
+                    emb = [float(v) for v in json.loads(item["embedding_json"])]
+                except (TypeError, ValueError, json.JSONDecodeError):
+                    continue
             score = _cosine_similarity(query_embedding, emb)
             item.pop("embedding_json", None)
             item["score"] = score
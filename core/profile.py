@@ -31,6 +31,7 @@ class Profile:
     public_readonly_mode: bool
     public_readonly_get_endpoints: list[str]
     interop_identity_mode: str
+    interop_signature_alg: str
     paths: ProfilePaths
 
 
@@ -97,6 +98,7 @@ def load_profile(profile_name: str, repo_root: Path | None = None) -> Profile:
             )
         ),
         interop_identity_mode=str(raw.get("interop_identity_mode", "compat")).strip() or "compat",
+        interop_signature_alg=str(raw.get("interop_signature_alg", "hmac-sha256")).strip() or "hmac-sha256",
         paths=paths,
     )
 
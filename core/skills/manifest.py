@@ -8,6 +8,8 @@ from typing import Any
 
 import yaml
 
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 _REQUIRED_FIELDS = {
     "skill_id",
     "name",
@@ -23,6 +25,7 @@ _REQUIRED_FIELDS = {
 class SkillManifestManager:
     def __init__(self, manifest_path: Path) -> None:
         self._manifest_path = manifest_path
+        self._cache: tuple[tuple[int, int], list[dict[str, Any]]] | None = None
         self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
         if not self._manifest_path.exists():
             self._manifest_path.write_text("skills: []\n", encoding="utf-8")
@@ -32,17 +35,21 @@ class SkillManifestManager:
         return self._manifest_path
 
     def load(self) -> list[dict[str, Any]]:
-        raw = yaml.safe_load(self._manifest_path.read_text(encoding="utf-8")) or {}
-        skills = raw.get("skills", []) if isinstance(raw, dict) else []
-        out: list[dict[str, Any]] = []
-        for item in skills:
-            if isinstance(item, dict):
-                out.append(dict(item))
-        return out
+        # Every inbound skills check-in diffs against the manifest; re-parse only when the file changes.
+        stat = self._manifest_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache
+        if cached is None or cached[0] != key:
+            raw = yaml.load(self._manifest_path.read_bytes(), Loader=_YamlLoader) or {}
+            skills = raw.get("skills", []) if isinstance(raw, dict) else []
+            cached = self._cache = (key, [item for item in skills if isinstance(item, dict)])
+        # Callers edit the returned entries (upsert), so hand out copies of the cached ones.
+        return [dict(item) for item in cached[1]]
 
     def save(self, skills: list[dict[str, Any]]) -> None:
         payload = {"skills": skills}
         self._manifest_path.write_text(yaml.safe_dump(payload, sort_keys=False), encoding="utf-8")
+        self._cache = None
 
     def list_ids(self) -> set[str]:
         return {str(item.get("skill_id", "")).strip() for item in self.load() if str(item.get("skill_id", "")).strip()}
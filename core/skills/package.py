@@ -2,19 +2,54 @@
 
 from __future__ import annotations
 
+import binascii
+import hashlib
 import tarfile
+from base64 import b64decode, b64encode
 from pathlib import Path
 
 from core.skills.manifest import sha256_file
 
+# Multiples of 3 raw bytes / 4 base64 chars, so chunks encode and decode without padding in between.
+_B64_RAW_CHUNK = 57 * 1024
+_B64_TEXT_CHUNK = _B64_RAW_CHUNK // 3 * 4
+
 
 def build_skill_bundle(*, skill_root: Path, output_bundle: Path) -> str:
+    _write_skill_tar(skill_root, output_bundle)
+    return sha256_file(output_bundle)
+
+
+def bundle_and_encode(*, skill_root: Path, output_bundle: Path) -> tuple[str, str]:
+    """Build the bundle and return (sha256 checksum, base64 text) from a single read of the tarball."""
+    _write_skill_tar(skill_root, output_bundle)
+    digest = hashlib.sha256()
+    buf = bytearray()
+    with output_bundle.open("rb") as fh:
+        while chunk := fh.read(_B64_RAW_CHUNK):
+            digest.update(chunk)
+            buf += b64encode(chunk)
+    return digest.hexdigest(), buf.decode("ascii")
+
+
+def _write_skill_tar(skill_root: Path, output_bundle: Path) -> None:
     if not skill_root.exists() or not skill_root.is_dir():
         raise RuntimeError(f"Skill root missing: {skill_root}")
     output_bundle.parent.mkdir(parents=True, exist_ok=True)
     with tarfile.open(output_bundle, "w:gz") as tar:
         tar.add(skill_root, arcname=skill_root.name)
-    return sha256_file(output_bundle)
+
+
+def write_bundle_b64(bundle_b64: str, bundle_path: Path) -> None:
+    """Decode base64 text produced by bundle_and_encode straight into bundle_path."""
+    # Chunks must start on 4-character boundaries, so drop line wrapping a sender may have added.
+    bundle_b64 = "".join(bundle_b64.split())
+    with bundle_path.open("wb") as fh:
+        for start in range(0, len(bundle_b64), _B64_TEXT_CHUNK):
+            try:
+                fh.write(b64decode(bundle_b64[start : start + _B64_TEXT_CHUNK]))
+            except binascii.Error as exc:
+                raise RuntimeError(f"Invalid skill bundle encoding: {exc}") from exc
 
 
 def extract_skill_bundle(*, bundle_path: Path, target_dir: Path) -> Path:
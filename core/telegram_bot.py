@@ -165,19 +165,16 @@ class TelegramBot:
         chunks = chunk_text(text)
         if not chunks:
             return
-        out: list[tuple[int, str, list[float]]] = []
-        for idx, chunk in enumerate(chunks):
-            try:
-                embedding = self._embedding_service.embed(chunk)
-            except Exception as exc:
-                self._record_in_db(
-                    "telegram_embedding_error",
-                    {"source_kind": source_kind, "source_id": source_id, "error": str(exc)},
-                    decision="deny",
-                )
-                return
-            if embedding:
-                out.append((idx, chunk, embedding))
+        try:
+            embeddings = self._embedding_service.embed_many(chunks)
+        except Exception as exc:
+            self._record_in_db(
+                "telegram_embedding_error",
+                {"source_kind": source_kind, "source_id": source_id, "error": str(exc)},
+                decision="deny",
+            )
+            return
+        out = [(idx, chunk, embedding) for idx, (chunk, embedding) in enumerate(zip(chunks, embeddings)) if embedding]
         if not out:
             return
         vectors = VectorMemoryStore(conn)
@@ -2,7 +2,8 @@
 
 from __future__ import annotations
 
-from typing import Any
+import threading
+from typing import Any, Callable
 
 from core.approval.engine import ApprovalEngine
 from core.memory.episodic_memory import EpisodicMemoryStore
@@ -23,18 +24,50 @@ class ToolRegistry:
         self._episodic = episodic_memory
         self._profile_name = profile_name
         self._tools: dict[str, BaseTool] = {}
+        self._factories: dict[str, Callable[[], BaseTool]] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """Bumped whenever the set of registered tool names changes."""
+        return self._version
 
     def register(self, tool: BaseTool) -> None:
-        self._tools[tool.name] = tool
+        with self._lock:
+            self._factories.pop(tool.name, None)
+            self._tools[tool.name] = tool
+            self._version += 1
+
+    def register_lazy(self, name: str, factory: Callable[[], BaseTool]) -> None:
+        """Register a tool that is only constructed the first time it is executed."""
+        with self._lock:
+            self._tools.pop(name, None)
+            self._factories[name] = factory
+            self._version += 1
+
+    def _get(self, tool_name: str) -> BaseTool | None:
+        tool = self._tools.get(tool_name)
+        if tool is not None:
+            return tool
+        with self._lock:
+            factory = self._factories.get(tool_name)
+            if factory is None:
+                return self._tools.get(tool_name)
+            # Build before unregistering the factory so a failed construction can be retried.
+            tool = factory()
+            self._tools[tool_name] = tool
+            del self._factories[tool_name]
+            return tool
 
     def count(self) -> int:
-        return len(self._tools)
+        return len(self._tools) + len(self._factories)
 
     def list_tools(self) -> list[str]:
-        return sorted(self._tools.keys())
+        return sorted([*self._tools, *self._factories])
 
     def execute(self, tool_name: str, payload: dict[str, Any]) -> ToolExecutionResult:
-        tool = self._tools.get(tool_name)
+        tool = self._get(tool_name)
         if tool is None:
             return ToolExecutionResult(ok=False, output={"error": f"Unknown tool: {tool_name}"})
 
@@ -100,7 +133,7 @@ class ToolRegistry:
 
         tool_name = str(approval["tool_name"])
         payload = dict(approval["payload"])
-        tool = self._tools.get(tool_name)
+        tool = self._get(tool_name)
         if tool is None:
             return ToolExecutionResult(ok=False, output={"error": f"Unknown tool: {tool_name}"})
 
@@ -8,6 +8,7 @@ import time
 from pathlib import Path
 from typing import Any
 
+from core.interop.bridge import signing_hardware_info
 from core.policy import ToolTier
 from core.profile import Profile
 from core.tools.base import BaseTool, ToolExecutionResult
@@ -37,5 +38,7 @@ class RuntimeDiagnosticsTool(BaseTool):
                 "cwd": str(Path.cwd()),
                 "timestamp": int(time.time()),
                 "load_avg": list(load_avg) if load_avg else None,
+                "interop_signature_alg": self._profile.interop_signature_alg,
+                "signing_hardware": signing_hardware_info(),
             },
         )
@@ -28,7 +28,18 @@ if [[ ! -f "$DB_FILE" ]]; then
 fi
 
 mkdir -p "$BACKUP_DIR"
-cp "$DB_FILE" "$BACKUP_DIR/memory.db"
+# memory.db runs in WAL mode; use the online backup API so committed pages
+# still in memory.db-wal are included in the snapshot.
+if command -v sqlite3 >/dev/null 2>&1; then
+  sqlite3 "$DB_FILE" ".backup '$BACKUP_DIR/memory.db'"
+else
+  cp "$DB_FILE" "$BACKUP_DIR/memory.db"
+  for suffix in -wal -shm; do
+    if [[ -f "$DB_FILE$suffix" ]]; then
+      cp "$DB_FILE$suffix" "$BACKUP_DIR/memory.db$suffix"
+    fi
+  done
+fi
 chmod 600 "$BACKUP_DIR/memory.db"
 
 find "$BACKUP_ROOT" -mindepth 1 -maxdepth 1 -type d -mtime +"$RETENTION_DAYS" -exec rm -rf {} + >/dev/null 2>&1 || true
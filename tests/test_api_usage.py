@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core.api_usage import ApiUsageStore
+from core.memory.engine import MemoryEngine
+
+
+class ApiUsageStoreTests(unittest.TestCase):
+    def _new_store(self, tempdir: str) -> tuple[ApiUsageStore, sqlite3.Connection]:
+        store, conn, _ = self._new_store_with_engine(tempdir)
+        return store, conn
+
+    def _new_store_with_engine(self, tempdir: str) -> tuple[ApiUsageStore, sqlite3.Connection, MemoryEngine]:
+        memory = MemoryEngine(Path(tempdir) / "memory.db")
+        memory.initialize()
+        conn = memory.connect()
+        # Long interval so only explicit flushes write during the test.
+        store = ApiUsageStore(conn, reader=memory.reader, write_lock=memory.write_lock, flush_interval_seconds=3600)
+        return store, conn, memory
+
+    def test_records_are_buffered_until_flush(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store, conn = self._new_store(tmpdir)
+            store.record("jason", "telegram_llm", "gpt-4o-mini", prompt_tokens=10, completion_tokens=5)
+            store.record("jason", "interop", "gpt-4o-mini", prompt_tokens=3, completion_tokens=2)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0], 0)
+
+            store.flush()
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0], 2)
+            store.close()
+
+    def test_summary_includes_unflushed_records(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store, _ = self._new_store(tmpdir)
+            store.record("jason", "telegram_llm", "gpt-4o-mini", prompt_tokens=10, completion_tokens=5)
+            summary = store.summary()
+            self.assertEqual(summary["total_calls"], 1)
+            self.assertEqual(summary["total_tokens"], 15)
+            store.close()
+
+    def test_summary_breaks_down_by_model_and_caller(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store, _ = self._new_store(tmpdir)
+            store.record("jason", "telegram_llm", "gpt-4o-mini", prompt_tokens=10, completion_tokens=5)
+            store.record("jason", "telegram_llm", "gpt-4o", prompt_tokens=100, completion_tokens=50)
+            store.record("jason", "interop", "gpt-4o-mini", prompt_tokens=1, completion_tokens=1)
+            summary = store.summary(window_days=7)
+            self.assertEqual(summary["total_calls"], 3)
+            self.assertEqual(summary["total_prompt_tokens"], 111)
+            self.assertEqual(
+                summary["by_model"],
+                [
+                    {"model": "gpt-4o", "calls": 1, "total_tokens": 150},
+                    {"model": "gpt-4o-mini", "calls": 2, "total_tokens": 17},
+                ],
+            )
+            self.assertEqual(
+                summary["by_caller"],
+                [
+                    {"caller": "telegram_llm", "calls": 2, "total_tokens": 165},
+                    {"caller": "interop", "calls": 1, "total_tokens": 2},
+                ],
+            )
+            self.assertEqual(len(summary["recent_calls"]), 3)
+            store.close()
+
+    def test_summary_window_is_clamped_before_caching(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store, _ = self._new_store(tmpdir)
+            self.assertEqual(store.summary(window_days=10_000)["window_days"], 365)
+            self.assertEqual(store.summary(window_days=0)["window_days"], 1)
+            store.summary(window_days=400)
+            self.assertEqual(sorted(store._summary_cache._entries), [1, 365])
+            store.close()
+
+    def test_flush_waits_for_another_threads_transaction(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store, conn, memory = self._new_store_with_engine(tmpdir)
+            store.record("jason", "telegram_llm", "gpt-4o-mini", prompt_tokens=10, completion_tokens=5)
+            started = threading.Event()
+            finish = threading.Event()
+
+            def _other_transaction() -> None:
+                try:
+                    with memory.transaction():
+                        conn.execute("INSERT INTO profile_memory (key, value) VALUES ('draft', 'x')")
+                        started.set()
+                        finish.wait(5)
+                        raise RuntimeError("abandon draft")
+                except RuntimeError:
+                    pass
+
+            other = threading.Thread(target=_other_transaction)
+            other.start()
+            started.wait(5)
+            flusher = threading.Thread(target=store.flush)
+            flusher.start()
+            flusher.join(0.1)
+            self.assertTrue(flusher.is_alive())
+            finish.set()
+            other.join(5)
+            flusher.join(5)
+
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM profile_memory WHERE key = 'draft'").fetchone()[0], 0)
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM api_usage").fetchone()[0], 1)
+            store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.approval.engine import ApprovalEngine
+from core.memory.engine import MemoryEngine
+
+
+class ApprovalEngineTests(unittest.TestCase):
+    def test_bulk_enqueue_returns_ids_in_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            memory = MemoryEngine(Path(tmpdir) / "memory.db")
+            memory.initialize()
+            engine = ApprovalEngine(memory.connect())
+            ids = engine.bulk_enqueue(
+                [
+                    ("jason", "request_email", "tier1", {"to": "a"}),
+                    ("jason", "request_email", "tier1", {"to": "b"}),
+                ]
+            )
+            self.assertEqual(len(ids), 2)
+            pending = engine.list_pending()
+            self.assertEqual([item["id"] for item in pending], ids)
+            self.assertEqual([item["payload"]["to"] for item in pending], ["a", "b"])
+
+            self.assertTrue(engine.resolve(ids[0], approve=True))
+            self.assertTrue(engine.mark_executed(ids[0], {"ok": True}))
+            self.assertEqual(engine.get(ids[0])["execution_result"], {"ok": True})
+            self.assertEqual([item["id"] for item in engine.list_pending()], [ids[1]])
+            memory.close()
+
+    def test_version_changes_only_when_pending_set_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            memory = MemoryEngine(Path(tmpdir) / "memory.db")
+            memory.initialize()
+            engine = ApprovalEngine(memory.connect())
+            start = engine.version
+            approval_id = engine.enqueue(profile_name="jason", tool_name="request_email", tier="tier1", payload={})
+            enqueued = engine.version
+            self.assertNotEqual(enqueued, start)
+            engine.list_pending()
+            self.assertEqual(engine.version, enqueued)
+            self.assertTrue(engine.resolve(approval_id, approve=False))
+            resolved = engine.version
+            self.assertNotEqual(resolved, enqueued)
+            self.assertFalse(engine.resolve(approval_id, approve=True))
+            self.assertEqual(engine.version, resolved)
+            memory.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.backup_status import BackupStatusProvider, _read_last_line
+
+
+class BackupStatusTests(unittest.TestCase):
+    def test_read_last_line_spans_multiple_blocks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "backup.log"
+            log.write_text("x" * 10000 + "\n" + "y" * 5000 + "\n", encoding="utf-8")
+            self.assertEqual(_read_last_line(log), b"y" * 5000)
+            log.write_text("only line", encoding="utf-8")
+            self.assertEqual(_read_last_line(log), b"only line")
+            log.write_text("", encoding="utf-8")
+            self.assertIsNone(_read_last_line(log))
+            self.assertIsNone(_read_last_line(Path(tmpdir) / "missing.log"))
+
+    def test_read_last_line_reads_each_block_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log = Path(tmpdir) / "backup.log"
+            # A last line three blocks long must not make earlier steps re-read the bytes after them.
+            log.write_bytes(b"x" * 4095 + b"\n" + b"z" * (3 * 4096) + b"\r\n")
+            reads: list[int] = []
+            real_open = Path.open
+
+            def counting_open(path: Path, *args: object, **kwargs: object) -> object:
+                fh = real_open(path, *args, **kwargs)
+                real_read = fh.read
+                fh.read = lambda n=-1: reads.append(n) or real_read(n)  # type: ignore[method-assign]
+                return fh
+
+            with patch.object(Path, "open", counting_open):
+                self.assertEqual(_read_last_line(log), b"z" * (3 * 4096))
+            self.assertLessEqual(sum(reads), log.stat().st_size)
+
+    def test_summary_reports_error_from_last_line(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            logs_dir = Path(tmpdir) / "logs"
+            logs_dir.mkdir()
+            (logs_dir / "backup_code.log").write_text("started\nbackup FAILED: disk full\n", encoding="utf-8")
+            (logs_dir / "backup_data.log").write_text("error earlier\nbackup ok\r\n", encoding="utf-8")
+            summary = BackupStatusProvider(Path(tmpdir)).summary()
+            self.assertEqual(summary["code_backup"]["status"], "error")
+            self.assertEqual(summary["data_backup"]["status"], "ok")
+            self.assertEqual(summary["data_backup"]["last_line"], "backup ok")
+
+
+if __name__ == "__main__":
+    unittest.main()
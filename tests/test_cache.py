@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+from core.cache import TTLCache
+
+
+class TTLCacheTests(unittest.TestCase):
+    def test_entries_expire_after_ttl(self) -> None:
+        cache = TTLCache(5.0)
+        calls: list[int] = []
+
+        def loader() -> int:
+            calls.append(1)
+            return len(calls)
+
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            self.assertEqual(cache.get_or_set("k", loader), 1)
+            self.assertEqual(cache.get_or_set("k", loader), 1)
+        with patch("core.cache.time.monotonic", return_value=106.0):
+            self.assertEqual(cache.get_or_set("k", loader), 2)
+        cache.clear()
+        with patch("core.cache.time.monotonic", return_value=106.5):
+            self.assertEqual(cache.get_or_set("k", loader), 3)
+
+    def test_full_cache_drops_expired_then_oldest_entries(self) -> None:
+        cache = TTLCache(5.0, max_entries=3)
+        with patch("core.cache.time.monotonic", return_value=100.0):
+            for key in ("a", "b"):
+                cache.get_or_set(key, lambda: key)
+        with patch("core.cache.time.monotonic", return_value=104.0):
+            for key in ("c", "d"):
+                cache.get_or_set(key, lambda: key)
+        # a and b expired by now; inserting e evicts them rather than the live c and d.
+        with patch("core.cache.time.monotonic", return_value=106.0):
+            cache.get_or_set("e", lambda: "e")
+            self.assertEqual(list(cache._entries), ["c", "d", "e"])
+            cache.get_or_set("f", lambda: "f")
+            self.assertEqual(list(cache._entries), ["d", "e", "f"])
+
+
+if __name__ == "__main__":
+    unittest.main()
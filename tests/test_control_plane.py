@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from core.control_plane import ControlPlane
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[tuple[str, int]] = set()
+    body = b'{"status": "ok"}'
+    keep_alive: str | None = None
+    delays: list[float] = []
+    requests = 0
+
+    def do_GET(self) -> None:  # noqa: N802
+        type(self).connections.add(self.client_address)
+        type(self).requests += 1
+        if type(self).delays:
+            time.sleep(type(self).delays.pop(0))
+        body = type(self).body
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if type(self).keep_alive:
+            self.send_header("Keep-Alive", type(self).keep_alive)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return None
+
+
+class ControlPlaneTests(unittest.TestCase):
+    def _new_plane(self, tempdir: str, health_port: int = 8600) -> ControlPlane:
+        root = Path(tempdir)
+        (root / "config").mkdir(parents=True, exist_ok=True)
+        (root / "config" / "nodes.yaml").write_text(
+            "\n".join(
+                [
+                    "nodes:",
+                    "  jason:",
+                    "    host: hub.local",
+                    "    profile: jason",
+                    "  kiera:",
+                    "    host: kiera.local",
+                    "    profile: kiera",
+                    "  pepper:",
+                    "    host: pepper.TBD",
+                    "    profile: pepper",
+                ]
+            )
+            + "\n",
+            encoding="utf-8",
+        )
+        return ControlPlane(root, default_health_port=health_port)
+
+    def test_health_report_preserves_node_order_and_isolates_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._new_plane(tmpdir)
+
+            def fake_get(host: str, port: int, path: str, timeout: float, max_bytes: int) -> tuple[int, bytes]:
+                if host == "kiera.local":
+                    raise OSError("no route")
+                return 200, b'{"status": "ok", "profile": "jason"}'
+
+            with patch.object(plane._http, "get", side_effect=fake_get):
+                report = plane.health_report()
+
+            nodes = report["nodes"]
+            self.assertEqual([n["node_id"] for n in nodes], ["jason", "kiera", "pepper"])
+            self.assertTrue(nodes[0]["reachable"])
+            self.assertEqual(nodes[0]["status"], "ok")
+            self.assertEqual(nodes[1]["status"], "down")
+            self.assertEqual(nodes[2]["status"], "unconfigured")
+
+    def _serve_health(self, body: bytes, keep_alive: str | None = None) -> ThreadingHTTPServer:
+        _HealthHandler.connections = set()
+        _HealthHandler.body = body
+        _HealthHandler.keep_alive = keep_alive
+        _HealthHandler.delays = []
+        _HealthHandler.requests = 0
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _HealthHandler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        return httpd
+
+    def _local_plane(self, tmpdir: str, httpd: ThreadingHTTPServer) -> ControlPlane:
+        plane = self._new_plane(tmpdir, health_port=httpd.server_address[1])
+        (Path(tmpdir) / "config" / "nodes.yaml").write_text("nodes:\n  jason:\n    host: 127.0.0.1\n", encoding="utf-8")
+        self.addCleanup(plane.close)
+        return plane
+
+    def test_health_report_reuses_probe_connections(self) -> None:
+        httpd = self._serve_health(b'{"status": "ok"}')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._local_plane(tmpdir, httpd)
+            for _ in range(3):
+                report = plane.health_report()
+                self.assertEqual(report["nodes"][0]["status"], "ok")
+        self.assertEqual(len(_HealthHandler.connections), 1)
+
+    def test_probe_connections_expire_with_advertised_keep_alive(self) -> None:
+        # timeout=1 minus the one-second safety margin leaves no reuse window.
+        httpd = self._serve_health(b'{"status": "ok"}', keep_alive="timeout=1")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._local_plane(tmpdir, httpd)
+            for _ in range(2):
+                self.assertEqual(plane.health_report()["nodes"][0]["status"], "ok")
+        self.assertEqual(len(_HealthHandler.connections), 2)
+
+    def test_timeout_on_reused_probe_connection_is_not_retried(self) -> None:
+        httpd = self._serve_health(b'{"status": "ok"}')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._local_plane(tmpdir, httpd)
+            self.assertEqual(plane.health_report()["nodes"][0]["status"], "ok")
+            _HealthHandler.delays = [1.5, 1.5]
+            self.assertEqual(plane.health_report(timeout_seconds=1)["nodes"][0]["status"], "down")
+        self.assertEqual(_HealthHandler.requests, 2)
+
+    def test_health_report_rejects_oversized_body(self) -> None:
+        httpd = self._serve_health(b" " * 70000 + b'{"status": "ok"}')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            node = self._local_plane(tmpdir, httpd).health_report()["nodes"][0]
+        self.assertEqual(node["status"], "down")
+        self.assertIn("exceeds", node["error"])
+
+    def test_list_nodes_reparses_only_when_nodes_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._new_plane(tmpdir)
+            nodes_file = Path(tmpdir) / "config" / "nodes.yaml"
+            with patch.object(yaml, "load", wraps=yaml.load) as loader:
+                self.assertEqual(len(plane.list_nodes()), 3)
+                self.assertEqual(len(plane.list_nodes()), 3)
+                self.assertEqual(loader.call_count, 1)
+
+                nodes_file.write_text("nodes:\n  jason:\n    host: hub.local\n", encoding="utf-8")
+                stat = nodes_file.stat()
+                os.utime(nodes_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                self.assertEqual([n["node_id"] for n in plane.list_nodes()], ["jason"])
+                self.assertEqual(loader.call_count, 2)
+
+    def test_deploy_all_keeps_only_output_tail(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._new_plane(tmpdir)
+            script = Path(tmpdir) / "scripts" / "deploy_all.sh"
+            script.parent.mkdir(parents=True, exist_ok=True)
+            script.write_text(
+                "#!/bin/sh\n"
+                "i=0\n"
+                "while [ $i -lt 2000 ]; do echo \"line $i of deploy output\"; i=$((i+1)); done\n"
+                "echo 'warn' >&2\n"
+                "exit 3\n",
+                encoding="utf-8",
+            )
+            script.chmod(0o755)
+            result = plane.deploy_all(timeout_seconds=30)
+            self.assertFalse(result["ok"])
+            self.assertEqual(result["returncode"], 3)
+            self.assertLessEqual(len(result["stdout"]), 12000)
+            self.assertTrue(result["stdout"].endswith("line 1999 of deploy output\n"))
+            self.assertEqual(result["stderr"], "warn\n")
+
+    def test_deploy_all_async_coalesces_and_reports_status(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plane = self._new_plane(tmpdir)
+            self.addCleanup(plane.close)
+            script = Path(tmpdir) / "scripts" / "deploy_all.sh"
+            script.parent.mkdir(parents=True, exist_ok=True)
+            release = Path(tmpdir) / "release"
+            script.write_text(
+                f"#!/bin/sh\necho started\nwhile [ ! -e '{release}' ]; do sleep 0.05; done\necho done\n",
+                encoding="utf-8",
+            )
+            script.chmod(0o755)
+            finished = threading.Event()
+            completed: list[dict[str, object]] = []
+
+            def on_complete(job: dict[str, object]) -> None:
+                completed.append(job)
+                finished.set()
+
+            first = plane.deploy_all_async(timeout_seconds=30, on_complete=on_complete)
+            second = plane.deploy_all_async(timeout_seconds=30)
+            self.assertEqual(first["status"], "running")
+            self.assertEqual(second["job_id"], first["job_id"])
+            self.assertTrue(second["coalesced"])
+
+            release.touch()
+            self.assertTrue(finished.wait(timeout=10))
+            status = plane.deploy_status(str(first["job_id"]))
+            assert status is not None
+            self.assertEqual(status["status"], "succeeded")
+            self.assertEqual(status["returncode"], 0)
+            self.assertEqual(status["stdout"], "started\ndone\n")
+            self.assertEqual(completed[0]["job_id"], first["job_id"])
+            self.assertIsNone(plane.deploy_status("missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
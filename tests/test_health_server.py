@@ -0,0 +1,411 @@
+from __future__ import annotations
+
+import gzip
+import http.client
+import json
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from core.health.server import HealthServer, _EventWriter, _growth_score, _parse_timestamp
+
+
+class HealthServerTests(unittest.TestCase):
+    def _start_server(self, **overrides: object) -> tuple[HealthServer, int]:
+        kwargs: dict[str, object] = {
+            "host": "127.0.0.1",
+            "port": 0,
+            "profile_name": "jason",
+            "tool_registry": MagicMock(),
+            "approval_engine": MagicMock(),
+            "episodic_memory": MagicMock(),
+        }
+        kwargs.update(overrides)
+        server = HealthServer(**kwargs)  # type: ignore[arg-type]
+        server.start()
+        self.addCleanup(server.stop)
+        assert server._httpd is not None
+        return server, server._httpd.server_address[1]
+
+    def _post(self, port: int, path: str, body: dict[str, object]) -> http.client.HTTPResponse:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        conn.request("POST", path, body=json.dumps(body), headers={"Content-Type": "application/json"})
+        return conn.getresponse()
+
+    def _get(self, port: int, path: str, headers: dict[str, str] | None = None) -> http.client.HTTPResponse:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        conn.request("GET", path, headers=headers or {})
+        return conn.getresponse()
+
+    def test_keep_alive_connection_serves_consecutive_requests(self) -> None:
+        _, port = self._start_server()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        for _ in range(3):
+            conn.request("GET", "/health")
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(json.loads(resp.read())["status"], "ok")
+
+    def test_idle_keep_alive_connection_releases_its_worker(self) -> None:
+        _, port = self._start_server(http_workers=2)
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        with patch("core.health.server.HTTP_KEEPALIVE_IDLE_SECONDS", 0.2):
+            conn.request("GET", "/health")
+            resp = conn.getresponse()
+            resp.read()
+            self.assertEqual(resp.getheader("Connection"), None)
+            self.assertEqual(conn.sock.recv(1), b"")
+
+    def test_saturated_pool_closes_connections_after_reply(self) -> None:
+        _, port = self._start_server(http_workers=2)
+        idle = self._get(port, "/health")
+        idle.read()
+        self.assertIsNone(idle.getheader("Connection"))
+        # The first connection still holds a worker, so this reply takes the last one and must close.
+        self.assertEqual(self._get(port, "/health").getheader("Connection"), "close")
+
+    def test_dashboard_data_is_cached_between_polls(self) -> None:
+        control_plane = MagicMock()
+        control_plane.list_nodes.return_value = []
+        _, port = self._start_server(control_plane=control_plane)
+
+        first = self._get(port, "/dashboard/data")
+        self.assertEqual(first.status, 200)
+        body = first.read()
+        self.assertEqual(json.loads(body)["master_profile"], "jason")
+        second = self._get(port, "/dashboard/data").read()
+
+        self.assertEqual(second, body)
+        self.assertEqual(control_plane.list_nodes.call_count, 1)
+
+    def test_polled_endpoints_reuse_encoded_bodies(self) -> None:
+        control_plane = MagicMock()
+        control_plane.health_report.return_value = {"nodes": []}
+        api_usage = MagicMock(return_value={"enabled": True, "total_calls": 1})
+        _, port = self._start_server(control_plane=control_plane, api_usage_provider=api_usage)
+
+        for _ in range(3):
+            self.assertEqual(json.loads(self._get(port, "/fleet/status").read()), {"nodes": []})
+            self._get(port, "/api-usage?window_days=7").read()
+        self._get(port, "/api-usage").read()
+
+        self.assertEqual(control_plane.health_report.call_count, 1)
+        self.assertEqual([c.kwargs["window_days"] for c in api_usage.call_args_list], [7, None])
+
+    def test_dashboard_data_fetches_nodes_concurrently(self) -> None:
+        control_plane = MagicMock()
+        control_plane.list_nodes.return_value = [
+            {"node_id": name, "profile": name, "host": f"{name}.local", "configured": True}
+            for name in ("kiera", "pepper", "scarlet")
+        ]
+        server, port = self._start_server(control_plane=control_plane)
+        responses = {
+            "/health": {"status": "ok", "uptime": 5},
+            "/status": {"tools_registered": 8},
+            "/api-usage": {"enabled": True, "total_calls": 3},
+            "/backup/status": {"code_backup": {"status": "ok"}, "data_backup": {"status": "error"}},
+        }
+
+        def fake_get(host: str, port: int, path: str, timeout: float, max_bytes: int) -> tuple[int, bytes]:
+            time.sleep(0.2)
+            return 200, json.dumps(responses[path.split("?")[0]]).encode("utf-8")
+
+        with patch.object(server._http, "get", side_effect=fake_get):
+            started = time.monotonic()
+            data = json.loads(self._get(port, "/dashboard/data").read())
+            elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 1.5)
+        self.assertEqual([node["profile"] for node in data["nodes"]], ["kiera", "pepper", "scarlet"])
+        node = data["nodes"][0]
+        self.assertTrue(node["up"])
+        self.assertEqual(node["tools_registered"], 8)
+        self.assertEqual(node["api_total_calls"], 3)
+        self.assertEqual(node["code_backup_status"], "ok")
+        self.assertEqual(node["data_backup_status"], "error")
+
+    def test_dashboard_data_answers_local_node_in_process(self) -> None:
+        control_plane = MagicMock()
+        control_plane.list_nodes.return_value = [
+            {"node_id": "jason", "profile": "jason", "host": "127.0.0.1", "configured": True}
+        ]
+        tool_registry = MagicMock()
+        tool_registry.count.return_value = 5
+        tool_registry.list_tools.return_value = []
+        approval_engine = MagicMock()
+        approval_engine.list_pending.return_value = []
+        episodic_memory = MagicMock()
+        episodic_memory.latest.return_value = []
+        server, port = self._start_server(
+            control_plane=control_plane,
+            tool_registry=tool_registry,
+            approval_engine=approval_engine,
+            episodic_memory=episodic_memory,
+        )
+
+        with patch.object(server._http, "get") as remote_get:
+            node = json.loads(self._get(port, "/dashboard/data").read())["nodes"][0]
+
+        remote_get.assert_not_called()
+        self.assertTrue(node["up"])
+        self.assertEqual(node["tools_registered"], 5)
+
+    def test_dashboard_html_is_served_gzipped_when_accepted(self) -> None:
+        _, port = self._start_server()
+        plain = self._get(port, "/dashboard")
+        plain_body = plain.read()
+        self.assertIsNone(plain.getheader("Content-Encoding"))
+        self.assertTrue(plain_body.startswith(b"<!doctype html>"))
+
+        compressed = self._get(port, "/dashboard", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(compressed.getheader("Content-Encoding"), "gzip")
+        self.assertEqual(compressed.getheader("Vary"), "Accept-Encoding")
+        self.assertEqual(gzip.decompress(compressed.read()), plain_body)
+
+    def test_dashboard_assets_are_cacheable_and_revalidated(self) -> None:
+        _, port = self._start_server()
+        page = self._get(port, "/dashboard").read().decode("utf-8")
+
+        asset = self._get(port, "/dashboard/app.js")
+        self.assertEqual(asset.status, 200)
+        self.assertIn("startUpdates()", asset.read().decode("utf-8"))
+        etag = asset.getheader("ETag")
+        self.assertIn("/dashboard/app.js?v=" + etag.strip('"'), page)
+        self.assertIn("immutable", asset.getheader("Cache-Control"))
+
+        revalidated = self._get(port, "/dashboard/app.js", headers={"If-None-Match": etag})
+        self.assertEqual(revalidated.status, 304)
+        self.assertEqual(revalidated.read(), b"")
+        self.assertEqual(self._get(port, "/dashboard/style.css").status, 200)
+
+    def test_dashboard_stream_pushes_shared_frames(self) -> None:
+        control_plane = MagicMock()
+        control_plane.list_nodes.return_value = []
+        _, port = self._start_server(control_plane=control_plane)
+
+        responses = [self._get(port, "/dashboard/stream") for _ in range(2)]
+        frames = []
+        for resp in responses:
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(resp.getheader("Content-Type"), "text/event-stream")
+            line = resp.fp.readline()
+            self.assertTrue(line.startswith(b"data: "))
+            frames.append(json.loads(line[len(b"data: ") :]))
+
+        self.assertEqual(frames[0]["master_profile"], "jason")
+        self.assertEqual(control_plane.list_nodes.call_count, 1)
+
+    def test_dashboard_streams_are_capped_to_leave_workers_free(self) -> None:
+        _, port = self._start_server(http_workers=4)
+        first = self._get(port, "/dashboard/stream")
+        self.assertEqual(first.status, 200)
+        self.assertEqual(self._get(port, "/dashboard/stream").status, 503)
+        self.assertEqual(self._get(port, "/health").status, 200)
+
+    def test_dashboard_data_aggregates_interop_messages(self) -> None:
+        control_plane = MagicMock()
+        control_plane.list_nodes.return_value = [
+            {"node_id": name, "profile": name, "host": "", "configured": False} for name in ("kiera", "pepper")
+        ]
+        interop_bridge = MagicMock()
+        interop_bridge.recent_messages.return_value = [
+            {
+                "id": 2,
+                "source_node": "kiera",
+                "target_node": "pepper",
+                "task_type": "skill_deliver",
+                "created_at": "2026-01-02 00:00:00",
+                "payload": {"skill_id": "notes", "version": "1.0", "reply": {"message": "thanks"}},
+            },
+            {
+                "id": 1,
+                "source_node": "kiera",
+                "target_node": "pepper",
+                "task_type": "skills_checkin",
+                "created_at": "2026-01-01 00:00:00",
+                "payload": "not-a-dict",
+            },
+            {"id": 0, "source_node": "kiera", "target_node": "", "created_at": None},
+        ]
+        _, port = self._start_server(control_plane=control_plane, interop_bridge=interop_bridge)
+
+        data = json.loads(self._get(port, "/dashboard/data").read())
+
+        self.assertEqual(len(data["edges"]), 1)
+        edge = data["edges"][0]
+        self.assertEqual((edge["count"], edge["last_task_type"]), (2, "skill_deliver"))
+        nodes = {node["profile"]: node for node in data["nodes"]}
+        self.assertEqual((nodes["kiera"]["messages_sent"], nodes["pepper"]["messages_received"]), (2, 2))
+        self.assertEqual(data["links"][0]["active_count"], 2)
+        first, second, third = data["recent_messages"]
+        self.assertEqual((first["skill_id"], first["skill_version"], first["reply_message"]), ("notes", "1.0", "thanks"))
+        self.assertIsNone(second["question"])
+        self.assertEqual(third["created_at_ts"], 0)
+
+    def test_approval_routes_parse_the_id_from_the_path(self) -> None:
+        approval_engine = MagicMock()
+        approval_engine.resolve.return_value = True
+        episodic_memory = MagicMock()
+        server, port = self._start_server(approval_engine=approval_engine, episodic_memory=episodic_memory)
+
+        resp = self._post(port, "/approvals/7/resolve", {"approve": True})
+        self.assertEqual(resp.status, 200)
+        approval_engine.resolve.assert_called_once_with(7, approve=True)
+        self.assertEqual(self._post(port, "/approvals/abc/execute", {}).status, 400)
+        self.assertEqual(self._post(port, "/approvals/7/undo", {}).status, 404)
+
+        server.stop()
+        (batch,), _ = episodic_memory.record_many.call_args
+        self.assertEqual(batch, [("approval_resolved", {"approval_id": 7, "approve": True}, None, "allow")])
+        episodic_memory.record.assert_not_called()
+
+    def test_post_bodies_are_validated_before_parsing(self) -> None:
+        _, port = self._start_server()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        conn.putrequest("POST", "/tools/execute")
+        conn.putheader("Content-Length", str(64 << 20))
+        conn.endheaders()
+        self.assertEqual(conn.getresponse().status, 413)
+
+        resp = self._post(port, "/tools/execute", ["not", "an", "object"])  # type: ignore[arg-type]
+        self.assertEqual(resp.status, 400)
+        self.assertEqual(json.loads(resp.read())["error"], "JSON body must be an object")
+
+    def test_unread_post_bodies_do_not_leak_into_the_next_request(self) -> None:
+        _, port = self._start_server()
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.addCleanup(conn.close)
+        for path, status in (("/nope", 404), ("/approvals/x/resolve", 400)):
+            conn.request("POST", path, body=b'{"a": 1}', headers={"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, status)
+            resp.read()
+            conn.request("GET", "/health")
+            resp = conn.getresponse()
+            self.assertEqual(resp.status, 200)
+            self.assertEqual(json.loads(resp.read())["status"], "ok")
+
+    def test_async_skills_checkin_reply_is_polled_by_request_id(self) -> None:
+        interop_bridge = MagicMock()
+        interop_bridge.receive_envelope.return_value = {
+            "accepted": True,
+            "source": "kiera",
+            "target": "jason",
+            "task_type": "skills_checkin",
+            "nonce": "n1",
+            "payload": {"question": "new skills?", "reply_mode": "async"},
+        }
+        _, port = self._start_server(interop_bridge=interop_bridge)
+
+        with patch("core.health.server.read_secret", return_value=None):
+            resp = self._post(port, "/interop/inbox", {"envelope": {"stub": True}})
+            self.assertEqual(resp.status, 202)
+            pending = json.loads(resp.read())["reply_pending"]
+            deadline = time.monotonic() + 5
+            while True:
+                result = self._get(port, pending["result_path"])
+                if result.status == 200 or time.monotonic() > deadline:
+                    break
+                result.read()
+                time.sleep(0.05)
+
+        self.assertEqual(result.status, 200)
+        reply = json.loads(result.read())["reply"]
+        self.assertFalse(reply["ok"])
+        self.assertEqual(reply["error"], "LLM key missing on target node")
+        self.assertEqual(self._get(port, "/interop/result/unknown").status, 404)
+
+    def test_slow_inline_checkin_reply_falls_back_to_polling(self) -> None:
+        interop_bridge = MagicMock()
+        interop_bridge.receive_envelope.return_value = {
+            "accepted": True,
+            "source": "kiera",
+            "target": "jason",
+            "task_type": "skills_checkin",
+            "nonce": "n1",
+            "payload": {"question": "new skills?"},
+        }
+        _, port = self._start_server(interop_bridge=interop_bridge)
+        release = threading.Event()
+
+        def _slow_complete(*args: object, **kwargs: object) -> object:
+            release.wait(5)
+            raise ValueError("model exploded")
+
+        with (
+            patch("core.health.server.read_secret", return_value="secret"),
+            patch("core.health.server.llm_complete", side_effect=_slow_complete),
+            patch("core.health.server.LLM_REPLY_INLINE_WAIT_SECONDS", 0.1),
+        ):
+            resp = self._post(port, "/interop/inbox", {"envelope": {"stub": True}})
+            self.assertEqual(resp.status, 202)
+            pending = json.loads(resp.read())["reply_pending"]
+            release.set()
+            deadline = time.monotonic() + 5
+            while True:
+                result = self._get(port, pending["result_path"])
+                if result.status != 202 or time.monotonic() > deadline:
+                    break
+                result.read()
+                time.sleep(0.05)
+
+        self.assertEqual(result.status, 500)
+        body = json.loads(result.read())
+        self.assertEqual((body["status"], body["error"]), ("failed", "model exploded"))
+
+
+
+class EventWriterTests(unittest.TestCase):
+    def test_failed_batch_is_retried_in_order(self) -> None:
+        store = MagicMock()
+        store.record_many.side_effect = [RuntimeError("database is locked"), None]
+        writer = _EventWriter(store, flush_interval_seconds=60, max_batch=8)
+        writer.start()
+        writer.record("a", {})
+        writer.record("b", {})
+        writer.stop()
+
+        self.assertEqual(store.record_many.call_count, 2)
+        self.assertEqual([event[0] for event in store.record_many.call_args.args[0]], ["a", "b"])
+
+
+class ParseTimestampTests(unittest.TestCase):
+    def test_sqlite_timestamps_are_read_as_utc(self) -> None:
+        self.assertEqual(_parse_timestamp("2026-01-02 03:04:05"), 1767323045)
+        self.assertEqual(_parse_timestamp("2026-01-02T03:04:05.250"), 1767323045)
+        self.assertEqual(_parse_timestamp("1767323045"), 1767323045)
+        self.assertEqual(_parse_timestamp(1767323045), 1767323045)
+
+    def test_unparseable_values_return_none(self) -> None:
+        for raw in (None, "", "yesterday", "2026-13-01 00:00:00", "2026-01-02 03:04:05+02:00", 1.5):
+            self.assertIsNone(_parse_timestamp(raw), raw)
+
+
+class GrowthScoreTests(unittest.TestCase):
+    def test_traffic_and_call_thresholds(self) -> None:
+        base = {"up": False, "tools_registered": 0, "api_total_calls": 0}
+        self.assertEqual([_growth_score(base, traffic) for traffic in (0, 1, 5, 6, 20, 21)], [0, 1, 1, 2, 2, 3])
+        self.assertEqual(
+            [_growth_score({**base, "api_total_calls": calls}, 0) for calls in (20, 21, 200, 201)], [0, 1, 1, 2]
+        )
+
+    def test_full_node_score(self) -> None:
+        node = {
+            "up": True,
+            "api_enabled": True,
+            "code_backup_status": "ok",
+            "data_backup_status": "ok",
+            "tools_registered": 12,
+            "api_total_calls": 500,
+        }
+        self.assertEqual(_growth_score(node, 30), 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
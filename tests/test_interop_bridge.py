@@ -1,16 +1,41 @@
 from __future__ import annotations
 
+import json
+import os
 import sqlite3
 import tempfile
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from unittest.mock import patch
 from urllib import error
 
-from core.interop.bridge import InteropBridge
+import yaml
+
+from core.interop.bridge import _LAST_OUTBOX_SQL, InteropBridge, _NonceBuffer
 from core.memory.engine import MemoryEngine
 
 
+class _InboxHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[tuple[str, int]] = set()
+    status = 200
+
+    def do_POST(self) -> None:  # noqa: N802
+        type(self).connections.add(self.client_address)
+        self.rfile.read(int(self.headers.get("Content-Length", "0")))
+        body = b'{"accepted": true}'
+        self.send_response(type(self).status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return None
+
+
 class InteropBridgeRoutingTests(unittest.TestCase):
     def _new_bridge(self, tempdir: str) -> InteropBridge:
         root = Path(tempdir)
@@ -66,6 +91,26 @@ class InteropBridgeRoutingTests(unittest.TestCase):
             self.assertEqual(result.get("routed_via"), "jason")
             self.assertEqual(calls, ["kiera.local", "hub.local"])
 
+    def test_post_envelope_reuses_peer_connection(self) -> None:
+        _InboxHandler.connections = set()
+        _InboxHandler.status = 200
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _InboxHandler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            self.addCleanup(bridge.close)
+            bridge._health_port = httpd.server_address[1]
+            envelope = bridge.build_envelope("kiera", "skills_checkin", {"question": "hi"})
+            for _ in range(3):
+                self.assertEqual(bridge._post_envelope("127.0.0.1", envelope), {"accepted": True})
+            self.assertEqual(len(_InboxHandler.connections), 1)
+
+            _InboxHandler.status = 503
+            with self.assertRaises(error.URLError):
+                bridge._post_envelope("127.0.0.1", envelope)
+
     def test_forward_relay_envelope_rejects_source_spoof(self) -> None:
         with tempfile.TemporaryDirectory() as tmpdir:
             bridge = self._new_bridge(tmpdir)
@@ -73,6 +118,226 @@ class InteropBridgeRoutingTests(unittest.TestCase):
             with self.assertRaises(RuntimeError):
                 bridge.forward_relay_envelope(relayer_source="scarlet", inner_envelope=inner)
 
+    def test_signed_envelope_round_trips_and_rejects_tampering(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            envelope = bridge.build_envelope("scarlet", "skills_checkin", {"question": "hello"}, source_override="kiera")
+            tampered = {**envelope, "payload": {"question": "bye"}, "nonce": "other"}
+            self.assertEqual(bridge.receive_envelope(envelope)["payload"], {"question": "hello"})
+            with self.assertRaisesRegex(RuntimeError, "signature invalid"):
+                bridge.receive_envelope(tampered)
+
+    def test_failed_receive_rolls_back_its_nonce_claim(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            envelope = bridge.build_envelope("scarlet", "skills_checkin", {"question": "hello"}, source_override="kiera")
+            with patch.object(bridge, "_record_message", side_effect=sqlite3.OperationalError("disk I/O error")):
+                with self.assertRaises(sqlite3.OperationalError):
+                    bridge.receive_envelope(envelope)
+            self.assertEqual(bridge._conn.execute("SELECT COUNT(*) FROM interop_nonces").fetchone()[0], 0)
+            # The nonce was not burned, so the sender's retry is accepted.
+            self.assertTrue(bridge.receive_envelope(envelope)["accepted"])
+
+    def test_blake2b_signed_envelope_is_tagged_and_verified(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            (Path(tmpdir) / "secrets" / "interop_signature_alg.txt").write_text("blake2b-256\n", encoding="utf-8")
+            envelope = bridge.build_envelope("scarlet", "skills_checkin", {"question": "hello"}, source_override="kiera")
+            self.assertEqual(envelope["signature_alg"], "blake2b-256")
+            self.assertNotEqual(envelope["signature"], bridge._sign(bridge._canonical_bytes(envelope)))
+            self.assertTrue(bridge.receive_envelope(envelope)["accepted"])
+            # The tag picks the verifier, so relabelling a blake2b signature as HMAC fails.
+            relabelled = {**envelope, "signature_alg": "hmac-sha256"}
+            with self.assertRaisesRegex(RuntimeError, "signature invalid"):
+                bridge.receive_envelope(relabelled)
+            with self.assertRaisesRegex(RuntimeError, "Unsupported envelope signature algorithm"):
+                bridge.receive_envelope({**envelope, "signature_alg": "md5"})
+
+    def test_daily_checkins_keep_successful_rows_when_hub_fallback_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            # jason is also the hub, so kiera's fallback route fails as well.
+
+            def fake_post(host: str, envelope: dict[str, object]) -> dict[str, object]:
+                if envelope.get("target") == "jason" and envelope.get("task_type") == "skills_checkin":
+                    return {"ok": True}
+                raise error.URLError("no route")
+
+            with patch.object(bridge, "_post_envelope", side_effect=fake_post):
+                results = bridge.send_daily_skills_checkins(interval_seconds=86400)
+            self.assertEqual([(item["target"], item["ok"]) for item in results], [("jason", True), ("kiera", False)])
+            rows = {(row["target_node"], row["status"]) for row in bridge.recent_messages()}
+            self.assertIn(("jason", "sent"), rows)
+            self.assertEqual(bridge._last_outbox_timestamp("kiera", "skills_checkin"), None)
+
+    def test_daily_checkins_write_outbox_rows_in_one_commit(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            statements: list[str] = []
+            bridge._conn.set_trace_callback(statements.append)
+
+            def fake_post(host: str, envelope: dict[str, object]) -> dict[str, object]:
+                if host == "kiera.local":
+                    raise error.URLError("no route")
+                return {"ok": True}
+
+            with patch.object(bridge, "_post_envelope", side_effect=fake_post):
+                results = bridge.send_daily_skills_checkins(interval_seconds=86400)
+            bridge._conn.set_trace_callback(None)
+            self.assertEqual([item["ok"] for item in results], [True, True])
+            self.assertEqual(sum(1 for sql in statements if sql.strip().upper() == "COMMIT"), 1)
+            statuses = [row["status"] for row in bridge.recent_messages()]
+            self.assertEqual(sorted(statuses), ["sent", "sent:routed:jason"])
+
+    def test_last_outbox_lookup_seeks_index_without_sorting(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            plan = " ".join(row[3] for row in bridge._conn.execute("EXPLAIN QUERY PLAN " + _LAST_OUTBOX_SQL, ("kiera", "skills_checkin")))
+            self.assertIn("USING INDEX idx_interop_messages_outbox_lookup", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_payload_for_log_copies_only_when_adding_reply(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            payload = {"question": "hi"}
+            self.assertIs(bridge._payload_for_log(payload), payload)
+            self.assertIs(bridge._payload_for_log(payload, {"ok": True}), payload)
+
+            reply = {"message": "x" * 700, "ok": True}
+            logged = bridge._payload_for_log(payload, {"reply": reply})
+            self.assertEqual(len(logged["reply"]["message"]), 600)
+            self.assertEqual(len(reply["message"]), 700)
+            self.assertNotIn("reply", payload)
+
+    def test_canonical_bytes_match_sorted_json_dump(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            envelopes = [
+                bridge.build_envelope("kiera", "skills_checkin", {"question": "héllo \u2603", "n": [1.5, None, True]}),
+                {"source": "a\"b", "target": "kiera", "task_type": "t", "payload": {"z": {"b": 1, "a": 2}}, "nonce": "n", "timestamp": 7},
+                {"source": "a", "target": "b", "task_type": "t", "payload": {}, "nonce": 5, "timestamp": "7"},
+            ]
+            for envelope in envelopes:
+                body = {key: envelope[key] for key in ("source", "target", "task_type", "payload", "nonce", "timestamp")}
+                expected = json.dumps(body, sort_keys=True, separators=(",", ":")).encode("utf-8")
+                self.assertEqual(bridge._canonical_bytes(envelope), expected)
+
+    def test_nonce_buffer_refills_without_repeating(self) -> None:
+        nonces = _NonceBuffer(size=64)
+        issued = [nonces.take_hex() for _ in range(50)]
+        self.assertEqual(len(set(issued)), 50)
+        self.assertTrue(all(len(nonce) == 32 for nonce in issued))
+        nonces.reset()
+        self.assertNotIn(nonces.take_hex(), issued)
+
+    def test_post_envelope_frames_canonical_bytes_without_reencoding(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            (Path(tmpdir) / "secrets" / "interop_signature_alg.txt").write_text("blake2b-256\n", encoding="utf-8")
+            envelope = bridge.build_envelope("kiera", "skills_checkin", {"question": "h\u00e9llo", "n": [1, 2.5]})
+            sent: list[bytes] = []
+
+            def fake_request(method: str, host: str, port: int, path: str, timeout: float, max_bytes: int, **kwargs: object) -> tuple[int, bytes]:
+                sent.append(kwargs["body"])  # type: ignore[arg-type]
+                return 200, b'{"accepted": true}'
+
+            with patch.object(bridge._http, "request", side_effect=fake_request), patch(
+                "core.interop.bridge.json_codec.dumps_bytes"
+            ) as dumps_bytes:
+                bridge._post_envelope("127.0.0.1", envelope)
+                bridge._post_envelope("127.0.0.1", dict(envelope))
+            self.assertEqual(dumps_bytes.call_count, 1)
+            self.assertEqual(json.loads(sent[0]), {"envelope": envelope})
+
+    def test_receive_prunes_expired_nonces(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            bridge._conn.execute(
+                "INSERT INTO interop_nonces (nonce, source_node, target_node, created_at) "
+                "VALUES ('old', 'kiera', 'scarlet', datetime('now', '-2 hours'))"
+            )
+            bridge._conn.commit()
+            envelope = bridge.build_envelope("scarlet", "skills_checkin", {"question": "hello"}, source_override="kiera")
+            bridge.receive_envelope(envelope)
+            nonces = [row["nonce"] for row in bridge._conn.execute("SELECT nonce FROM interop_nonces")]
+            self.assertEqual(nonces, [envelope["nonce"]])
+            plan = " ".join(
+                row[3]
+                for row in bridge._conn.execute(
+                    "EXPLAIN QUERY PLAN DELETE FROM interop_nonces WHERE created_at < datetime('now', '-1 hours')"
+                )
+            )
+            self.assertIn("idx_interop_nonces_created", plan)
+
+    def test_receive_envelopes_isolates_bad_items(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            good = bridge.build_envelope("scarlet", "skills_checkin", {"question": "hi"}, source_override="kiera")
+            results = bridge.receive_envelopes([good, good, {**good, "signature": "00"}])
+            self.assertEqual([item["accepted"] for item in results], [True, False, False])
+            self.assertIn("Replay", results[1]["error"])
+            self.assertEqual(len(bridge.recent_messages(limit=10)), 1)
+
+    def test_shared_key_rotation_is_picked_up_without_restart(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            before = bridge.build_envelope("kiera", "skills_checkin", {"question": "hello"})
+            (Path(tmpdir) / "secrets" / "interop_shared_key.txt").write_text("rotated-key\n", encoding="utf-8")
+            self.assertNotEqual(bridge._sign(bridge._canonical_bytes(before)), before["signature"])
+
+    def test_invalidate_key_reloads_rewrite_with_unchanged_stat(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            envelope = bridge.build_envelope("kiera", "skills_checkin", {"question": "hello"})
+            key_path = Path(tmpdir) / "secrets" / "interop_shared_key.txt"
+            stat = key_path.stat()
+            key_path.write_text("test-kez\n", encoding="utf-8")
+            os.utime(key_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(bridge._sign(bridge._canonical_bytes(envelope)), envelope["signature"])
+            bridge.invalidate_key()
+            self.assertNotEqual(bridge._sign(bridge._canonical_bytes(envelope)), envelope["signature"])
+
+    def test_nodes_file_is_parsed_once_until_it_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            with patch.object(yaml, "load", wraps=yaml.load) as loader:
+                self.assertEqual(set(bridge._configured_targets()), {"jason", "kiera"})
+                self.assertEqual(bridge.hub_profile(), "jason")
+                self.assertEqual(loader.call_count, 1)
+
+                (Path(tmpdir) / "nodes.yaml").write_text("nodes:\n  kiera:\n    host: kiera.local\n", encoding="utf-8")
+                self.assertEqual(set(bridge._configured_targets()), {"kiera"})
+                self.assertEqual(loader.call_count, 2)
+
+    def test_seconds_until_next_checkin_tracks_earliest_due_target(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            self.assertEqual(bridge.seconds_until_next_checkin(interval_seconds=86400), 0)
+            with patch.object(bridge, "_post_envelope", return_value={"ok": True}):
+                results = bridge.send_daily_skills_checkins(interval_seconds=86400)
+            self.assertTrue(results)
+            self.assertTrue(all(item["ok"] for item in results))
+            self.assertGreater(bridge.seconds_until_next_checkin(interval_seconds=86400), 86000)
+
+
+    def test_daily_checkins_send_to_targets_concurrently(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bridge = self._new_bridge(tmpdir)
+            # Both sends must be in flight at once for the barrier to release.
+            barrier = threading.Barrier(2, timeout=5)
+
+            def fake_post(host: str, envelope: dict[str, object]) -> dict[str, object]:
+                barrier.wait()
+                return {"ok": True}
+
+            with patch.object(bridge, "_post_envelope", side_effect=fake_post), patch.object(
+                bridge, "local_skills_manifest", return_value=[]
+            ) as manifest:
+                results = bridge.send_daily_skills_checkins(interval_seconds=86400)
+            self.assertEqual([item["target"] for item in results], ["jason", "kiera"])
+            self.assertTrue(all(item["ok"] for item in results))
+            self.assertEqual(manifest.call_count, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
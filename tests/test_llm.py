@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.llm import read_secret
+
+
+class ReadSecretTests(unittest.TestCase):
+    def test_read_secret_rereads_only_when_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            secrets_dir = Path(tmpdir)
+            secret = secrets_dir / "llm_api_key.txt"
+            secret.write_text("key-one\n", encoding="utf-8")
+
+            with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as reader:
+                self.assertEqual(read_secret(secrets_dir, "llm_api_key.txt"), "key-one")
+                self.assertEqual(read_secret(secrets_dir, "llm_api_key.txt"), "key-one")
+                self.assertEqual(reader.call_count, 1)
+
+                secret.write_text("key-two\n", encoding="utf-8")
+                stat = secret.stat()
+                os.utime(secret, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+                self.assertEqual(read_secret(secrets_dir, "llm_api_key.txt"), "key-two")
+                self.assertEqual(reader.call_count, 2)
+
+            secret.unlink()
+            self.assertIsNone(read_secret(secrets_dir, "llm_api_key.txt"))
+            self.assertIsNone(read_secret(secrets_dir / "missing", "llm_api_key.txt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from core.memory.engine import MemoryEngine
+from core.memory.profile_memory import ProfileMemoryStore
+
+
+class ProfileMemoryStoreTests(unittest.TestCase):
+    def test_set_facts_upserts_a_batch_and_overwrites_existing_keys(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = MemoryEngine(Path(tmpdir) / "memory.db")
+            engine.initialize()
+            self.addCleanup(engine.close)
+            store = ProfileMemoryStore(engine.connect(), write_lock=engine.write_lock)
+
+            store.set_fact("policy_tier", "low")
+            store.set_facts([("runtime_profile", "jason"), ("policy_tier", "high")])
+
+            self.assertEqual(store.get_fact("policy_tier"), "high")
+            self.assertEqual(
+                [(fact["key"], fact["value"]) for fact in store.list_facts()],
+                [("policy_tier", "high"), ("runtime_profile", "jason")],
+            )
+            self.assertTrue(store.delete_fact("runtime_profile"))
+            self.assertIsNone(store.get_fact("runtime_profile"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import os
 import tempfile
 import unittest
+from base64 import b64encode
 from pathlib import Path
+from unittest.mock import patch
 
-from core.skills.manifest import SkillManifestManager
+import yaml
+
+from core.skills.manifest import SkillManifestManager, sha256_file
+from core.skills.package import bundle_and_encode, extract_skill_bundle, write_bundle_b64
 
 
 class SkillManifestTests(unittest.TestCase):
@@ -54,6 +60,59 @@ class SkillManifestTests(unittest.TestCase):
             self.assertEqual(len(diff["added"]), 1)
             self.assertEqual(diff["added"][0]["skill_id"], "summarizer")
 
+    def test_load_reparses_only_after_the_file_changes(self) -> None:
+        def skill(skill_id: str) -> dict[str, object]:
+            return {
+                "skill_id": skill_id,
+                "name": skill_id.title(),
+                "version": "1.0.0",
+                "description": "",
+                "entrypoints": ["run"],
+                "dependencies": [],
+                "permissions_requested": [],
+                "checksum": "abc",
+            }
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SkillManifestManager(Path(tmpdir) / "manifest.yaml")
+            manager.upsert(skill("planner"))
+            with patch.object(yaml, "load", wraps=yaml.load) as loader:
+                first = manager.load()
+                first[0]["version"] = "mutated"
+                self.assertEqual(manager.load()[0]["version"], "1.0.0")
+                self.assertEqual(loader.call_count, 1)
+                manager.upsert(skill("summarizer"))
+                self.assertEqual(sorted(manager.list_ids()), ["planner", "summarizer"])
+
+class SkillBundleEncodingTests(unittest.TestCase):
+    def test_bundle_and_encode_matches_separate_passes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            skill_root = Path(tmpdir) / "planner"
+            skill_root.mkdir()
+            (skill_root / "blob.bin").write_bytes(os.urandom(200_001))
+            bundle = Path(tmpdir) / "out" / "planner-1.0.0.tar.gz"
+            checksum, encoded = bundle_and_encode(skill_root=skill_root, output_bundle=bundle)
+            self.assertEqual(checksum, sha256_file(bundle))
+            self.assertEqual(encoded, b64encode(bundle.read_bytes()).decode("ascii"))
+
+            restored = Path(tmpdir) / "restored.tar.gz"
+            write_bundle_b64(encoded, restored)
+            self.assertEqual(sha256_file(restored), checksum)
+            installed = extract_skill_bundle(bundle_path=restored, target_dir=Path(tmpdir) / "skills")
+            self.assertEqual((installed / "blob.bin").read_bytes(), (skill_root / "blob.bin").read_bytes())
+
+    def test_write_bundle_b64_accepts_wrapped_text_and_rejects_garbage(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            raw = os.urandom(300_000)
+            encoded = b64encode(raw).decode("ascii")
+            wrapped = "\n".join(encoded[i : i + 76] for i in range(0, len(encoded), 76))
+            restored = Path(tmpdir) / "restored.tar.gz"
+            write_bundle_b64(wrapped, restored)
+            self.assertEqual(restored.read_bytes(), raw)
+
+            with self.assertRaisesRegex(RuntimeError, "Invalid skill bundle encoding"):
+                write_bundle_b64(encoded[:-1], restored)
+
 
 if __name__ == "__main__":
     unittest.main()
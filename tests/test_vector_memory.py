@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from core.memory.embedding_service import EmbeddingService, chunk_text
+from core.memory.engine import MemoryEngine
+from core.memory.vector_memory import VectorMemoryStore
+
+
+class _EmbeddingsHandler(BaseHTTPRequestHandler):
+    inputs: list[object] = []
+
+    def do_POST(self) -> None:  # noqa: N802
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).inputs.append(request["input"])
+        texts = request["input"] if isinstance(request["input"], list) else [request["input"]]
+        rows = [{"index": i, "embedding": [float(len(text)), 0.5]} for i, text in enumerate(texts)]
+        body = json.dumps({"data": list(reversed(rows))}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        return None
+
+
+class EmbeddingServiceTests(unittest.TestCase):
+    def test_embed_many_batches_inputs_and_keeps_order(self) -> None:
+        _EmbeddingsHandler.inputs = []
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _EmbeddingsHandler)
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        service = EmbeddingService("key", base_url=f"http://127.0.0.1:{httpd.server_address[1]}")
+
+        vectors = service.embed_many(["a", "  ", "abc"])
+        self.assertEqual(_EmbeddingsHandler.inputs, [["a", "abc"]])
+        self.assertEqual([list(v) for v in vectors], [[1.0, 0.5], [], [3.0, 0.5]])
+        self.assertEqual(vectors[0].typecode, "f")
+
+    def test_chunk_text_overlaps_and_covers_the_tail(self) -> None:
+        text = "".join(chr(ord("a") + i % 26) for i in range(2000))
+        chunks = chunk_text(text, chunk_size=800, overlap=120)
+        self.assertEqual([len(c) for c in chunks], [800, 800, 640])
+        self.assertEqual(chunks[1][:120], chunks[0][-120:])
+        self.assertTrue(text.endswith(chunks[-1]))
+        self.assertEqual(chunk_text("  short  "), ["short"])
+        self.assertEqual(chunk_text(""), [])
+
+
+class VectorMemoryStoreTests(unittest.TestCase):
+    def test_search_ranks_blob_and_legacy_json_rows(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            engine = MemoryEngine(Path(tmpdir) / "memory.db")
+            engine.initialize()
+            self.addCleanup(engine.close)
+            conn = engine.connect()
+            store = VectorMemoryStore(conn)
+            store.replace_chunks(
+                source_kind="telegram",
+                source_id=1,
+                source_ref=None,
+                chunks=[(0, "east", [1.0, 0.0]), (1, "north", [0.0, 1.0])],
+                embedding_model="test",
+            )
+            conn.execute(
+                """
+                INSERT INTO message_embeddings
+                (source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_model)
+                VALUES ('telegram', 2, NULL, 0, 'legacy', '[0.6, 0.8]', 'test')
+                """
+            )
+            blob_size = conn.execute("SELECT length(embedding_blob) FROM message_embeddings WHERE chunk_index = 1").fetchone()[0]
+            self.assertEqual(blob_size, 8)
+            conn.execute(
+                """
+                INSERT INTO message_embeddings
+                (source_kind, source_id, source_ref, chunk_index, text_chunk, embedding_json, embedding_blob, embedding_model)
+                VALUES ('telegram', 3, NULL, 0, 'truncated', '', x'0000803f00', 'test')
+                """
+            )
+
+            matches = store.search(query_embedding=[0.0, 1.0], limit=3)
+            self.assertEqual([m["text_chunk"] for m in matches], ["north", "legacy", "east"])
+            self.assertAlmostEqual(matches[1]["score"], 0.8, places=6)
+            self.assertNotIn("embedding_blob", matches[0])
+
+
+if __name__ == "__main__":
+    unittest.main()